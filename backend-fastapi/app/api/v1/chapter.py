@@ -2,13 +2,14 @@
 章节管理模块路由
 """
 from typing import List
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 from app.database.connection import SessionDep
 from app.services.chapter_service import ChapterService
 from app.schemas.chapter import (
     ChapterCreateRequest,
     ChapterUpdateRequest,
     ChapterResponse,
+    ChapterNodeResponse,
     ChapterTreeResponse
 )
 from app.schemas.common import Response
@@ -71,6 +72,58 @@ async def get_all_chapter_tree(
     return Response(data=chapters)
 
 
+@router.get(
+    "/{chapter_id}/descendants",
+    response_model=Response[List[ChapterNodeResponse]],
+    summary="查询子孙章节",
+    description="一次查询返回章节下全部层级的子孙章节及其相对层级"
+)
+async def get_chapter_descendants(
+    chapter_id: int,
+    session: SessionDep,
+    include_self: bool = Query(False, description="是否包含章节自身")
+) -> Response[List[ChapterNodeResponse]]:
+    """
+    查询子孙章节
+
+    Args:
+        chapter_id: 章节ID
+        include_self: 是否包含章节自身
+
+    Returns:
+        子孙章节列表（depth 为相对层级，自身为 0）
+    """
+    service = ChapterService(session)
+    chapters = await service.get_descendants(chapter_id, include_self)
+    return Response(data=chapters)
+
+
+@router.get(
+    "/{chapter_id}/ancestors",
+    response_model=Response[List[ChapterNodeResponse]],
+    summary="查询章节路径",
+    description="一次查询返回从顶级章节到父章节的祖先路径"
+)
+async def get_chapter_ancestors(
+    chapter_id: int,
+    session: SessionDep,
+    include_self: bool = Query(False, description="是否包含章节自身")
+) -> Response[List[ChapterNodeResponse]]:
+    """
+    查询章节的祖先路径（面包屑）
+
+    Args:
+        chapter_id: 章节ID
+        include_self: 是否包含章节自身
+
+    Returns:
+        祖先章节列表（depth 为与该章节的层级距离）
+    """
+    service = ChapterService(session)
+    chapters = await service.get_ancestors(chapter_id, include_self)
+    return Response(data=chapters)
+
+
 @router.get(
     "/{chapter_id}",
     response_model=Response[ChapterResponse],
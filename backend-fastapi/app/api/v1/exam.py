@@ -4,9 +4,16 @@
 遵循Spring Boot旧项目接口规范
 """
 from typing import Optional, List
-from fastapi import APIRouter, Depends, Query, Path, Response as FastAPIResponse
+from fastapi import APIRouter, Depends, Query, Path, Request, Response as FastAPIResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from app.database.connection import SessionDep
-from app.services.exam_service import ExamService
+from app.services.exam_service import ExamService, nav_index_snapshots
+from app.services.import_service import QuestionImportService
+from app.services.bulk_service import QuestionBulkService
+from app.services.render_service import RenderService
+from app.services.near_duplicate_service import NearDuplicateService
+from app.services.similar_service import SimilarQuestionService
+from app.services.export_cache import export_cache, normalize_export_format
 from app.schemas.exam import (
     ExamQueryParams,
     ExamCreateRequest,
@@ -17,10 +24,27 @@ from app.schemas.exam import (
     ExamDuplicateCheckResponse,
     ExamIndexResponse,
     ExamNavItem,
+    ExamNeighborsResponse,
     PaginatedExamResponse,
-    ExportResultResponse
+    ExportResultResponse,
+    ExamRandomPaperParams,
+    ExamRandomStatResponse,
+    ExamImportRequest,
+    ExamBulkUpdateRequest,
+    ExamBulkDeleteRequest
 )
-from app.schemas.common import Response
+from app.schemas.common import (
+    Response,
+    ImportReportResponse,
+    BulkOperationResponse,
+    NearDuplicateCandidate,
+    NearDuplicateCheckRequest,
+    NearDuplicateReportResponse,
+    SimilarQuestionItem
+)
+from app.config.settings import settings
+from app.core.responses import content_disposition
+from app.core.snapshot import snapshot_response
 from app.middleware.auth import get_current_user, get_current_admin, AuthUser
 
 router = APIRouter()
@@ -42,12 +66,18 @@ async def get_exams(
     no_category: Optional[bool] = Query(default=None, description="是否筛选无分类"),
     keyword: Optional[str] = Query(default=None, description="关键词搜索"),
     sort_field: str = Query(default="update_time", description="排序字段"),
-    sort_order: str = Query(default="desc", description="排序方向")
+    sort_order: str = Query(default="desc", description="排序方向"),
+    cursor: Optional[str] = Query(default=None, description="游标（上一页返回的 next_cursor），传入后忽略 page"),
+    with_total: bool = Query(default=True, description="是否统计总数"),
+    total_mode: str = Query(default="exact", pattern="^(exact|estimated)$", description="总数模式：exact（精确）/ estimated（关键词搜索时封顶估计）"),
+    rendered: Optional[str] = Query(default=None, pattern="^html$", description="传入 html 时附加预渲染的题目 HTML")
 ) -> Response[PaginatedExamResponse]:
     """
     分页查询真题
 
     支持按年份、分类、科目、关键词等条件筛选，支持分页和排序。
+    传入 cursor 时按游标翻页（适用于无限滚动，每页开销恒定），with_total=false 时跳过总数统计。
+    total_mode=estimated 时关键词搜索的总数只统计到上限，返回 total_estimated 标记。
     """
     params = ExamQueryParams(
         page=page,
@@ -58,10 +88,15 @@ async def get_exams(
         no_category=no_category,
         keyword=keyword,
         sort_field=sort_field,
-        sort_order=sort_order
+        sort_order=sort_order,
+        cursor=cursor,
+        with_total=with_total,
+        total_mode=total_mode
     )
     service = ExamService(session)
     result = await service.get_paginated(params)
+    if rendered:
+        await RenderService(session).attach(result.data)
     return Response(data=result)
 
 
@@ -158,19 +193,22 @@ async def find_all_for_index(
     description="查询用于侧边栏年份导航的轻量级真题索引数据"
 )
 async def find_for_nav_index(
-    session: SessionDep,
-    category: Optional[str] = Query(default=None, description="分类筛选")
-) -> Response[List[ExamNavItem]]:
+    request: Request,
+    category: Optional[str] = Query(default=None, description="分类筛选"),
+    subject_id: Optional[int] = Query(default=None, description="科目ID筛选")
+) -> FastAPIResponse:
     """
     获取轻量级真题导航索引数据
 
     - 权限：公开
     - 只返回导航所需字段(id, year, questionNumber, title, category)
     - 数据量比 /index 小很多，用于侧边栏快速加载
+    - 返回按 (科目, 分类) 预计算并压缩的快照，以快照内容摘要作为 ETag，
+      客户端携带 If-None-Match 且未变化时返回 304；真题有写入后快照在后台重建
     """
-    service = ExamService(session)
-    exams = await service.find_for_nav_index(category)
-    return Response(data=exams)
+    key = (subject_id, category.strip() if category and category.strip() else None)
+    snapshot = await nav_index_snapshots.get(key)
+    return snapshot_response(request, snapshot)
 
 
 @router.get(
@@ -203,47 +241,147 @@ async def get_category_stats(
 async def find_by_subject_and_category(
     session: SessionDep,
     subject_id: Optional[int] = Query(default=None, description="科目ID"),
-    category: str = Query(..., description="分类名称")
+    category: str = Query(..., description="分类名称"),
+    include_children: bool = Query(default=False, description="是否包含子孙分类下的题目")
 ) -> Response[List[ExamResponse]]:
     """
     根据科目和分类查询真题
 
     - 权限：公开
     - 返回指定科目和分类的真题列表
+    - include_children=true 时同时返回子孙分类下的题目（单次查询）
     """
     service = ExamService(session)
-    exams = await service.find_by_subject_and_category(subject_id, category)
+    exams = await service.find_by_subject_and_category(subject_id, category, include_children)
     return Response(data=exams)
 
 
 @router.get(
     "/export",
     summary="导出真题",
-    description="按科目导出真题（支持Markdown格式）"
+    description="按科目导出真题（format=markdown 为单个 Markdown 文件，format=zip 为含图片的离线包）"
 )
 async def export_by_subject(
     session: SessionDep,
     subject_id: int = Query(..., description="科目ID"),
-    format: str = Query(..., description="导出格式")
+    format: str = Query(..., description="导出格式：zip 为离线包，其他取值导出 Markdown")
 ) -> FastAPIResponse:
     """
     按科目导出真题
 
     - 权限：公开
     - 返回指定格式的导出文件
+    - zip 格式为离线包（每个年份一个 Markdown 文件 + images/ 目录下的引用图片）
+    - 开启导出缓存时按 (科目, 格式, 数据版本) 复用已生成的文件；关闭时 zip 格式边压缩边输出
     """
     service = ExamService(session)
+    if settings.export.cache_enabled:
+        export_format = normalize_export_format(format)
+        version = await service.get_export_version(subject_id)
+        artifact = await export_cache.get(subject_id, export_format, version)
+        return FileResponse(
+            artifact.path,
+            media_type=artifact.media_type,
+            headers={"Content-Disposition": content_disposition(artifact.download_name())}
+        )
+
+    if format == "zip":
+        export_stream = await service.export_zip_by_subject(subject_id)
+        return StreamingResponse(
+            export_stream.chunks,
+            media_type=export_stream.content_type,
+            headers={"Content-Disposition": content_disposition(export_stream.filename)}
+        )
+
     export_result = await service.export_by_subject(subject_id, format)
 
     return FastAPIResponse(
         content=export_result.file_bytes,
         media_type=export_result.content_type,
         headers={
-            "Content-Disposition": f"attachment; filename={export_result.filename}"
+            "Content-Disposition": content_disposition(export_result.filename)
         }
     )
 
 
+@router.get(
+    "/random",
+    response_model=Response[List[ExamResponse]],
+    summary="随机组卷",
+    description="按科目、分类、题型、难度、年份范围随机抽取不重复的真题"
+)
+async def get_random_paper(
+    session: SessionDep,
+    count: int = Query(default=10, ge=1, le=100, description="抽题数量"),
+    subject_id: Optional[int] = Query(default=None, description="科目ID"),
+    categories: Optional[List[str]] = Query(default=None, description="分类（可重复传入，命中任一即可）"),
+    question_type: Optional[str] = Query(default=None, pattern="^(CHOICE|ESSAY)$", description="题型"),
+    difficulty: Optional[str] = Query(default=None, pattern="^(EASY|MEDIUM|HARD)$", description="难度"),
+    year_from: Optional[int] = Query(default=None, description="起始年份（含）"),
+    year_to: Optional[int] = Query(default=None, description="结束年份（含）")
+) -> Response[List[ExamResponse]]:
+    """
+    随机组卷
+
+    - 权限：公开
+    - 从内存题目ID桶中抽样，符合条件的题目不足时返回全部可用题目
+    """
+    params = ExamRandomPaperParams(
+        count=count,
+        subject_id=subject_id,
+        categories=categories,
+        question_type=question_type,
+        difficulty=difficulty,
+        year_from=year_from,
+        year_to=year_to
+    )
+    service = ExamService(session)
+    exams = await service.get_random_paper(params)
+    return Response(data=exams)
+
+
+@router.post(
+    "/random/complete",
+    response_model=Response[ExamRandomStatResponse],
+    summary="记录随机组卷完成",
+    description="当前用户完成一次随机组卷后调用，累加完成次数"
+)
+async def complete_random_paper(
+    session: SessionDep,
+    current_user: AuthUser = Depends(get_current_user)
+) -> Response[ExamRandomStatResponse]:
+    """
+    记录随机组卷完成
+
+    - 权限：登录用户
+    """
+    service = ExamService(session)
+    stat = await service.record_random_completion(current_user.user_id)
+    return Response(data=stat, message="记录成功")
+
+
+@router.get(
+    "/near-duplicates/report",
+    response_model=Response[NearDuplicateReportResponse],
+    summary="真题近似重复报告",
+    description="检测整个真题题库中内容近似的题目并分组，仅管理员可访问"
+)
+async def get_exam_near_duplicate_report(
+    session: SessionDep,
+    threshold: float = Query(default=0.7, ge=0.3, le=1.0, description="相似度阈值"),
+    current_user: AuthUser = Depends(get_current_admin)
+) -> Response[NearDuplicateReportResponse]:
+    """
+    真题近似重复报告
+
+    - 权限：ADMIN
+    - 相似度为题干与选项文本 MinHash 签名估计的 Jaccard 相似度
+    """
+    service = NearDuplicateService(session)
+    report = await service.report_exams(threshold)
+    return Response(data=report)
+
+
 @router.get(
     "/{exam_id}",
     response_model=Response[ExamResponse],
@@ -252,18 +390,68 @@ async def export_by_subject(
 )
 async def get_exam_detail(
     session: SessionDep,
-    exam_id: int = Path(..., description="真题ID")
+    exam_id: int = Path(..., description="真题ID"),
+    rendered: Optional[str] = Query(default=None, pattern="^html$", description="传入 html 时附加预渲染的题目 HTML")
 ) -> Response[ExamResponse]:
     """
     按ID查询真题详情
 
     - 权限：公开
+    - rendered=html 时附加 rendered 字段（净化后的 HTML，公式由前端 KaTeX 渲染）
     """
     service = ExamService(session)
     exam = await service.get_by_id(exam_id)
+    if rendered:
+        await RenderService(session).attach([exam])
     return Response(data=exam)
 
 
+@router.get(
+    "/{exam_id}/neighbors",
+    response_model=Response[ExamNeighborsResponse],
+    summary="查询上一题/下一题",
+    description="按导航顺序（年份降序、题号升序）返回相邻真题ID，可按分类或科目限定范围"
+)
+async def get_exam_neighbors(
+    session: SessionDep,
+    exam_id: int = Path(..., description="真题ID"),
+    category: Optional[str] = Query(default=None, description="分类筛选"),
+    subject_id: Optional[int] = Query(default=None, description="科目ID筛选")
+) -> Response[ExamNeighborsResponse]:
+    """
+    查询上一题与下一题
+
+    - 权限：公开
+    - 详情页渲染前后翻页按钮时使用，无需加载完整导航索引
+    """
+    service = ExamService(session)
+    neighbors = await service.get_neighbors(exam_id, category, subject_id)
+    return Response(data=neighbors)
+
+
+@router.get(
+    "/{exam_id}/similar",
+    response_model=Response[List[SimilarQuestionItem]],
+    summary="推荐相似题目",
+    description="按题目文本的 TF-IDF 余弦相似度推荐内容相关的题目，默认推荐模拟题"
+)
+async def get_similar_to_exam(
+    session: SessionDep,
+    exam_id: int = Path(..., description="真题ID"),
+    bank: str = Query(default="mock", pattern="^(exam|mock|all)$", description="推荐范围：mock（模拟题）/ exam（真题）/ all（全部）"),
+    limit: int = Query(default=10, ge=1, le=50, description="返回数量")
+) -> Response[List[SimilarQuestionItem]]:
+    """
+    推荐与真题相似的题目
+
+    - 权限：公开
+    - 不包含真题本身；题库有写入后推荐结果在后台重建索引后更新（约 30 秒）
+    """
+    service = SimilarQuestionService(session)
+    items = await service.similar_to_exam(exam_id, None if bank == "all" else bank, limit)
+    return Response(data=items)
+
+
 @router.get(
     "/check-duplicate",
     response_model=Response[ExamResponse],
@@ -309,6 +497,95 @@ async def create_exam(
     return Response(data=exam, message="创建成功")
 
 
+@router.post(
+    "/import",
+    response_model=Response[ImportReportResponse],
+    summary="批量导入真题",
+    description="以 JSON Lines 或 Markdown 试卷批量导入真题，支持试运行，仅管理员可访问"
+)
+async def import_exams(
+    session: SessionDep,
+    request: ExamImportRequest,
+    current_user: AuthUser = Depends(get_current_admin)
+) -> Response[ImportReportResponse]:
+    """
+    批量导入真题
+
+    - 权限：ADMIN
+    - 逐行校验并查重，返回逐行导入结果；dry_run=true 时不写入数据库
+    """
+    service = QuestionImportService(session)
+    report = await service.import_exams(request, current_user.user_id)
+    return Response(data=report, message="试运行完成" if request.dry_run else "导入完成")
+
+
+@router.post(
+    "/bulk-update",
+    response_model=Response[BulkOperationResponse],
+    summary="批量更新真题",
+    description="按ID列表或筛选条件批量修改真题，仅管理员可访问"
+)
+async def bulk_update_exams(
+    session: SessionDep,
+    request: ExamBulkUpdateRequest,
+    current_user: AuthUser = Depends(get_current_admin)
+) -> Response[BulkOperationResponse]:
+    """
+    批量更新真题
+
+    - 权限：ADMIN
+    - ids 与 filter 二选一，在一个事务内以一条 UPDATE 语句完成
+    - 分类支持追加（add_categories）与移除（remove_categories）
+    """
+    service = QuestionBulkService(session)
+    result = await service.update_exams(request)
+    return Response(data=result, message="批量更新成功")
+
+
+@router.post(
+    "/bulk-delete",
+    response_model=Response[BulkOperationResponse],
+    summary="批量删除真题",
+    description="按ID列表或筛选条件批量删除真题，仅管理员可访问"
+)
+async def bulk_delete_exams(
+    session: SessionDep,
+    request: ExamBulkDeleteRequest,
+    current_user: AuthUser = Depends(get_current_admin)
+) -> Response[BulkOperationResponse]:
+    """
+    批量删除真题
+
+    - 权限：ADMIN
+    - ids 与 filter 二选一，物理删除，无法撤销
+    """
+    service = QuestionBulkService(session)
+    result = await service.delete_exams(request)
+    return Response(data=result, message="批量删除成功")
+
+
+@router.post(
+    "/near-duplicates",
+    response_model=Response[List[NearDuplicateCandidate]],
+    summary="检查真题近似重复",
+    description="查找与给定题目内容近似的已有真题，仅管理员可访问"
+)
+async def check_exam_near_duplicates(
+    session: SessionDep,
+    request: NearDuplicateCheckRequest,
+    current_user: AuthUser = Depends(get_current_admin)
+) -> Response[List[NearDuplicateCandidate]]:
+    """
+    检查真题近似重复
+
+    - 权限：ADMIN
+    - 返回相似度不低于阈值的已有题目（按相似度降序，最多 10 条），用于创建、编辑前提示
+    """
+    service = NearDuplicateService(session)
+    candidates = await service.check_exam(request)
+    return Response(data=candidates)
+
+
 @router.post(
     "/{exam_id}",
     response_model=Response[ExamResponse],
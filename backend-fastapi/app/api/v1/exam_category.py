@@ -11,6 +11,7 @@ from app.schemas.category import (
     ExamCategoryCreateRequest,
     ExamCategoryUpdateRequest,
     ExamCategoryResponse,
+    ExamCategoryNodeResponse,
     ExamCategoryTreeResponse,
     ExamCategoryStatResponse,
     ExamCategoryUsageResponse
@@ -218,6 +219,50 @@ async def check_category_usage(
     return Response(data=usage)
 
 
+@router.get(
+    "/{category_id}/descendants",
+    response_model=Response[List[ExamCategoryNodeResponse]],
+    summary="查询子孙分类",
+    description="一次查询返回分类下全部层级的子孙分类及其相对层级"
+)
+async def get_category_descendants(
+    session: SessionDep,
+    category_id: int = Path(..., description="分类ID"),
+    include_self: bool = Query(False, description="是否包含分类自身")
+) -> Response[List[ExamCategoryNodeResponse]]:
+    """
+    查询子孙分类
+
+    - 权限：公开
+    - depth 为相对层级，分类自身为 0
+    """
+    service = ExamCategoryService(session)
+    categories = await service.get_descendants(category_id, include_self)
+    return Response(data=categories)
+
+
+@router.get(
+    "/{category_id}/ancestors",
+    response_model=Response[List[ExamCategoryNodeResponse]],
+    summary="查询分类路径",
+    description="一次查询返回从顶级分类到父分类的祖先路径"
+)
+async def get_category_ancestors(
+    session: SessionDep,
+    category_id: int = Path(..., description="分类ID"),
+    include_self: bool = Query(False, description="是否包含分类自身")
+) -> Response[List[ExamCategoryNodeResponse]]:
+    """
+    查询分类的祖先路径
+
+    - 权限：公开
+    - depth 为与该分类的层级距离
+    """
+    service = ExamCategoryService(session)
+    categories = await service.get_ancestors(category_id, include_self)
+    return Response(data=categories)
+
+
 @router.get(
     "/{category_id}",
     response_model=Response[ExamCategoryResponse],
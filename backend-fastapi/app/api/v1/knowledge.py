@@ -0,0 +1,126 @@
+"""
+知识点模块路由
+"""
+from typing import List
+from fastapi import APIRouter, Depends, Path, status
+from app.database.connection import SessionDep
+from app.services.knowledge_service import KnowledgeService
+from app.schemas.knowledge import (
+    KnowledgePointCreateRequest,
+    KnowledgePointUpdateRequest,
+    KnowledgePointListItem,
+    KnowledgePointResponse
+)
+from app.schemas.common import Response
+from app.middleware.auth import get_current_admin, AuthUser
+
+router = APIRouter()
+
+
+@router.get(
+    "/chapter/{chapter_id}",
+    response_model=Response[List[KnowledgePointListItem]],
+    summary="查询章节知识点列表",
+    description="根据章节ID查询知识点列表（不含正文）"
+)
+async def list_knowledge_points_by_chapter(
+    session: SessionDep,
+    chapter_id: int = Path(..., description="章节ID")
+) -> Response[List[KnowledgePointListItem]]:
+    """
+    查询章节下的知识点列表
+
+    - 权限：公开
+    """
+    service = KnowledgeService(session)
+    items = await service.list_by_chapter(chapter_id)
+    return Response(data=items)
+
+
+@router.get(
+    "/{point_id}",
+    response_model=Response[KnowledgePointResponse],
+    summary="查询知识点详情",
+    description="根据ID查询知识点详情，并计入一次浏览"
+)
+async def get_knowledge_point(
+    session: SessionDep,
+    point_id: int = Path(..., description="知识点ID")
+) -> Response[KnowledgePointResponse]:
+    """
+    按ID查询知识点详情
+
+    - 权限：公开
+    - 浏览次数在内存中累加、定期批量写回，本接口不写数据库
+    """
+    service = KnowledgeService(session)
+    point = await service.get_by_id(point_id, record_view=True)
+    return Response(data=point)
+
+
+@router.post(
+    "",
+    response_model=Response[KnowledgePointResponse],
+    status_code=status.HTTP_200_OK,
+    summary="创建知识点",
+    description="创建新知识点，仅管理员可访问"
+)
+async def create_knowledge_point(
+    session: SessionDep,
+    request: KnowledgePointCreateRequest,
+    current_user: AuthUser = Depends(get_current_admin)
+) -> Response[KnowledgePointResponse]:
+    """
+    创建知识点
+
+    - 权限：ADMIN
+    """
+    service = KnowledgeService(session)
+    point = await service.create(request, current_user.user_id)
+    return Response(data=point, message="创建成功")
+
+
+@router.post(
+    "/{point_id}",
+    response_model=Response[KnowledgePointResponse],
+    status_code=status.HTTP_200_OK,
+    summary="更新知识点",
+    description="更新指定知识点，仅管理员可访问"
+)
+async def update_knowledge_point(
+    session: SessionDep,
+    request: KnowledgePointUpdateRequest,
+    point_id: int = Path(..., description="知识点ID"),
+    current_user: AuthUser = Depends(get_current_admin)
+) -> Response[KnowledgePointResponse]:
+    """
+    更新知识点
+
+    - 权限：ADMIN
+    - 支持部分字段更新
+    """
+    service = KnowledgeService(session)
+    point = await service.update(point_id, request)
+    return Response(data=point, message="更新成功")
+
+
+@router.post(
+    "/{point_id}/delete",
+    response_model=Response[None],
+    status_code=status.HTTP_200_OK,
+    summary="删除知识点",
+    description="删除指定知识点，仅管理员可访问"
+)
+async def delete_knowledge_point(
+    session: SessionDep,
+    point_id: int = Path(..., description="知识点ID"),
+    current_user: AuthUser = Depends(get_current_admin)
+) -> Response[None]:
+    """
+    删除知识点
+
+    - 权限：ADMIN
+    """
+    service = KnowledgeService(session)
+    await service.delete(point_id)
+    return Response(message="删除成功")
@@ -7,6 +7,11 @@ from typing import Optional, List
 from fastapi import APIRouter, Depends, Query, Path, status
 from app.database.connection import SessionDep
 from app.services.mock_service import MockService
+from app.services.import_service import QuestionImportService
+from app.services.bulk_service import QuestionBulkService
+from app.services.render_service import RenderService
+from app.services.near_duplicate_service import NearDuplicateService
+from app.services.similar_service import SimilarQuestionService
 from app.schemas.mock import (
     MockQueryParams,
     MockCreateRequest,
@@ -15,9 +20,20 @@ from app.schemas.mock import (
     MockSourceStatResponse,
     MockSourcesResponse,
     MockCategoryStatsResponse,
-    PaginatedMockResponse
+    PaginatedMockResponse,
+    MockImportRequest,
+    MockBulkUpdateRequest,
+    MockBulkDeleteRequest
+)
+from app.schemas.common import (
+    Response,
+    ImportReportResponse,
+    BulkOperationResponse,
+    NearDuplicateCandidate,
+    NearDuplicateCheckRequest,
+    NearDuplicateReportResponse,
+    SimilarQuestionItem
 )
-from app.schemas.common import Response
 from app.middleware.auth import get_current_user, get_current_admin, AuthUser
 
 router = APIRouter()
@@ -39,12 +55,18 @@ async def get_mock_questions(
     no_category: Optional[bool] = Query(default=None, description="是否筛选无分类"),
     keyword: Optional[str] = Query(default=None, description="关键词搜索"),
     sort_field: str = Query(default="update_time", description="排序字段"),
-    sort_order: str = Query(default="desc", description="排序方向")
+    sort_order: str = Query(default="desc", description="排序方向"),
+    cursor: Optional[str] = Query(default=None, description="游标（上一页返回的 next_cursor），传入后忽略 page"),
+    with_total: bool = Query(default=True, description="是否统计总数"),
+    total_mode: str = Query(default="exact", pattern="^(exact|estimated)$", description="总数模式：exact（精确）/ estimated（关键词搜索时封顶估计）"),
+    rendered: Optional[str] = Query(default=None, pattern="^html$", description="传入 html 时附加预渲染的题目 HTML")
 ) -> Response[PaginatedMockResponse]:
     """
     分页查询模拟题
 
     支持按来源、分类、科目、关键词等条件筛选，支持分页和排序。
+    传入 cursor 时按游标翻页（适用于无限滚动，每页开销恒定），with_total=false 时跳过总数统计。
+    total_mode=estimated 时关键词搜索的总数只统计到上限，返回 total_estimated 标记。
     """
     params = MockQueryParams(
         page=page,
@@ -55,10 +77,15 @@ async def get_mock_questions(
         no_category=no_category,
         keyword=keyword,
         sort_field=sort_field,
-        sort_order=sort_order
+        sort_order=sort_order,
+        cursor=cursor,
+        with_total=with_total,
+        total_mode=total_mode
     )
     service = MockService(session)
     result = await service.get_paginated(params)
+    if rendered:
+        await RenderService(session).attach(result.data)
     return Response(data=result)
 
 
@@ -210,6 +237,28 @@ async def get_titles_by_source(
     return Response(data=titles)
 
 
+@router.get(
+    "/near-duplicates/report",
+    response_model=Response[NearDuplicateReportResponse],
+    summary="模拟题近似重复报告",
+    description="检测整个模拟题题库中内容近似的题目并分组，仅管理员可访问"
+)
+async def get_mock_near_duplicate_report(
+    session: SessionDep,
+    threshold: float = Query(default=0.7, ge=0.3, le=1.0, description="相似度阈值"),
+    current_user: AuthUser = Depends(get_current_admin)
+) -> Response[NearDuplicateReportResponse]:
+    """
+    模拟题近似重复报告
+
+    - 权限：ADMIN
+    - 相似度为题干与选项文本 MinHash 签名估计的 Jaccard 相似度
+    """
+    service = NearDuplicateService(session)
+    report = await service.report_mocks(threshold)
+    return Response(data=report)
+
+
 @router.get(
     "/{mock_id}",
     response_model=Response[MockResponse],
@@ -218,18 +267,45 @@ async def get_titles_by_source(
 )
 async def get_mock_detail(
     session: SessionDep,
-    mock_id: int = Path(..., description="模拟题ID")
+    mock_id: int = Path(..., description="模拟题ID"),
+    rendered: Optional[str] = Query(default=None, pattern="^html$", description="传入 html 时附加预渲染的题目 HTML")
 ) -> Response[MockResponse]:
     """
     按ID查询模拟题详情
 
     - 权限：公开
+    - rendered=html 时附加 rendered 字段（净化后的 HTML，公式由前端 KaTeX 渲染）
     """
     service = MockService(session)
     mock = await service.get_by_id(mock_id)
+    if rendered:
+        await RenderService(session).attach([mock])
     return Response(data=mock)
 
 
+@router.get(
+    "/{mock_id}/similar",
+    response_model=Response[List[SimilarQuestionItem]],
+    summary="推荐相似题目",
+    description="按题目文本的 TF-IDF 余弦相似度推荐内容相关的题目，默认推荐模拟题"
+)
+async def get_similar_to_mock(
+    session: SessionDep,
+    mock_id: int = Path(..., description="模拟题ID"),
+    bank: str = Query(default="mock", pattern="^(exam|mock|all)$", description="推荐范围：mock（模拟题）/ exam（真题）/ all（全部）"),
+    limit: int = Query(default=10, ge=1, le=50, description="返回数量")
+) -> Response[List[SimilarQuestionItem]]:
+    """
+    推荐与模拟题相似的题目
+
+    - 权限：公开
+    - 不包含模拟题本身；题库有写入后推荐结果在后台重建索引后更新（约 30 秒）
+    """
+    service = SimilarQuestionService(session)
+    items = await service.similar_to_mock(mock_id, None if bank == "all" else bank, limit)
+    return Response(data=items)
+
+
 @router.post(
     "",
     response_model=Response[MockResponse],
@@ -252,6 +328,95 @@ async def create_mock(
     return Response(data=mock, message="创建成功")
 
 
+@router.post(
+    "/import",
+    response_model=Response[ImportReportResponse],
+    summary="批量导入模拟题",
+    description="以 JSON Lines 或 Markdown 试卷批量导入模拟题，支持试运行，仅管理员可访问"
+)
+async def import_mocks(
+    session: SessionDep,
+    request: MockImportRequest,
+    current_user: AuthUser = Depends(get_current_admin)
+) -> Response[ImportReportResponse]:
+    """
+    批量导入模拟题
+
+    - 权限：ADMIN
+    - 逐行校验并查重，返回逐行导入结果；dry_run=true 时不写入数据库
+    """
+    service = QuestionImportService(session)
+    report = await service.import_mocks(request, current_user.user_id)
+    return Response(data=report, message="试运行完成" if request.dry_run else "导入完成")
+
+
+@router.post(
+    "/bulk-update",
+    response_model=Response[BulkOperationResponse],
+    summary="批量更新模拟题",
+    description="按ID列表或筛选条件批量修改模拟题，仅管理员可访问"
+)
+async def bulk_update_mocks(
+    session: SessionDep,
+    request: MockBulkUpdateRequest,
+    current_user: AuthUser = Depends(get_current_admin)
+) -> Response[BulkOperationResponse]:
+    """
+    批量更新模拟题
+
+    - 权限：ADMIN
+    - ids 与 filter 二选一，在一个事务内以一条 UPDATE 语句完成
+    - 分类支持追加（add_categories）与移除（remove_categories）
+    """
+    service = QuestionBulkService(session)
+    result = await service.update_mocks(request)
+    return Response(data=result, message="批量更新成功")
+
+
+@router.post(
+    "/bulk-delete",
+    response_model=Response[BulkOperationResponse],
+    summary="批量删除模拟题",
+    description="按ID列表或筛选条件批量删除模拟题，仅管理员可访问"
+)
+async def bulk_delete_mocks(
+    session: SessionDep,
+    request: MockBulkDeleteRequest,
+    current_user: AuthUser = Depends(get_current_admin)
+) -> Response[BulkOperationResponse]:
+    """
+    批量删除模拟题
+
+    - 权限：ADMIN
+    - ids 与 filter 二选一，物理删除，无法撤销
+    """
+    service = QuestionBulkService(session)
+    result = await service.delete_mocks(request)
+    return Response(data=result, message="批量删除成功")
+
+
+@router.post(
+    "/near-duplicates",
+    response_model=Response[List[NearDuplicateCandidate]],
+    summary="检查模拟题近似重复",
+    description="查找与给定题目内容近似的已有模拟题，仅管理员可访问"
+)
+async def check_mock_near_duplicates(
+    session: SessionDep,
+    request: NearDuplicateCheckRequest,
+    current_user: AuthUser = Depends(get_current_admin)
+) -> Response[List[NearDuplicateCandidate]]:
+    """
+    检查模拟题近似重复
+
+    - 权限：ADMIN
+    - 返回相似度不低于阈值的已有题目（按相似度降序，最多 10 条），用于创建、编辑前提示
+    """
+    service = NearDuplicateService(session)
+    candidates = await service.check_mock(request)
+    return Response(data=candidates)
+
+
 @router.post(
     "/{mock_id}",
     response_model=Response[MockResponse],
@@ -10,6 +10,8 @@ from pydantic_settings import BaseSettings
 class DatabaseConfig(BaseSettings):
     """数据库配置"""
     database_url: str = "sqlite+aiosqlite:///./data/web408.db"
+    slow_query_ms: float = 200  # 慢查询阈值（毫秒），0 表示不记录
+    auto_migrate: bool = True  # 启动时结构版本过期则自动迁移；关闭后需显式执行 python -m app.database.migration
 
     class Config:
         env_prefix = "DATABASE_"
@@ -38,6 +40,7 @@ class ServerConfig(BaseSettings):
     host: str = "0.0.0.0"
     port: int = 8081
     api_prefix: str = "/api"
+    debug: bool = False  # 开启后响应模型使用严格模式校验（测试环境使用）
 
     class Config:
         env_prefix = "SERVER_"
@@ -67,11 +70,59 @@ class LoggingConfig(BaseSettings):
     log_level: str = "INFO"
     max_bytes: int = 10485760  # 10MB
     backup_count: int = 5
+    lifecycle_sample_rate: float = 1.0  # 服务层 started/completed 日志保留比例 (0~1)
 
     class Config:
         env_prefix = "LOGGING_"
 
 
+class CompressionConfig(BaseSettings):
+    """响应压缩配置"""
+    enabled: bool = True
+    minimum_size: int = 1024  # 小于该字节数的响应不压缩
+    gzip_level: int = 6
+    brotli_quality: int = 5  # 安装 brotli 后生效
+    cache_max_bytes: int = 33554432  # 压缩结果缓存上限 32MB
+    offload_min_size: int = 65536  # 不小于该字节数的响应在工作线程中压缩，不阻塞事件循环
+
+    class Config:
+        env_prefix = "COMPRESSION_"
+
+
+class ExportConfig(BaseSettings):
+    """导出文件缓存配置"""
+    cache_enabled: bool = True
+    cache_dir: str = "data/export_cache"
+    cache_max_bytes: int = 536870912  # 缓存目录总大小上限 512MB
+
+    class Config:
+        env_prefix = "EXPORT_"
+
+
+class RenderConfig(BaseSettings):
+    """题目内容预渲染配置（rendered=html）"""
+    pool_workers: int = 2  # 渲染进程数，0 表示在线程中渲染（不启动子进程）
+
+    class Config:
+        env_prefix = "RENDER_"
+
+
+class KnowledgeConfig(BaseSettings):
+    """知识点配置"""
+    view_flush_interval: float = 10  # 浏览次数写回数据库的间隔（秒）
+
+    class Config:
+        env_prefix = "KNOWLEDGE_"
+
+
+class CacheConfig(BaseSettings):
+    """缓存配置"""
+    sync_interval: float = 1  # 多 worker 时轮询其他进程写入的间隔（秒），0 表示单进程部署、关闭跨进程失效
+
+    class Config:
+        env_prefix = "CACHE_"
+
+
 class Settings(BaseSettings):
     """项目聚合配置（所有配置类的统一入口）"""
     database: DatabaseConfig = DatabaseConfig()
@@ -80,6 +131,11 @@ class Settings(BaseSettings):
     server: ServerConfig = ServerConfig()
     cors: CorsConfig = CorsConfig()
     logging: LoggingConfig = LoggingConfig()
+    compression: CompressionConfig = CompressionConfig()
+    export: ExportConfig = ExportConfig()
+    render: RenderConfig = RenderConfig()
+    knowledge: KnowledgeConfig = KnowledgeConfig()
+    cache: CacheConfig = CacheConfig()
 
     class Config:
         env_prefix = ""
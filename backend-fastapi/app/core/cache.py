@@ -0,0 +1,139 @@
+"""
+进程内缓存模块
+提供按表写版本失效的缓存：任何会话提交对某张表的写入后，该表版本号递增，
+依赖该表的缓存条目随之失效，无需在各业务写路径上手动清理。
+其他 worker 进程的写入由 app.core.version_sync 轮询后以 remote=True 递增版本号。
+"""
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session, ORMExecuteState
+
+
+class TableVersionRegistry:
+    """表写版本登记（每张表一个单调递增的版本号）"""
+
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+        self._listeners: Dict[str, List[Tuple[Callable[[str], None], bool]]] = {}
+
+    def get(self, table: str) -> int:
+        """获取表的当前版本号"""
+        return self._versions.get(table, 0)
+
+    def bump(self, tables: Iterable[str], remote: bool = False) -> None:
+        """
+        递增一组表的版本号，并通知订阅了这些表的监听器
+
+        Args:
+            tables: 表名
+            remote: 是否为其他进程的写入（本进程写入时只通知未设置 remote_only 的监听器）
+        """
+        tables = list(tables)
+        for table in tables:
+            self._versions[table] = self._versions.get(table, 0) + 1
+        for table in tables:
+            for listener, remote_only in self._listeners.get(table, ()):
+                if remote or not remote_only:
+                    listener(table)
+
+    def subscribe(self, table: str, listener: Callable[[str], None], remote_only: bool = False) -> None:
+        """
+        订阅表的版本变化（在事务提交后同步调用，监听器应只做轻量操作，如调度后台任务）
+
+        Args:
+            table: 表名
+            listener: 回调函数，参数为表名
+            remote_only: 只在其他进程写入时通知（本进程写入已由会话事件增量维护的索引使用）
+        """
+        self._listeners.setdefault(table, []).append((listener, remote_only))
+
+
+# 全局表版本登记
+table_versions = TableVersionRegistry()
+
+
+class VersionedCache:
+    """
+    按表写版本失效的 LRU 缓存
+
+    条目写入时记录所依赖表的版本号，读取时版本号不一致即视为失效。
+    版本号应在执行查询之前获取（current_version），避免查询期间发生的写入被掩盖。
+    """
+
+    def __init__(self, tables: Tuple[str, ...], max_size: int = 256):
+        self.tables = tables
+        self.max_size = max_size
+        self._entries: OrderedDict[Hashable, Tuple[Tuple[int, ...], Any]] = OrderedDict()
+
+    def current_version(self) -> Tuple[int, ...]:
+        """获取依赖表的当前版本号"""
+        return tuple(table_versions.get(t) for t in self.tables)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """读取缓存，未命中或已失效返回 None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        version, value = entry
+        if version != self.current_version():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, version: Tuple[int, ...]) -> None:
+        """写入缓存"""
+        self._entries[key] = (version, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._entries.clear()
+
+
+# ============================================
+# 会话事件：收集写入的表，提交后递增版本号
+# ============================================
+_PENDING_KEY = "written_tables"
+
+
+def written_tables(session: Session) -> Set[str]:
+    """当前事务中已写入（尚未提交）的表"""
+    return session.info.setdefault(_PENDING_KEY, set())
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tables(session: Session, flush_context) -> None:
+    """记录本次 flush 中新增、修改、删除的实体所属表"""
+    pending = written_tables(session)
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table:
+            pending.add(table)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_tables(orm_execute_state: ORMExecuteState) -> None:
+    """记录 ORM 批量 insert/update/delete 语句涉及的表"""
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None:
+        written_tables(orm_execute_state.session).add(mapper.local_table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed_tables(session: Session) -> None:
+    """事务提交后递增写入表的版本号"""
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        table_versions.bump(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_tables(session: Session) -> None:
+    """事务回滚后丢弃记录"""
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,433 @@
+"""
+近似重复题目检测模块
+用 MinHash 签名估计题目文本的 Jaccard 相似度，用 LSH 分桶快速找出候选，避免与题库逐题比较
+
+    - 文本规范化后（去除图片链接、空白与标点，统一大小写）取字符 3-gram 作为 shingle，
+      shingle 哈希与 MinHash 置换均用 NumPy 向量化计算
+    - 签名按 LSH_BANDS 段分桶，任一段完全相同即为候选，再按签名一致比例计算相似度过滤
+    - 索引在首次使用时从数据库加载，之后随会话提交增量更新（与随机抽样索引相同的事件机制）；
+      ORM 批量写语句或其他 worker 进程的写入无法得知具体行，此时将索引标记为失效，下次使用时重新加载
+    - 加载时全题库的签名在工作线程中计算，并发请求共享同一个加载任务；
+      加载期间有变化提交（代数改变）时丢弃结果重新加载
+    - NumPy 在首次计算签名时才导入，不计入应用启动的导入耗时
+"""
+import asyncio
+import json
+import re
+import unicodedata
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple, Type
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session, ORMExecuteState
+from sqlmodel import SQLModel
+from app.core.cache import table_versions
+from app.database.connection import get_session_context
+from app.models.entities import ExamQuestion, MockQuestion
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+# MinHash 置换数与 LSH 分段（32 段 × 4 行：相似度约 0.5 以上的题目几乎都会成为候选）
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 32
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+
+# 默认相似度阈值
+DEFAULT_THRESHOLD = 0.7
+
+# shingle 长度（字符数，适合中文；英文与代码按去空白后的字符计算）
+SHINGLE_SIZE = 3
+
+_IMAGE_PATTERN = re.compile(r"!\[[^\]]*\]\([^)]*\)|https?://\S+")
+_NON_WORD_PATTERN = re.compile(r"[\W_]+")
+_MASK32 = 0xFFFFFFFF
+
+# 加载期间持续有变化提交时的最大加载次数
+MAX_LOAD_ATTEMPTS = 3
+
+
+@lru_cache()
+def _permutations() -> "Tuple[np.ndarray, np.ndarray, np.uint64]":
+    """
+    置换 h(x) = (a·x + b) mod p 的参数 (a, b, p)
+
+    p 为大于 2^32 的素数；a、b 取固定种子以保证签名跨进程一致
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(408)
+    perm_a = rng.integers(1, 2 ** 32 - 1, size=NUM_PERMUTATIONS, dtype=np.uint64)
+    perm_b = rng.integers(0, 2 ** 32 - 1, size=NUM_PERMUTATIONS, dtype=np.uint64)
+    return perm_a, perm_b, np.uint64(4294967311)
+
+
+def question_text(content: Optional[str], options: Optional[str]) -> str:
+    """
+    参与查重的题目文本：题干 + 选项内容
+
+    Args:
+        content: 题目内容
+        options: 选项（JSON 对象字符串）
+
+    Returns:
+        文本
+    """
+    parts = [content or ""]
+    if options:
+        try:
+            value = json.loads(options)
+        except (TypeError, ValueError):
+            value = options
+        if isinstance(value, dict):
+            parts.extend(str(v) for v in value.values())
+        elif isinstance(value, list):
+            parts.extend(str(v) for v in value)
+        else:
+            parts.append(str(value))
+    return "\n".join(parts)
+
+
+def normalize_text(text: str) -> str:
+    """规范化：全角转半角、小写，去除图片链接、空白与标点"""
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = _IMAGE_PATTERN.sub(" ", text)
+    return _NON_WORD_PATTERN.sub("", text)
+
+
+def shingle_hashes(text: str) -> "np.ndarray":
+    """
+    计算规范化文本的字符 shingle 哈希（去重后的 uint64 数组，取值小于 2^32）
+
+    Args:
+        text: 原始文本
+
+    Returns:
+        哈希数组（文本为空时为空数组）
+    """
+    import numpy as np
+
+    normalized = normalize_text(text)
+    if not normalized:
+        return np.empty(0, dtype=np.uint64)
+    codes = np.frombuffer(normalized.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    size = min(SHINGLE_SIZE, len(codes))
+    count = len(codes) - size + 1
+    # 多项式滚动哈希（按 2^32 取模），再用乘法与移位混合使哈希值分布均匀
+    mask = np.uint64(_MASK32)
+    hashes = np.zeros(count, dtype=np.uint64)
+    for offset in range(size):
+        hashes = (hashes * np.uint64(1000003) + codes[offset:offset + count]) & mask
+    hashes = (hashes * np.uint64(0x9E3779B1)) & mask
+    hashes ^= hashes >> np.uint64(15)
+    return np.unique(hashes)
+
+
+def minhash_signature(text: str) -> "Optional[np.ndarray]":
+    """
+    计算 MinHash 签名
+
+    Args:
+        text: 原始文本
+
+    Returns:
+        长度为 NUM_PERMUTATIONS 的签名（文本规范化后为空时返回 None）
+    """
+    hashes = shingle_hashes(text)
+    if not len(hashes):
+        return None
+    # (置换数, shingle 数) 矩阵：a、x 均小于 2^32，a·x + b 不会溢出 uint64
+    perm_a, perm_b, prime = _permutations()
+    permuted = (perm_a[:, None] * hashes[None, :] + perm_b[:, None]) % prime
+    return permuted.min(axis=1)
+
+
+class MinHashLSH:
+    """MinHash 签名的 LSH 索引（键可为题目ID或导入行号等任意可哈希值）"""
+
+    def __init__(self):
+        self._signatures: "Dict[object, np.ndarray]" = {}
+        self._bands: List[Dict[bytes, Set[object]]] = [{} for _ in range(LSH_BANDS)]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key) -> bool:
+        return key in self._signatures
+
+    def clear(self) -> None:
+        self._signatures.clear()
+        for band in self._bands:
+            band.clear()
+
+    def add(self, key, signature: "np.ndarray") -> None:
+        """加入（已存在时替换）"""
+        self.remove(key)
+        self._signatures[key] = signature
+        for band, band_key in zip(self._bands, self._band_keys(signature)):
+            band.setdefault(band_key, set()).add(key)
+
+    def remove(self, key) -> None:
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for band, band_key in zip(self._bands, self._band_keys(signature)):
+            bucket = band.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del band[band_key]
+
+    def query(
+        self,
+        signature: "np.ndarray",
+        threshold: float = DEFAULT_THRESHOLD,
+        exclude=None
+    ) -> List[Tuple[object, float]]:
+        """
+        查找相似度不低于阈值的条目
+
+        Args:
+            signature: 查询签名
+            threshold: 相似度阈值
+            exclude: 排除的键
+
+        Returns:
+            [(键, 相似度)]，按相似度降序
+        """
+        candidates: Set[object] = set()
+        for band, band_key in zip(self._bands, self._band_keys(signature)):
+            bucket = band.get(band_key)
+            if bucket:
+                candidates |= bucket
+        candidates.discard(exclude)
+        if not candidates:
+            return []
+        import numpy as np
+
+        keys = list(candidates)
+        matrix = np.stack([self._signatures[k] for k in keys])
+        similarities = (matrix == signature).mean(axis=1)
+        matched = [(k, float(s)) for k, s in zip(keys, similarities) if s >= threshold]
+        matched.sort(key=lambda item: -item[1])
+        return matched
+
+    def similar_pairs(self, threshold: float = DEFAULT_THRESHOLD) -> List[Tuple[object, object, float]]:
+        """
+        找出索引内全部相似度不低于阈值的条目对
+
+        Args:
+            threshold: 相似度阈值
+
+        Returns:
+            [(键1, 键2, 相似度)]，按相似度降序
+        """
+        order = {key: i for i, key in enumerate(self._signatures)}
+        pairs: Set[Tuple[object, object]] = set()
+        for band in self._bands:
+            for bucket in band.values():
+                if len(bucket) < 2:
+                    continue
+                members = sorted(bucket, key=order.__getitem__)
+                for i, first in enumerate(members):
+                    for second in members[i + 1:]:
+                        pairs.add((first, second))
+        if not pairs:
+            return []
+        import numpy as np
+
+        pair_list = list(pairs)
+        left = np.stack([self._signatures[a] for a, _ in pair_list])
+        right = np.stack([self._signatures[b] for _, b in pair_list])
+        similarities = (left == right).mean(axis=1)
+        result = [(a, b, float(s)) for (a, b), s in zip(pair_list, similarities) if s >= threshold]
+        result.sort(key=lambda item: -item[2])
+        return result
+
+    @staticmethod
+    def _band_keys(signature: "np.ndarray") -> List[bytes]:
+        raw = signature.tobytes()
+        width = LSH_ROWS * signature.itemsize
+        return [raw[i * width:(i + 1) * width] for i in range(LSH_BANDS)]
+
+
+def build_lsh(rows: Iterable[tuple]) -> MinHashLSH:
+    """
+    由 (id, content, options) 行构建 LSH 索引（在工作线程中执行）
+
+    Args:
+        rows: 题目行
+
+    Returns:
+        LSH 索引（规范化后文本为空的题目不加入）
+    """
+    lsh = MinHashLSH()
+    for question_id, content, options in rows:
+        signature = minhash_signature(question_text(content, options))
+        if signature is not None:
+            lsh.add(question_id, signature)
+    return lsh
+
+
+class NearDuplicateIndex:
+    """题库近似重复索引（按题目ID维护 MinHash 签名）"""
+
+    def __init__(self, model: Type[SQLModel]):
+        self.model = model
+        self.lsh = MinHashLSH()
+        self._loaded = False
+        # 代数：每次变化（增删、失效）递增，用于判断加载期间是否有变化提交
+        self._generation = 0
+        self._loading: Optional[asyncio.Task] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def invalidate(self) -> None:
+        """标记索引失效，下次使用时重新加载"""
+        self._loaded = False
+        self._generation += 1
+
+    async def ensure_loaded(self) -> None:
+        """确保索引已加载（并发调用共享同一个加载任务）"""
+        if self._loaded:
+            return
+        if self._loading is None:
+            task = asyncio.get_running_loop().create_task(self._load())
+            self._loading = task
+
+            def done(finished: asyncio.Task) -> None:
+                if self._loading is finished:
+                    self._loading = None
+            task.add_done_callback(done)
+        await asyncio.shield(self._loading)
+
+    async def _load(self) -> None:
+        """从数据库加载（只读取 id、content、options 三个字段），签名在工作线程中计算"""
+        stmt = select(self.model.id, self.model.content, self.model.options)
+        for _ in range(MAX_LOAD_ATTEMPTS):
+            generation = self._generation
+            async with get_session_context() as session:
+                rows = (await session.execute(stmt)).all()
+            lsh = await asyncio.to_thread(build_lsh, rows)
+            self.lsh = lsh
+            if self._generation == generation:
+                self._loaded = True
+                return
+        # 持续有变化提交：本次使用最后一次加载结果，保持未加载状态，下次使用时重新加载
+
+    def upsert(self, question_id: int, text: str) -> None:
+        """新增或更新一道题（文本为空时只移除）"""
+        self._generation += 1
+        signature = minhash_signature(text)
+        if signature is None:
+            self.lsh.remove(question_id)
+        else:
+            self.lsh.add(question_id, signature)
+
+    def remove(self, question_id: int) -> None:
+        self._generation += 1
+        self.lsh.remove(question_id)
+
+    async def find(
+        self,
+        text: str,
+        threshold: float = DEFAULT_THRESHOLD,
+        exclude_id: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        查找与文本近似重复的题目
+
+        Args:
+            text: 题目文本（question_text 的结果）
+            threshold: 相似度阈值
+            exclude_id: 排除的题目ID
+
+        Returns:
+            [(题目ID, 相似度)]，按相似度降序
+        """
+        await self.ensure_loaded()
+        signature = minhash_signature(text)
+        if signature is None:
+            return []
+        return self.lsh.query(signature, threshold, exclude=exclude_id)
+
+
+# 全局索引实例
+exam_near_duplicates = NearDuplicateIndex(ExamQuestion)
+mock_near_duplicates = NearDuplicateIndex(MockQuestion)
+
+_INDEXES: Dict[str, NearDuplicateIndex] = {
+    index.model.__tablename__: index for index in (exam_near_duplicates, mock_near_duplicates)
+}
+
+# 其他进程写入题目表时整体重新加载
+for _table in _INDEXES:
+    table_versions.subscribe(_table, lambda table: _INDEXES[table].invalidate(), remote_only=True)
+
+
+# ============================================
+# 会话事件：提交后增量更新索引
+# ============================================
+_PENDING_KEY = "near_duplicate_changes"
+_RELOAD_KEY = "near_duplicate_reload"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_text_changes(session: Session, flush_context) -> None:
+    """记录本次 flush 中文本变化的题目（删除记为 None）"""
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table not in _INDEXES or obj.id is None:
+            continue
+        changes = session.info.setdefault(_PENDING_KEY, {})
+        if obj in session.deleted:
+            changes[(table, obj.id)] = None
+            continue
+        state = inspect(obj)
+        if obj in session.dirty and not (
+            state.attrs.content.history.has_changes() or state.attrs.options.history.has_changes()
+        ):
+            continue
+        changes[(table, obj.id)] = question_text(obj.content, obj.options)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_on_bulk_write(orm_execute_state: ORMExecuteState) -> None:
+    """ORM 批量写语句涉及题目表时，提交后整体重新加载"""
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.local_table.name in _INDEXES:
+        orm_execute_state.session.info.setdefault(_RELOAD_KEY, set()).add(mapper.local_table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_text_changes(session: Session) -> None:
+    """事务提交后将变化应用到索引"""
+    changes = session.info.pop(_PENDING_KEY, None)
+    reload = session.info.pop(_RELOAD_KEY, None) or set()
+    for table in reload:
+        _INDEXES[table].invalidate()
+    if not changes:
+        return
+    for (table, question_id), text in changes.items():
+        index = _INDEXES[table]
+        if table in reload:
+            continue
+        if not index.loaded:
+            # 可能有加载正在进行，其结果不一定包含本次提交的变化，使其作废
+            index.invalidate()
+            continue
+        if text is None:
+            index.remove(question_id)
+        else:
+            index.upsert(question_id, text)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_text_changes(session: Session) -> None:
+    """事务回滚后丢弃记录"""
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_RELOAD_KEY, None)
@@ -0,0 +1,338 @@
+"""
+真题随机抽样索引模块
+在内存中按 (科目, 题型, 分类) 维护真题ID桶，随机组卷时直接从桶中抽样，
+避免对 exam_question 全表 ORDER BY RANDOM()
+
+索引首次使用时从数据库加载（只读取 6 个轻量字段），之后随会话提交增量更新：
+会话 flush 时记录新增、修改、删除的真题，提交后应用到索引，回滚则丢弃。
+并发请求共享同一个加载任务；加载期间有变化提交（代数改变）时，加载结果可能缺少这些变化，丢弃后重新加载。
+ORM 批量 update/delete 语句无法得知具体行，此时将索引标记为失效，下次使用时重新加载；
+其他 worker 进程写入真题表时同样标记失效（app.core.version_sync）。
+"""
+import asyncio
+import json
+import random
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, ORMExecuteState
+from app.core.cache import table_versions
+from app.database.connection import get_session_context
+from app.models.entities import ExamQuestion
+
+
+# 桶键：(科目ID, 题型, 分类名)，无分类的题目分类名为 None
+BucketKey = Tuple[Optional[int], str, Optional[str]]
+
+# 题目元数据：(科目ID, 题型, 分类元组, 年份, 难度)
+QuestionMeta = Tuple[Optional[int], str, Tuple[str, ...], int, Optional[str]]
+
+# 加载期间持续有变化提交时的最大加载次数
+MAX_LOAD_ATTEMPTS = 3
+
+
+class IdBucket:
+    """支持 O(1) 增删与随机访问的ID集合"""
+
+    __slots__ = ("ids", "positions")
+
+    def __init__(self):
+        self.ids: List[int] = []
+        self.positions: Dict[int, int] = {}
+
+    def add(self, question_id: int) -> None:
+        if question_id not in self.positions:
+            self.positions[question_id] = len(self.ids)
+            self.ids.append(question_id)
+
+    def remove(self, question_id: int) -> None:
+        """与末尾元素交换后弹出"""
+        index = self.positions.pop(question_id, None)
+        if index is None:
+            return
+        last = self.ids.pop()
+        if index < len(self.ids):
+            self.ids[index] = last
+            self.positions[last] = index
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def parse_categories(raw: Optional[str]) -> Tuple[str, ...]:
+    """解析 category 字段（JSON 数组字符串）"""
+    if not raw:
+        return ()
+    try:
+        value = json.loads(raw)
+    except json.JSONDecodeError:
+        return ()
+    if not isinstance(value, list):
+        return ()
+    return tuple(dict.fromkeys(str(c) for c in value if c))
+
+
+class QuestionBucketIndex:
+    """真题随机抽样索引"""
+
+    # 拒绝采样的尝试次数上限（相对于抽样数量的倍数），超出后退化为过滤候选桶
+    MAX_REJECTION_FACTOR = 20
+
+    def __init__(self):
+        self._loaded = False
+        # 代数：每次变化（增删、失效）递增，用于判断加载期间是否有变化提交
+        self._generation = 0
+        self._loading: Optional[asyncio.Task] = None
+        self._meta: Dict[int, QuestionMeta] = {}
+        # 分类桶：(科目, 题型, 分类) -> ID；题型桶：(科目, 题型) -> ID（每题只出现一次）
+        self._category_buckets: Dict[BucketKey, IdBucket] = {}
+        self._type_buckets: Dict[Tuple[Optional[int], str], IdBucket] = {}
+
+    @property
+    def loaded(self) -> bool:
+        """索引是否可用"""
+        return self._loaded
+
+    def invalidate(self) -> None:
+        """标记索引失效，下次使用时重新加载"""
+        self._loaded = False
+        self._generation += 1
+
+    async def ensure_loaded(self) -> None:
+        """确保索引已加载（并发调用共享同一个加载任务）"""
+        if self._loaded:
+            return
+        if self._loading is None:
+            task = asyncio.get_running_loop().create_task(self._load())
+            self._loading = task
+
+            def done(finished: asyncio.Task) -> None:
+                if self._loading is finished:
+                    self._loading = None
+            task.add_done_callback(done)
+        await asyncio.shield(self._loading)
+
+    async def _load(self) -> None:
+        """从数据库加载（使用独立会话，只包含已提交的数据）"""
+        stmt = select(
+            ExamQuestion.id,
+            ExamQuestion.subject_id,
+            ExamQuestion.question_type,
+            ExamQuestion.category,
+            ExamQuestion.year,
+            ExamQuestion.difficulty
+        )
+        for _ in range(MAX_LOAD_ATTEMPTS):
+            generation = self._generation
+            async with get_session_context() as session:
+                rows = (await session.execute(stmt)).all()
+            if self._generation == generation:
+                self.rebuild(rows)
+                return
+        # 持续有变化提交：本次使用最后一次加载结果，保持未加载状态，下次使用时重新加载
+        self.rebuild(rows)
+        self._loaded = False
+
+    def rebuild(self, rows: Iterable[tuple]) -> None:
+        """由 (id, subject_id, question_type, category, year, difficulty) 行重建索引"""
+        self._meta.clear()
+        self._category_buckets.clear()
+        self._type_buckets.clear()
+        for question_id, subject_id, question_type, category, year, difficulty in rows:
+            self._add(question_id, (subject_id, question_type, parse_categories(category), year, difficulty))
+        self._loaded = True
+
+    def upsert(self, question_id: int, meta: QuestionMeta) -> None:
+        """新增或更新一道题"""
+        self.remove(question_id)
+        self._add(question_id, meta)
+        self._generation += 1
+
+    def remove(self, question_id: int) -> None:
+        """移除一道题"""
+        self._generation += 1
+        meta = self._meta.pop(question_id, None)
+        if meta is None:
+            return
+        subject_id, question_type, categories, _, _ = meta
+        self._type_buckets[(subject_id, question_type)].remove(question_id)
+        for category in categories or (None,):
+            self._category_buckets[(subject_id, question_type, category)].remove(question_id)
+
+    def _add(self, question_id: int, meta: QuestionMeta) -> None:
+        subject_id, question_type, categories, _, _ = meta
+        self._meta[question_id] = meta
+        self._type_buckets.setdefault((subject_id, question_type), IdBucket()).add(question_id)
+        for category in categories or (None,):
+            self._category_buckets.setdefault((subject_id, question_type, category), IdBucket()).add(question_id)
+
+    def sample(
+        self,
+        count: int,
+        subject_id: Optional[int] = None,
+        question_type: Optional[str] = None,
+        categories: Optional[List[str]] = None,
+        difficulty: Optional[str] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        rng: Optional[random.Random] = None
+    ) -> List[int]:
+        """
+        按条件随机抽取不重复的题目ID
+
+        先按科目、题型、分类选出候选桶，再在候选桶中随机取下标并检查年份、难度条件。
+        每次抽取为 O(1)，总开销与抽样数量成正比，与题库大小无关；
+        条件过严导致命中率过低时，退化为对候选桶做一次过滤后再抽样。
+
+        Args:
+            count: 抽取数量
+            subject_id: 科目ID
+            question_type: 题型
+            categories: 分类列表（命中任一分类即可）
+            difficulty: 难度
+            year_from: 起始年份（含）
+            year_to: 结束年份（含）
+            rng: 随机数生成器（默认使用全局随机数）
+
+        Returns:
+            题目ID列表（数量可能少于 count）
+        """
+        rng = rng or random
+        buckets = self._candidate_buckets(subject_id, question_type, categories)
+        sizes = [len(b) for b in buckets]
+        total = sum(sizes)
+        if total == 0 or count <= 0:
+            return []
+
+        def matches(question_id: int) -> bool:
+            _, _, _, year, question_difficulty = self._meta[question_id]
+            if year_from is not None and year < year_from:
+                return False
+            if year_to is not None and year > year_to:
+                return False
+            return difficulty is None or question_difficulty == difficulty
+
+        chosen: Dict[int, None] = {}
+        rejected: Set[int] = set()
+        attempts = 0
+        max_attempts = count * self.MAX_REJECTION_FACTOR
+        while len(chosen) < count and attempts < max_attempts:
+            attempts += 1
+            # 按桶大小加权选桶，再在桶内均匀取下标
+            offset = rng.randrange(total)
+            for bucket, size in zip(buckets, sizes):
+                if offset < size:
+                    question_id = bucket.ids[offset]
+                    break
+                offset -= size
+            if question_id in chosen or question_id in rejected:
+                continue
+            if matches(question_id):
+                chosen[question_id] = None
+            else:
+                rejected.add(question_id)
+
+        if len(chosen) < count:
+            # 命中率过低：过滤全部候选后补足
+            remaining = list({
+                question_id: None
+                for bucket in buckets for question_id in bucket.ids
+                if question_id not in chosen and matches(question_id)
+            })
+            for question_id in rng.sample(remaining, min(count - len(chosen), len(remaining))):
+                chosen[question_id] = None
+
+        return list(chosen)
+
+    def _candidate_buckets(
+        self,
+        subject_id: Optional[int],
+        question_type: Optional[str],
+        categories: Optional[List[str]]
+    ) -> List[IdBucket]:
+        """选出满足科目、题型、分类条件的桶"""
+        if categories:
+            wanted = set(categories)
+            return [
+                bucket for (s, t, c), bucket in self._category_buckets.items()
+                if c in wanted
+                and (subject_id is None or s == subject_id)
+                and (question_type is None or t == question_type)
+                and len(bucket)
+            ]
+        return [
+            bucket for (s, t), bucket in self._type_buckets.items()
+            if (subject_id is None or s == subject_id)
+            and (question_type is None or t == question_type)
+            and len(bucket)
+        ]
+
+
+# 全局索引实例
+question_buckets = QuestionBucketIndex()
+
+# 其他进程写入真题表时无法得知具体行，整体重新加载
+table_versions.subscribe(
+    ExamQuestion.__tablename__, lambda table: question_buckets.invalidate(), remote_only=True
+)
+
+
+# ============================================
+# 会话事件：提交后增量更新索引
+# ============================================
+_PENDING_KEY = "question_bucket_changes"
+
+
+def _pending_changes(session: Session) -> Dict[int, Optional[QuestionMeta]]:
+    return session.info.setdefault(_PENDING_KEY, {})
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_question_changes(session: Session, flush_context) -> None:
+    """记录本次 flush 中变化的真题（删除记为 None）"""
+    changes = None
+    for obj in (*session.new, *session.dirty):
+        if isinstance(obj, ExamQuestion) and obj.id is not None:
+            changes = changes if changes is not None else _pending_changes(session)
+            changes[obj.id] = (obj.subject_id, obj.question_type, parse_categories(obj.category),
+                               obj.year, obj.difficulty)
+    for obj in session.deleted:
+        if isinstance(obj, ExamQuestion) and obj.id is not None:
+            changes = changes if changes is not None else _pending_changes(session)
+            changes[obj.id] = None
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_on_bulk_write(orm_execute_state: ORMExecuteState) -> None:
+    """ORM 批量写语句涉及真题表时，提交后整体重新加载"""
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.local_table.name == ExamQuestion.__tablename__:
+        orm_execute_state.session.info["question_bucket_reload"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_question_changes(session: Session) -> None:
+    """事务提交后将变化应用到索引"""
+    changes = session.info.pop(_PENDING_KEY, None)
+    if session.info.pop("question_bucket_reload", False):
+        question_buckets.invalidate()
+        return
+    if not changes:
+        return
+    if not question_buckets.loaded:
+        # 可能有加载正在进行，其结果不一定包含本次提交的变化，使其作废
+        question_buckets.invalidate()
+        return
+    for question_id, meta in changes.items():
+        if meta is None:
+            question_buckets.remove(question_id)
+        else:
+            question_buckets.upsert(question_id, meta)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_question_changes(session: Session) -> None:
+    """事务回滚后丢弃记录"""
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop("question_bucket_reload", None)
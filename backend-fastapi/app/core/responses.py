@@ -0,0 +1,46 @@
+"""
+JSON 响应模块
+提供基于 orjson 的 JSON 响应类（异常处理器使用）与附件下载响应头
+
+说明：声明了 response_model 的路由返回 Pydantic 模型时，FastAPI 会直接用 Pydantic 的
+Rust 核心序列化为 JSON 字节，这已是模型数据最快的路径，因此不替换应用的默认响应类
+（替换后 FastAPI 会退回“转字典 + 响应类序列化”的慢路径）。
+读多写少、返回字典数据的接口（如 /exam/nav-index）使用预计算的响应快照（app.core.snapshot），
+由 orjson 一次序列化后重复返回。
+"""
+from typing import Any
+from urllib.parse import quote
+import orjson
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+
+def _default(obj: Any) -> Any:
+    """orjson 无法原生序列化的对象（Pydantic 模型）按别名转为 JSON 兼容数据"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json", by_alias=True)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """基于 orjson 的 JSON 响应（输出 UTF-8，不转义中文）"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def content_disposition(filename: str) -> str:
+    """
+    构建附件下载的 Content-Disposition 响应头
+
+    响应头只能包含 latin-1 字符，中文文件名按 RFC 6266 / RFC 5987 以 filename* 传递，
+    同时提供把非 ASCII 字符替换为下划线的 filename 供旧客户端使用。
+
+    Args:
+        filename: 文件名
+
+    Returns:
+        响应头取值
+    """
+    fallback = "".join(c if c.isascii() and c.isprintable() and c not in '"\\' else "_" for c in filename)
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename)}"
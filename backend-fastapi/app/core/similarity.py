@@ -0,0 +1,288 @@
+"""
+相似题目检索模块
+在真题与模拟题的文本上构建 TF-IDF 稀疏矩阵，按余弦相似度检索相似题目
+
+    - 分词：中文按相邻两字（bigram）切分，英文单词与术语按空白、标点切分，去除图片链接与公式标记
+    - 权重：亚线性 TF（1 + log tf）× 平滑 IDF，每道题只保留权重最高的 MAX_TERMS_PER_DOC 个词并做 L2 归一化，
+      文档频率超过 MAX_DOC_FREQ 的词（如“下列”“正确”）不参与检索
+    - 矩阵按词存为 CSC 结构（每个词一段 (文档下标, 权重) 列表），查询时只需取出查询词对应的几段，
+      用 np.bincount 累加得到全部文档的余弦分数，再用 argpartition 取前 k 个，开销与题库大小近似线性且很小
+
+矩阵由 SimilarityIndex 维护：首次使用时构建；题目表有写入提交后延迟 REBUILD_DELAY_SECONDS 秒在后台重建
+（合并一段时间内的多次写入），重建期间继续使用旧矩阵。NumPy 在首次构建矩阵时才导入。
+"""
+import asyncio
+import math
+import re
+import time
+import unicodedata
+from collections import Counter, OrderedDict
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+from app.core.cache import table_versions
+from app.utils.logger import setup_logger
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+# 获取日志记录器
+logger = setup_logger(__name__)
+
+# 每道题保留的词数上限
+MAX_TERMS_PER_DOC = 64
+
+# 文档频率上限（占题目总数的比例）
+MAX_DOC_FREQ = 0.2
+
+# 题目表写入后延迟重建的秒数
+REBUILD_DELAY_SECONDS = 30
+
+_CJK = r"\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+_TOKEN_PATTERN = re.compile(rf"[{_CJK}]+|[a-z][a-z0-9_+#]*")
+_NOISE_PATTERN = re.compile(r"!\[[^\]]*\]\([^)]*\)|https?://\S+|\\[a-z]+")
+
+# 文档键：(题库, 题目ID)
+DocKey = Tuple[str, int]
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    分词（中文 bigram + 英文单词）
+
+    Args:
+        text: 原始文本
+
+    Returns:
+        词列表
+    """
+    text = _NOISE_PATTERN.sub(" ", unicodedata.normalize("NFKC", text or "").lower())
+    tokens: List[str] = []
+    for match in _TOKEN_PATTERN.finditer(text):
+        token = match.group(0)
+        if token[0] < "\u0080":
+            if len(token) > 1:
+                tokens.append(token)
+        elif len(token) == 1:
+            tokens.append(token)
+        else:
+            tokens.extend(token[i:i + 2] for i in range(len(token) - 1))
+    return tokens
+
+
+class TfidfMatrix:
+    """只读的 TF-IDF 矩阵（按词的 CSC 结构）"""
+
+    def __init__(self, docs: Sequence[Tuple[DocKey, str]]):
+        import numpy as np
+
+        started = time.perf_counter()
+        self.keys: List[DocKey] = [key for key, _ in docs]
+        self.positions: Dict[DocKey, int] = {key: i for i, key in enumerate(self.keys)}
+        self.banks: Dict[str, np.ndarray] = {}
+
+        counts = [Counter(tokenize(text)) for _, text in docs]
+        doc_freq: Counter = Counter()
+        for counter in counts:
+            doc_freq.update(counter.keys())
+        total = len(docs)
+        max_df = max(2, int(total * MAX_DOC_FREQ))
+        self.vocabulary: Dict[str, int] = {}
+        idf: List[float] = []
+        for term, df in doc_freq.items():
+            if df <= max_df:
+                self.vocabulary[term] = len(idf)
+                idf.append(math.log((1 + total) / (1 + df)) + 1.0)
+        self.idf = np.asarray(idf, dtype=np.float32)
+
+        term_ids: List[np.ndarray] = []
+        doc_ids: List[np.ndarray] = []
+        weights: List[np.ndarray] = []
+        for doc, counter in enumerate(counts):
+            terms, vector = self._weigh(counter)
+            if len(terms):
+                term_ids.append(terms)
+                doc_ids.append(np.full(len(terms), doc, dtype=np.int32))
+                weights.append(vector)
+        if term_ids:
+            all_terms = np.concatenate(term_ids)
+            order = np.argsort(all_terms, kind="stable")
+            self.indices = np.concatenate(doc_ids)[order]
+            self.data = np.concatenate(weights)[order]
+            self.indptr = np.concatenate(([0], np.cumsum(np.bincount(all_terms, minlength=len(idf))))).astype(np.int64)
+        else:
+            self.indices = np.empty(0, dtype=np.int32)
+            self.data = np.empty(0, dtype=np.float32)
+            self.indptr = np.zeros(len(idf) + 1, dtype=np.int64)
+
+        bank_codes = np.asarray([key[0] for key in self.keys], dtype=object)
+        for bank in set(bank_codes.tolist()):
+            self.banks[bank] = bank_codes == bank
+        logger.info("TfidfMatrix built, docs: %d, terms: %d, nnz: %d, elapsed: %.3fs",
+                    total, len(idf), len(self.data), time.perf_counter() - started)
+
+    def _weigh(self, counter: Counter) -> "Tuple[np.ndarray, np.ndarray]":
+        """词频 → (词ID数组, 归一化权重数组)，只保留权重最高的 MAX_TERMS_PER_DOC 个词"""
+        import numpy as np
+
+        pairs = [(self.vocabulary[t], c) for t, c in counter.items() if t in self.vocabulary]
+        if not pairs:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        terms = np.fromiter((t for t, _ in pairs), dtype=np.int64, count=len(pairs))
+        tf = np.fromiter((c for _, c in pairs), dtype=np.float32, count=len(pairs))
+        vector = (1.0 + np.log(tf)) * self.idf[terms]
+        if len(terms) > MAX_TERMS_PER_DOC:
+            keep = np.argpartition(vector, -MAX_TERMS_PER_DOC)[-MAX_TERMS_PER_DOC:]
+            terms, vector = terms[keep], vector[keep]
+        vector /= np.linalg.norm(vector)
+        return terms, vector.astype(np.float32)
+
+    def search(
+        self,
+        text: str,
+        limit: int,
+        bank: Optional[str] = None,
+        exclude: Optional[DocKey] = None
+    ) -> List[Tuple[DocKey, float]]:
+        """
+        按余弦相似度检索
+
+        Args:
+            text: 查询文本
+            limit: 返回数量
+            bank: 只检索该题库（None 表示全部）
+            exclude: 排除的文档
+
+        Returns:
+            [(文档键, 相似度)]，按相似度降序（只包含相似度大于 0 的文档）
+        """
+        import numpy as np
+
+        terms, vector = self._weigh(Counter(tokenize(text)))
+        if not len(terms) or not len(self.keys):
+            return []
+        starts, ends = self.indptr[terms], self.indptr[terms + 1]
+        lengths = ends - starts
+        if not lengths.sum():
+            return []
+        # 拼接各查询词的倒排段，一次 bincount 累加点积
+        segments = np.concatenate([np.arange(s, e) for s, e in zip(starts, ends) if e > s])
+        scores = np.bincount(
+            self.indices[segments],
+            weights=self.data[segments] * np.repeat(vector, lengths),
+            minlength=len(self.keys)
+        )
+        if bank is not None:
+            mask = self.banks.get(bank)
+            if mask is None:
+                return []
+            scores = np.where(mask, scores, 0.0)
+        if exclude is not None and exclude in self.positions:
+            scores[self.positions[exclude]] = 0.0
+
+        limit = min(limit, len(scores))
+        top = np.argpartition(scores, -limit)[-limit:]
+        top = top[np.argsort(-scores[top])]
+        return [(self.keys[i], float(scores[i])) for i in top if scores[i] > 0]
+
+
+class SimilarityIndex:
+    """
+    相似题目检索索引（维护当前 TF-IDF 矩阵）
+
+    loader 返回全部 (文档键, 文本)（自行打开数据库会话）；tables 中任一表有写入提交后延迟重建。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        tables: Iterable[str],
+        loader: Callable[[], Awaitable[List[Tuple[DocKey, str]]]],
+        result_cache_size: int = 4096
+    ):
+        self.name = name
+        self.loader = loader
+        self.result_cache_size = result_cache_size
+        self._matrix: Optional[TfidfMatrix] = None
+        self._generation = 0
+        self._building: Optional[asyncio.Task] = None
+        self._scheduled: Optional[asyncio.TimerHandle] = None
+        self._results: OrderedDict[Hashable, list] = OrderedDict()
+        for table in tables:
+            table_versions.subscribe(table, self._on_table_write)
+
+    async def get_matrix(self) -> TfidfMatrix:
+        """获取当前矩阵（尚未构建时等待构建完成）"""
+        if self._matrix is None:
+            await asyncio.shield(self._building or self._start_build())
+        return self._matrix
+
+    async def search(
+        self,
+        text: str,
+        limit: int,
+        bank: Optional[str] = None,
+        exclude: Optional[DocKey] = None
+    ) -> List[Tuple[DocKey, float]]:
+        """
+        检索相似题目（同一矩阵上的相同查询直接返回缓存结果）
+
+        Args:
+            text: 查询文本
+            limit: 返回数量
+            bank: 只检索该题库
+            exclude: 排除的文档
+
+        Returns:
+            [(文档键, 相似度)]
+        """
+        matrix = await self.get_matrix()
+        cache_key = (self._generation, text, bank, exclude, limit)
+        cached = self._results.get(cache_key)
+        if cached is not None:
+            self._results.move_to_end(cache_key)
+            return cached
+        result = matrix.search(text, limit, bank, exclude)
+        self._results[cache_key] = result
+        while len(self._results) > self.result_cache_size:
+            self._results.popitem(last=False)
+        return result
+
+    def _start_build(self) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(self._build())
+        self._building = task
+
+        def done(finished: asyncio.Task) -> None:
+            if self._building is finished:
+                self._building = None
+            if not finished.cancelled() and finished.exception() is not None:
+                logger.error("SimilarityIndex(%s) build failed: %s", self.name, finished.exception())
+        task.add_done_callback(done)
+        return task
+
+    async def _build(self) -> None:
+        """加载文本并在工作线程中构建矩阵"""
+        docs = await self.loader()
+        matrix = await asyncio.to_thread(TfidfMatrix, docs)
+        self._matrix = matrix
+        self._generation += 1
+        self._results.clear()
+
+    def _on_table_write(self, table: str) -> None:
+        """题目表有写入提交：延迟重建（已调度时不重复调度）"""
+        if (self._matrix is None and self._building is None) or self._scheduled is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # 不在事件循环中（如命令行脚本），丢弃矩阵，下次使用时重新构建
+            self._matrix = None
+            return
+        self._scheduled = loop.call_later(REBUILD_DELAY_SECONDS, self._scheduled_rebuild)
+
+    def _scheduled_rebuild(self) -> None:
+        self._scheduled = None
+        if self._building is None:
+            self._start_build()
+        else:
+            # 正在构建时写入的数据可能未包含在内，构建完成后再重建一次
+            self._building.add_done_callback(lambda _: self._on_table_write(""))
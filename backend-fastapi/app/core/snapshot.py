@@ -0,0 +1,198 @@
+"""
+预计算响应快照模块
+将只依赖少数几张表、读多写少的接口响应预先序列化为 JSON 字节并压缩，请求时直接返回
+
+快照按键（如 (科目ID, 分类)）存放，记录构建时所依赖表的写版本：
+    - 读取时版本一致即直接返回内存中的字节，以内容摘要作为 ETag，支持 If-None-Match 返回 304
+    - 依赖表有写入提交后，快照因版本不一致自动视为过期：只有最近读取过的少数热点键在写入平息后
+      （去抖）于后台重建，其余键在下次读取时按需重建；读取时若快照仍未更新则等待构建，不会返回过期数据
+"""
+import asyncio
+import gzip
+import hashlib
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set
+import orjson
+from starlette.requests import Request
+from starlette.responses import Response
+from app.config.settings import settings
+from app.core.cache import table_versions
+from app.middleware.compression import brotli, negotiate_encoding
+from app.utils.logger import setup_logger
+
+
+# 获取日志记录器
+logger = setup_logger(__name__)
+
+# 构建期间持续有写入时的最大重建次数，超出后返回最近一次构建结果
+MAX_REBUILD_ATTEMPTS = 3
+
+# 写入后在后台预先重建的热点键数量（按最近读取顺序）
+EAGER_REBUILD_KEYS = 4
+
+# 写入后延迟重建的时间（秒），连续写入只触发一次重建
+REBUILD_DEBOUNCE_SECONDS = 0.5
+
+
+class Snapshot:
+    """一份预计算的响应快照"""
+
+    __slots__ = ("table_version", "etag", "body", "encoded")
+
+    def __init__(self, table_version: int, body: bytes, encoded: Dict[str, bytes]):
+        self.table_version = table_version
+        self.etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+        self.body = body
+        # 编码 -> 压缩后的字节（gzip，已安装 brotli 时另有 br）
+        self.encoded = encoded
+
+
+def encode_body(body: bytes) -> Dict[str, bytes]:
+    """按压缩配置预先压缩响应体（在工作线程中执行）"""
+    config = settings.compression
+    if not config.enabled or len(body) < config.minimum_size:
+        return {}
+    encoded = {"gzip": gzip.compress(body, compresslevel=config.gzip_level, mtime=0)}
+    if brotli is not None:
+        encoded["br"] = brotli.compress(body, quality=config.brotli_quality)
+    return encoded
+
+
+class SnapshotStore:
+    """
+    按表写版本维护的响应快照集合
+
+    loader 按键加载响应数据（自行打开数据库会话），结果以统一响应格式序列化。
+    键由请求参数决定，数量可达 max_keys，因此写入后不逐一重建，只预先重建最近读取的 eager_keys 个键。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        table: str,
+        loader: Callable[[Hashable], Awaitable[Any]],
+        max_keys: int = 256,
+        eager_keys: int = EAGER_REBUILD_KEYS
+    ):
+        self.name = name
+        self.table = table
+        self.loader = loader
+        self.max_keys = max_keys
+        self.eager_keys = eager_keys
+        self._snapshots: OrderedDict[Hashable, Snapshot] = OrderedDict()
+        self._building: Dict[Hashable, asyncio.Task] = {}
+        self._background: Set[asyncio.Task] = set()
+        self._rebuild_handle: Optional[asyncio.TimerHandle] = None
+        table_versions.subscribe(table, self._on_table_write)
+
+    async def get(self, key: Hashable) -> Snapshot:
+        """
+        获取最新快照（未构建或已过期时等待构建完成）
+
+        Args:
+            key: 快照键
+
+        Returns:
+            快照
+        """
+        snapshot = None
+        for _ in range(MAX_REBUILD_ATTEMPTS):
+            version = table_versions.get(self.table)
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None and snapshot.table_version == version:
+                self._snapshots.move_to_end(key)
+                return snapshot
+            task = self._building.get(key) or self._start(key)
+            snapshot = await asyncio.shield(task)
+        return snapshot
+
+    def clear(self) -> None:
+        """清空全部快照"""
+        self._snapshots.clear()
+
+    def _start(self, key: Hashable) -> asyncio.Task:
+        """启动一个构建任务（同一键同时只有一个）"""
+        task = asyncio.get_running_loop().create_task(self._build(key))
+        self._building[key] = task
+
+        def done(finished: asyncio.Task) -> None:
+            if self._building.get(key) is finished:
+                del self._building[key]
+        task.add_done_callback(done)
+        return task
+
+    async def _build(self, key: Hashable) -> Snapshot:
+        """加载数据、序列化并压缩"""
+        version = table_versions.get(self.table)
+        data = await self.loader(key)
+        body = orjson.dumps({"code": 200, "message": "成功", "data": data}, option=orjson.OPT_NON_STR_KEYS)
+        encoded = await asyncio.to_thread(encode_body, body)
+        snapshot = Snapshot(version, body, encoded)
+
+        current = self._snapshots.get(key)
+        if current is None or current.table_version <= version:
+            self._snapshots[key] = snapshot
+            self._snapshots.move_to_end(key)
+            while len(self._snapshots) > self.max_keys:
+                self._snapshots.popitem(last=False)
+        logger.info("SnapshotStore(%s) built, key: %s, version: %d, bytes: %d",
+                    self.name, key, version, len(body))
+        return snapshot
+
+    def _on_table_write(self, table: str) -> None:
+        """依赖表有写入提交：快照已因版本变化过期，去抖后在后台重建热点键"""
+        if self.eager_keys <= 0 or self._rebuild_handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # 不在事件循环中（如命令行脚本），读取时再按需构建
+            return
+        self._rebuild_handle = loop.call_later(REBUILD_DEBOUNCE_SECONDS, self._rebuild_hot)
+
+    def _rebuild_hot(self) -> None:
+        """重建最近读取的过期快照（OrderedDict 末尾为最近读取的键）"""
+        self._rebuild_handle = None
+        version = table_versions.get(self.table)
+        hot = [key for key in reversed(self._snapshots)][:self.eager_keys]
+        for key in hot:
+            if self._snapshots[key].table_version != version and key not in self._building:
+                task = self._start(key)
+                self._background.add(task)
+                task.add_done_callback(self._background_done)
+
+    def _background_done(self, task: asyncio.Task) -> None:
+        self._background.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("SnapshotStore(%s) background rebuild failed: %s", self.name, task.exception())
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """判断 If-None-Match 是否命中（弱比较）"""
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def snapshot_response(request: Request, snapshot: Snapshot) -> Response:
+    """
+    以快照构建响应：ETag 命中返回 304，客户端支持时直接返回预压缩的字节
+
+    Args:
+        request: 请求对象
+        snapshot: 快照
+
+    Returns:
+        响应对象
+    """
+    headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, snapshot.etag):
+        return Response(status_code=304, headers=headers)
+
+    body = snapshot.body
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", "")) if snapshot.encoded else None
+    if encoding in snapshot.encoded:
+        body = snapshot.encoded[encoding]
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
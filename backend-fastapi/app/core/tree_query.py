@@ -0,0 +1,160 @@
+"""
+树形结构子树查询模块
+在邻接表（parent_id）上用 WITH RECURSIVE 一次查询取出子孙或祖先及其层级距离，供章节与分类共用
+
+不另建闭包表：层级关系只存在 parent_id 一处，移动节点（修改 parent_id）后查询结果立即一致，
+更新时只需拒绝把节点移到自己的子孙下（is_descendant）。递归层数以 MAX_TREE_DEPTH 为上限，
+即使历史数据中存在环也不会无限递归。
+"""
+from typing import Iterable, List, Optional, Set, Tuple, Type
+from sqlalchemy import literal
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql.expression import CTE
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+
+# 递归层数上限
+MAX_TREE_DEPTH = 32
+
+
+class TreeQuery:
+    """
+    邻接表子树查询
+
+    Args:
+        model: 具有 id 与 parent_id 列的实体
+    """
+
+    def __init__(self, model: Type[SQLModel]):
+        self.model = model
+
+    def descendants_cte(self, *root_conditions, name: Optional[str] = None) -> CTE:
+        """
+        子孙节点 CTE（列：id, depth；根节点 depth=0）
+
+        Args:
+            root_conditions: 根节点筛选条件（可匹配多个根）
+            name: CTE 名称
+
+        Returns:
+            递归 CTE
+        """
+        model = self.model
+        cte = (
+            select(model.id.label("id"), literal(0).label("depth"))
+            .where(*root_conditions)
+            .cte(name or f"{model.__tablename__}_subtree", recursive=True)
+        )
+        child = aliased(model)
+        return cte.union_all(
+            select(child.id, cte.c.depth + 1)
+            .where(child.parent_id == cte.c.id, cte.c.depth < MAX_TREE_DEPTH)
+        )
+
+    def ancestors_cte(self, node_id: int, name: Optional[str] = None) -> CTE:
+        """
+        祖先节点 CTE（列：id, parent_id, depth；节点自身 depth=0，父节点 depth=1）
+
+        Args:
+            node_id: 节点ID
+            name: CTE 名称
+
+        Returns:
+            递归 CTE
+        """
+        model = self.model
+        cte = (
+            select(model.id.label("id"), model.parent_id.label("parent_id"), literal(0).label("depth"))
+            .where(model.id == node_id)
+            .cte(name or f"{model.__tablename__}_ancestors", recursive=True)
+        )
+        parent = aliased(model)
+        return cte.union_all(
+            select(parent.id, parent.parent_id, cte.c.depth + 1)
+            .where(parent.id == cte.c.parent_id, cte.c.depth < MAX_TREE_DEPTH)
+        )
+
+    async def descendants(
+        self,
+        session: AsyncSession,
+        node_id: int,
+        include_self: bool = False,
+        options: Iterable = ()
+    ) -> List[Tuple[SQLModel, int]]:
+        """
+        查询子孙节点（一次查询）
+
+        Args:
+            session: 数据库会话
+            node_id: 节点ID
+            include_self: 是否包含节点自身（depth=0）
+            options: 加载选项（如 selectinload）
+
+        Returns:
+            [(实体, 相对层级)]，按层级、order_num 升序
+        """
+        cte = self.descendants_cte(self.model.id == node_id)
+        return await self._fetch(session, cte, ascending=True, include_self=include_self, options=options)
+
+    async def ancestors(
+        self,
+        session: AsyncSession,
+        node_id: int,
+        include_self: bool = False,
+        options: Iterable = ()
+    ) -> List[Tuple[SQLModel, int]]:
+        """
+        查询祖先节点（一次查询）
+
+        Args:
+            session: 数据库会话
+            node_id: 节点ID
+            include_self: 是否包含节点自身（depth=0）
+            options: 加载选项
+
+        Returns:
+            [(实体, 与节点的层级距离)]，从根节点到父节点（或节点自身）排列
+        """
+        cte = self.ancestors_cte(node_id)
+        return await self._fetch(session, cte, ascending=False, include_self=include_self, options=options)
+
+    async def descendant_ids(self, session: AsyncSession, node_id: int) -> Set[int]:
+        """查询全部子孙节点ID（不含自身）"""
+        cte = self.descendants_cte(self.model.id == node_id)
+        result = await session.exec(select(cte.c.id).where(cte.c.depth > 0))
+        return set(result.all())
+
+    async def depth(self, session: AsyncSession, node_id: int) -> int:
+        """节点的绝对层级（顶级节点为 0，节点不存在时为 -1）"""
+        cte = self.ancestors_cte(node_id)
+        result = await session.exec(select(cte.c.depth).order_by(cte.c.depth.desc()).limit(1))
+        depth = result.first()
+        return -1 if depth is None else depth
+
+    async def is_descendant(self, session: AsyncSession, node_id: int, ancestor_id: int) -> bool:
+        """
+        判断 node_id 是否为 ancestor_id 的子孙（或就是 ancestor_id 本身）
+
+        用于移动节点前的校验：新的父节点不能是节点自身或其子孙
+        """
+        cte = self.descendants_cte(self.model.id == ancestor_id)
+        result = await session.exec(select(cte.c.id).where(cte.c.id == node_id).limit(1))
+        return result.first() is not None
+
+    async def _fetch(
+        self,
+        session: AsyncSession,
+        cte: CTE,
+        ascending: bool,
+        include_self: bool,
+        options: Iterable
+    ) -> List[Tuple[SQLModel, int]]:
+        model = self.model
+        stmt = select(model, cte.c.depth).join(cte, model.id == cte.c.id)
+        if not include_self:
+            stmt = stmt.where(cte.c.depth > 0)
+        order = cte.c.depth.asc() if ascending else cte.c.depth.desc()
+        stmt = stmt.order_by(order, model.order_num, model.id).options(*options)
+        result = await session.exec(stmt)
+        return [(entity, depth) for entity, depth in result.all()]
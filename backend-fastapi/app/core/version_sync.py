@@ -0,0 +1,168 @@
+"""
+跨进程缓存失效模块
+多个 worker 进程各自持有进程内缓存，某个进程提交写入后，其他进程借助数据库中的表写版本记录（table_change）
+得知变化并使本进程的缓存失效，不依赖外部服务：
+    - 记录：写事务提交前，在同一事务内将写入表在 table_change 中的版本号 +1（随业务写入一起提交或回滚）
+    - 轮询：后台任务每 sync_interval 秒在一条专用连接上读取 PRAGMA data_version
+      （只在其他连接提交后变化，开销可忽略），变化时再读取 table_change，
+      版本号前进的表在本进程内以 remote=True 递增 table_versions，依赖这些表的缓存随之失效
+    - 本进程的写入在提交后已直接递增 table_versions，提交时返回的版本号记为已见，轮询时不重复失效
+
+不经 ORM 会话的写入（浏览次数批量写回、命令行重建统计等）不记录变化，这些表上没有进程内缓存。
+"""
+import asyncio
+from typing import Dict, List, Optional
+from sqlalchemy import event, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.orm import Session
+from app.config.settings import settings
+from app.core.cache import table_versions, written_tables
+from app.database.connection import engine
+from app.models.entities import TableChange
+from app.utils.logger import setup_logger
+
+
+# 获取日志记录器
+logger = setup_logger(__name__)
+
+_VERSIONS_KEY = "table_change_versions"
+
+
+class TableVersionSync:
+    """
+    表写版本跨进程同步
+
+    Args:
+        interval: 轮询间隔（秒），不大于 0 时既不记录也不轮询（单进程部署）
+    """
+
+    def __init__(self, interval: float = 1):
+        self.interval = interval
+        self._seen: Dict[str, int] = {}
+        self._data_version: Optional[int] = None
+        self._conn: Optional[AsyncConnection] = None
+        self._task: Optional[asyncio.Task] = None
+        self._failing = False
+
+    @property
+    def enabled(self) -> bool:
+        """是否记录并轮询表写版本"""
+        return self.interval > 0
+
+    def mark_seen(self, versions: Dict[str, int]) -> None:
+        """记录已在本进程生效的版本号"""
+        for table, version in versions.items():
+            if version > self._seen.get(table, 0):
+                self._seen[table] = version
+
+    async def poll(self, notify: bool = True) -> List[str]:
+        """
+        检查其他进程提交的写入
+
+        Args:
+            notify: 是否递增本进程的表版本（首次轮询只记录当前版本）
+
+        Returns:
+            版本号前进的表
+        """
+        if self._conn is None:
+            self._conn = await engine.connect()
+        conn = self._conn
+        try:
+            data_version = (await conn.exec_driver_sql("PRAGMA data_version")).scalar()
+            if data_version == self._data_version:
+                return []
+            rows = (await conn.execute(select(TableChange.table_name, TableChange.version))).all()
+        finally:
+            # 结束只读事务，下次轮询读取最新数据
+            await conn.rollback()
+        self._data_version = data_version
+
+        changed = [table for table, version in rows if version > self._seen.get(table, 0)]
+        self.mark_seen({table: version for table, version in rows})
+        if changed and notify:
+            # 与本进程提交同时发生时，自己的写入可能在 mark_seen 之前被当作远端写入，只会多失效一次
+            table_versions.bump(changed, remote=True)
+            logger.info("TableVersionSync: remote writes detected, tables: %s", ", ".join(changed))
+        return changed
+
+    def start(self) -> None:
+        """启动轮询任务（应用启动时调用）"""
+        if self.enabled and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """停止轮询任务并释放专用连接（应用关闭时调用）"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._close()
+
+    async def _close(self) -> None:
+        if self._conn is not None:
+            try:
+                await self._conn.close()
+            finally:
+                self._conn = None
+                self._data_version = None
+
+    async def _run(self) -> None:
+        primed = False
+        while True:
+            try:
+                await self.poll(notify=primed)
+                primed = True
+                if self._failing:
+                    logger.info("TableVersionSync: polling recovered")
+                    self._failing = False
+            except Exception as e:
+                if not self._failing:
+                    logger.warning("TableVersionSync: poll failed, will retry: %s", e)
+                    self._failing = True
+                await self._close()
+            await asyncio.sleep(self.interval)
+
+
+# 全局同步实例（由应用生命周期启动与停止）
+table_version_sync = TableVersionSync(settings.cache.sync_interval)
+
+
+# ============================================
+# 会话事件：提交前在同一事务内递增写入表的版本号
+# ============================================
+@event.listens_for(Session, "before_commit")
+def _record_table_changes(session: Session) -> None:
+    """将本事务写入的表记入 table_change（先 flush，确保提交时才刷出的写入也被计入）"""
+    if not table_version_sync.enabled:
+        return
+    session.flush()
+    tables = written_tables(session)
+    if not tables:
+        return
+    table = TableChange.__table__
+    stmt = (
+        sqlite_insert(table)
+        .values([{"table_name": name, "version": 1} for name in sorted(tables)])
+        .on_conflict_do_update(index_elements=["table_name"], set_={"version": table.c.version + 1})
+        .returning(table.c.table_name, table.c.version)
+    )
+    session.info[_VERSIONS_KEY] = {name: version for name, version in session.execute(stmt).all()}
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_own_changes(session: Session) -> None:
+    """本进程的写入已由 table_versions 生效，记为已见"""
+    versions = session.info.pop(_VERSIONS_KEY, None)
+    if versions:
+        table_version_sync.mark_seen(versions)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_own_changes(session: Session) -> None:
+    """事务回滚后丢弃记录"""
+    session.info.pop(_VERSIONS_KEY, None)
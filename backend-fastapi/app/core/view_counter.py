@@ -0,0 +1,104 @@
+"""
+浏览次数合并写入模块
+浏览只在内存中累加，由后台任务定期以一条批量 UPDATE 写回数据库：
+    - 读请求不开启写事务（SQLite 同一时刻只允许一个写事务，逐次 +1 会让读接口互相排队）
+    - 同一行在一个周期内的多次浏览合并为一次 +N
+    - 写回失败时计数退回内存，下个周期重试；应用关闭时（lifespan）最后写回一次
+"""
+import asyncio
+from collections import Counter
+from typing import Optional
+from sqlalchemy import Table, bindparam, update
+from app.database.connection import engine
+from app.utils.logger import setup_logger
+
+
+# 获取日志记录器
+logger = setup_logger(__name__)
+
+
+class ViewCounter:
+    """
+    浏览次数累加器
+
+    Args:
+        table: 目标表（需有 id 列与计数列）
+        column: 计数列名
+        interval: 写回间隔（秒）
+    """
+
+    def __init__(self, table: Table, column: str = "view_count", interval: float = 10):
+        self.table = table
+        self.column = column
+        self.interval = interval
+        self._pending: Counter = Counter()
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, row_id: int, count: int = 1) -> None:
+        """记录浏览（只写内存）"""
+        self._pending[row_id] += count
+
+    def pending(self, row_id: int) -> int:
+        """尚未写回数据库的浏览次数（读接口返回时与数据库中的计数相加）"""
+        return self._pending.get(row_id, 0)
+
+    def discard(self, row_id: int) -> None:
+        """丢弃一行的未写回计数（该行被删除时调用）"""
+        self._pending.pop(row_id, None)
+
+    async def flush(self) -> int:
+        """
+        将累加的计数写回数据库
+
+        Returns:
+            写回的行数
+
+        Raises:
+            Exception: 写入失败（计数已退回内存）
+        """
+        if not self._pending:
+            return 0
+        batch, self._pending = self._pending, Counter()
+        column = self.table.c[self.column]
+        stmt = (
+            update(self.table)
+            .where(self.table.c.id == bindparam("row_id"))
+            .values({column: column + bindparam("delta")})
+        )
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(stmt, [{"row_id": row_id, "delta": n} for row_id, n in batch.items()])
+        except Exception:
+            self._pending.update(batch)
+            raise
+        logger.info("ViewCounter(%s) flushed, rows: %d, views: %d",
+                    self.table.name, len(batch), sum(batch.values()))
+        return len(batch)
+
+    def start(self) -> None:
+        """启动定期写回任务（应用启动时调用）"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """停止定期写回任务并写回剩余计数（应用关闭时调用）"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error("ViewCounter(%s) final flush failed, lost views: %d, error: %s",
+                         self.table.name, sum(self._pending.values()), e)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning("ViewCounter(%s) flush failed, will retry: %s", self.table.name, e)
@@ -5,10 +5,16 @@
 from typing import Annotated, AsyncGenerator
 from contextlib import asynccontextmanager
 from fastapi import Depends
-from sqlmodel import SQLModel, Session, select
+from sqlmodel import Session, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.ext.asyncio import create_async_engine
 from app.config.settings import settings
+from app.database.query_stats import register_query_stats
+from app.utils.logger import setup_logger
+
+
+# 获取日志记录器
+logger = setup_logger(__name__)
 
 
 # SQLite 数据库连接配置
@@ -23,15 +29,27 @@ engine = create_async_engine(
     echo=False,  # SQL日志由服务层统一记录，此处关闭
 )
 
+# 按请求统计 SQL 执行次数与耗时，并记录慢查询
+register_query_stats(engine.sync_engine)
+
 
 async def init_db():
     """
     初始化数据库
-    在应用启动时调用，创建所有表结构
+    在应用启动时调用：只读取 schema_version 的一行，结构版本为最新时直接返回，不做表结构反射；
+    版本过期（或新库）时，开启 auto_migrate 则执行建表、补齐索引与统计，否则只记录警告，
+    由部署流程显式执行 python -m app.database.migration
     """
-    # SQLModel.metadata 包含所有定义的表模型
+    from app.database.migration import run_migrations, schema_is_current
+
     async with engine.begin() as conn:
-        await conn.run_sync(SQLModel.metadata.create_all)
+        if await conn.run_sync(schema_is_current):
+            return
+        if not settings.database.auto_migrate:
+            logger.warning("init_db: schema version is outdated, run `python -m app.database.migration`")
+            return
+        logger.info("init_db: schema version is outdated, running migrations")
+        await conn.run_sync(run_migrations)
 
 
 def get_session():
@@ -0,0 +1,186 @@
+"""
+数据库迁移模块
+建表、为已存在的数据库补齐模型中声明的索引、补建统计表（幂等，可重复执行），
+完成后把当前模型的结构指纹写入 schema_version 表。
+
+应用启动时只读取 schema_version 的一行：指纹一致即跳过建表检查与迁移；
+不一致时按 DATABASE_AUTO_MIGRATE 决定在启动时迁移，或仅记录警告、等待显式执行迁移命令。
+
+用法（在 backend-fastapi 目录下）：
+    python -m app.database.migration          # 执行迁移
+    python -m app.database.migration --check  # 只检查结构版本是否为最新（过期时退出码为 1）
+"""
+import argparse
+import asyncio
+import hashlib
+import sys
+from typing import List, Optional
+from sqlalchemy import func, inspect, select, text
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.schema import CreateIndex, CreateTable
+from sqlmodel import SQLModel
+from app.models import entities  # noqa: F401  确保所有表模型已注册到 metadata
+from app.models.entities import SchemaVersion
+from app.utils.logger import setup_logger
+
+
+# 获取迁移日志记录器
+logger = setup_logger(__name__)
+
+# 迁移步骤修订号：表结构之外的迁移逻辑（如统计补建、数据修正）变化时递增，使已有库重新迁移
+MIGRATION_REVISION = 1
+
+_schema_fingerprint: Optional[str] = None
+
+
+def schema_fingerprint() -> str:
+    """
+    当前模型的结构指纹（全部表与索引的建表语句 + 迁移修订号的摘要）
+
+    模型增删表、列或索引后指纹随之变化，无需手工维护版本号
+    """
+    global _schema_fingerprint
+    if _schema_fingerprint is None:
+        dialect = sqlite.dialect()
+        digest = hashlib.sha256(f"r{MIGRATION_REVISION}\0".encode())
+        for table in SQLModel.metadata.sorted_tables:
+            digest.update(str(CreateTable(table).compile(dialect=dialect)).encode())
+            for index in sorted(table.indexes, key=lambda ix: ix.name):
+                digest.update(str(CreateIndex(index).compile(dialect=dialect)).encode())
+        _schema_fingerprint = digest.hexdigest()[:32]
+    return _schema_fingerprint
+
+
+def read_schema_version(conn: Connection) -> Optional[str]:
+    """
+    读取数据库记录的结构指纹
+
+    Args:
+        conn: 同步数据库连接
+
+    Returns:
+        结构指纹（库中尚无 schema_version 表或记录时为 None）
+    """
+    try:
+        return conn.execute(select(SchemaVersion.version).where(SchemaVersion.id == 1)).scalar()
+    except OperationalError:
+        return None
+
+
+def schema_is_current(conn: Connection) -> bool:
+    """数据库结构版本是否与当前模型一致（只查询一行）"""
+    return read_schema_version(conn) == schema_fingerprint()
+
+
+def stamp_schema_version(conn: Connection) -> None:
+    """写入当前模型的结构指纹"""
+    values = {"id": 1, "version": schema_fingerprint(), "update_time": func.current_timestamp()}
+    stmt = sqlite_insert(SchemaVersion.__table__).values(**values)
+    conn.execute(stmt.on_conflict_do_update(index_elements=["id"], set_=values))
+
+
+def ensure_indexes(conn: Connection) -> List[str]:
+    """
+    补齐模型声明但数据库中缺失的索引
+
+    create_all 只会为新建的表创建索引，已存在的表需要在这里补齐。
+    已存在的索引会被跳过；唯一索引若因历史重复数据创建失败，记录警告后继续。
+
+    Args:
+        conn: 同步数据库连接（通过 AsyncConnection.run_sync 调用）
+
+    Returns:
+        本次新建的索引名列表
+    """
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    created: List[str] = []
+
+    for table in SQLModel.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+
+        existing_indexes = {ix["name"] for ix in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda ix: ix.name):
+            if index.name in existing_indexes:
+                continue
+            try:
+                index.create(conn)
+            except IntegrityError as e:
+                logger.warning("ensure_indexes: skip unique index %s on %s, duplicate data exists: %s",
+                               index.name, table.name, e.orig)
+                continue
+            created.append(index.name)
+
+        # 旧库（由 MySQL 脚本转换导入）的 id 列未声明主键，按 id 查询会全表扫描
+        if "id" in table.c and not inspector.get_pk_constraint(table.name)["constrained_columns"]:
+            id_index = f"uk_{table.name}_id"
+            if id_index not in existing_indexes:
+                try:
+                    conn.execute(text(f'CREATE UNIQUE INDEX "{id_index}" ON "{table.name}" (id)'))
+                except IntegrityError as e:
+                    logger.warning("ensure_indexes: skip unique index %s, duplicate id exists: %s",
+                                   id_index, e.orig)
+                else:
+                    created.append(id_index)
+
+    if created:
+        # 更新查询规划器统计信息，使新索引立即被选用
+        conn.execute(text("ANALYZE"))
+        logger.info("ensure_indexes completed, created: %s", ", ".join(created))
+    return created
+
+
+def run_migrations(conn: Connection) -> List[str]:
+    """
+    执行全部迁移步骤并写入结构指纹（在同一事务内）
+
+    Args:
+        conn: 同步数据库连接（通过 AsyncConnection.run_sync 调用）
+
+    Returns:
+        本次新建的索引名列表
+    """
+    from app.services.stats_service import ensure_stats
+
+    SQLModel.metadata.create_all(conn)
+    created = ensure_indexes(conn)
+    ensure_stats(conn)
+    stamp_schema_version(conn)
+    logger.info("run_migrations completed, schema_version: %s", schema_fingerprint())
+    return created
+
+
+async def migrate() -> List[str]:
+    """执行全部迁移步骤"""
+    from app.database.connection import engine
+
+    async with engine.begin() as conn:
+        created = await conn.run_sync(run_migrations)
+    await engine.dispose()
+    return created
+
+
+async def check() -> bool:
+    """检查数据库结构版本是否为最新"""
+    from app.database.connection import engine
+
+    async with engine.connect() as conn:
+        current = await conn.run_sync(schema_is_current)
+    await engine.dispose()
+    return current
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="执行数据库迁移（建表、补齐索引、补建统计）")
+    parser.add_argument("--check", action="store_true", help="只检查结构版本是否为最新，不写入")
+    args = parser.parse_args()
+    if args.check:
+        is_current = asyncio.run(check())
+        print(f"[migration] 结构版本{'为最新' if is_current else '已过期，需要执行迁移'}（{schema_fingerprint()}）")
+        sys.exit(0 if is_current else 1)
+    created_indexes = asyncio.run(migrate())
+    print(f"[migration] 新建索引 {len(created_indexes)} 个: {', '.join(created_indexes) or '无'}")
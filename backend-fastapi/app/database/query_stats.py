@@ -0,0 +1,102 @@
+"""
+SQL 执行统计模块
+通过 SQLAlchemy 引擎事件统计每个请求执行的语句数与耗时，并记录慢查询
+"""
+import time
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config.settings import settings
+from app.utils.logger import setup_logger
+
+
+# 获取慢查询日志记录器
+logger = setup_logger(__name__)
+
+# 连接 info 中保存语句开始时间的键
+_START_KEY = "query_start_time"
+
+
+class QueryStats:
+    """单个请求的 SQL 执行统计"""
+
+    __slots__ = ("count", "duration")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0  # 秒
+
+    @property
+    def duration_ms(self) -> float:
+        """累计耗时（毫秒）"""
+        return self.duration * 1000
+
+
+# 当前请求的统计对象，由中间件在请求开始时设置
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def start_request_stats() -> QueryStats:
+    """
+    为当前请求开启 SQL 统计
+
+    Returns:
+        当前请求的统计对象（请求处理期间持续累加）
+    """
+    stats = QueryStats()
+    _current_stats.set(stats)
+    return stats
+
+
+def get_request_stats() -> Optional[QueryStats]:
+    """获取当前请求的统计对象，不在请求上下文中时返回 None"""
+    return _current_stats.get()
+
+
+def _explain(conn, statement: str, parameters) -> str:
+    """
+    获取 SELECT 语句的查询计划
+
+    直接使用 DBAPI 游标执行，不会再次触发引擎事件。
+    """
+    if not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        return "-"
+    try:
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+    except Exception as e:
+        return f"<explain failed: {e}>"
+    return " | ".join(str(row[-1]) for row in rows)
+
+
+def register_query_stats(engine: Engine) -> None:
+    """
+    在引擎上注册 SQL 统计事件
+
+    Args:
+        engine: 同步引擎（异步引擎传入 engine.sync_engine）
+    """
+    slow_threshold = settings.database.slow_query_ms / 1000
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info[_START_KEY].pop()
+
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.duration += elapsed
+
+        if slow_threshold > 0 and elapsed >= slow_threshold:
+            plan = "-" if executemany else _explain(conn, statement, parameters)
+            logger.warning("slow query %.1fms: %s | params: %r | plan: %s",
+                           elapsed * 1000, " ".join(statement.split()), parameters, plan)
@@ -4,7 +4,8 @@
 """
 from typing import Optional
 from fastapi import HTTPException, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.exceptions import RequestValidationError
+from app.core.responses import FastJSONResponse
 from app.schemas.common import error_response
 
 
@@ -75,7 +76,7 @@ class ConflictException(BusinessException):
 
 async def business_exception_handler(request: Request, exc: BusinessException):
     """业务异常处理器"""
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=exc.code,
         content=error_response(exc.code, exc.message)
     )
@@ -83,7 +84,7 @@ async def business_exception_handler(request: Request, exc: BusinessException):
 
 async def http_exception_handler(request: Request, exc: HTTPException):
     """HTTP异常处理器"""
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=exc.status_code,
         content=error_response(exc.status_code, exc.detail if exc.detail else "请求处理失败")
     )
@@ -97,7 +98,7 @@ async def validation_exception_handler(request: Request, exc):
         loc = " -> ".join(str(l) for l in error["loc"])
         error_messages.append(f"{loc}: {error['msg']}")
 
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content=error_response(
             status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -110,7 +111,7 @@ async def general_exception_handler(request: Request, exc: Exception):
     """通用异常处理器（兜底）"""
     from app.config.settings import settings
     
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content=error_response(
             status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -134,5 +135,5 @@ def register_exception_handlers(app):
     """
     app.add_exception_handler(BusinessException, business_exception_handler)
     app.add_exception_handler(HTTPException, http_exception_handler)
-    app.add_exception_handler(ValidationException, validation_exception_handler)
+    app.add_exception_handler(RequestValidationError, validation_exception_handler)
     app.add_exception_handler(Exception, general_exception_handler)
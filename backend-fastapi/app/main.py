@@ -12,6 +12,9 @@ from app.config.settings import settings
 from app.database.connection import init_db, engine
 from app.exception import register_exception_handlers
 from app.api.v1.router import router as api_v1_router
+from app.services.render_service import shutdown_render_pool
+from app.services.knowledge_service import knowledge_view_counter
+from app.core.version_sync import table_version_sync
 from app.utils.logger import setup_logger
 
 
@@ -33,14 +36,19 @@ async def lifespan(app: FastAPI):
     """
     应用生命周期管理
 
-    - startup: 初始化数据库，创建表结构
-    - shutdown: 清理资源
+    - startup: 检查数据库结构版本（过期时按配置迁移），启动浏览次数定期写回与跨进程缓存失效轮询
+    - shutdown: 写回剩余浏览次数，停止轮询，清理资源
     """
     # 启动时
     ensure_directories()
-    await init_db()  # 创建所有表结构
+    await init_db()  # 结构版本为最新时只查询一行
+    knowledge_view_counter.start()
+    table_version_sync.start()
     yield
     # 关闭时
+    await knowledge_view_counter.stop()
+    await table_version_sync.stop()
+    shutdown_render_pool()
     await engine.dispose()
 
 
@@ -59,10 +67,19 @@ app = FastAPI(
 # 注册异常处理器
 register_exception_handlers(app)
 
+# 注册响应压缩中间件（最内层，压缩后的响应再由外层中间件追加响应头）
+from app.middleware.compression import CompressionMiddleware, compression_stats
+if settings.compression.enabled:
+    app.add_middleware(CompressionMiddleware)
+
 # 注册全局响应中间件（在CORSMiddleware之后，确保CORS头始终注入）
 from app.middleware.cors import GlobalCorsMiddleware
 app.add_middleware(GlobalCorsMiddleware)
 
+# 注册请求耗时中间件（最外层，统计包含其他中间件在内的完整耗时）
+from app.middleware.timing import ServerTimingMiddleware
+app.add_middleware(ServerTimingMiddleware)
+
 # 配置 CORS
 print(f"[CORS] 已配置 origins: {settings.cors.origins}")
 
@@ -98,6 +115,12 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/health/compression")
+async def compression_status():
+    """响应压缩统计（按接口统计节省的字节数与压缩耗时）"""
+    return {path: stats.to_dict() for path, stats in compression_stats.items()}
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
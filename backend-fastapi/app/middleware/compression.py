@@ -0,0 +1,297 @@
+"""
+响应压缩中间件
+按 Accept-Encoding 协商对较大的文本/JSON 响应进行 gzip（已安装 brotli 时优先 br）压缩
+
+索引、导航、分类树等接口的响应内容在数据未变化时完全相同，
+这类接口的压缩结果按 (编码, 内容摘要) 缓存，命中时只需计算一次摘要而无需重新压缩。
+较大的响应体在工作线程中压缩，避免压缩期间阻塞事件循环上的其他请求；较小的响应体直接压缩，省去线程切换开销。
+"""
+import gzip
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import anyio
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config.settings import settings
+
+try:
+    import brotli
+except ImportError:  # brotli 为可选依赖
+    brotli = None
+
+
+# 可压缩的内容类型前缀
+COMPRESSIBLE_TYPES = (
+    b"application/json",
+    b"text/",
+    b"application/javascript",
+    b"application/xml",
+    b"image/svg+xml",
+)
+
+# 响应内容在数据未变化时保持不变的接口（路由模板，不含 API 前缀），压缩结果可缓存
+CACHEABLE_ROUTES = frozenset({
+    "/exam/index",
+    "/exam/year-stats",
+    "/exam/category-stats",
+    "/exam-category/subject/{subject_id}/tree",
+    "/exam-category/subject/{subject_id}/tree/enabled",
+    "/exam-category/subject/{subject_id}/tree/enabled/{question_type}",
+    "/chapter/subject/{subject_id}",
+    "/chapter/subject/{subject_id}/all",
+    "/upload/images",
+})
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    根据 Accept-Encoding 选择压缩编码
+
+    Args:
+        accept_encoding: 请求头原始值，如 "gzip, deflate, br;q=0.9"
+
+    Returns:
+        "br"、"gzip"，客户端不接受压缩时返回 None
+    """
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[token] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    if brotli is not None and accepted.get("br", wildcard) > 0:
+        return "br"
+    if accepted.get("gzip", wildcard) > 0:
+        return "gzip"
+    return None
+
+
+def route_template(scope: Scope) -> str:
+    """
+    获取请求匹配的完整路由模板（如 /api/exam-category/subject/{subject_id}/tree）
+
+    路由匹配后 scope 中带有路由对象，但其 path 不含 include_router 的前缀，
+    这里用实际路径减去“填入参数后的路由路径”得到前缀。未匹配路由时返回实际路径。
+    """
+    path = scope["path"]
+    route = scope.get("route")
+    path_format = getattr(route, "path_format", None)
+    if path_format is None:
+        return path
+    try:
+        filled = path_format.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return path
+    if not path.endswith(filled):
+        return path
+    return path[:len(path) - len(filled)] + path_format
+
+
+class EndpointCompressionStats:
+    """单个接口的压缩统计（只统计实际压缩的响应）"""
+
+    __slots__ = ("responses", "cache_hits", "original_bytes", "compressed_bytes", "cpu_seconds")
+
+    def __init__(self):
+        self.responses = 0
+        self.cache_hits = 0
+        self.original_bytes = 0
+        self.compressed_bytes = 0
+        self.cpu_seconds = 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        """转换为可序列化的字典"""
+        return {
+            "responses": self.responses,
+            "cache_hits": self.cache_hits,
+            "original_bytes": self.original_bytes,
+            "compressed_bytes": self.compressed_bytes,
+            "bytes_saved": self.original_bytes - self.compressed_bytes,
+            "cpu_ms": round(self.cpu_seconds * 1000, 3),
+        }
+
+
+# 各接口的压缩统计（键为路由模板）
+compression_stats: Dict[str, EndpointCompressionStats] = {}
+
+
+class CompressedBodyCache:
+    """按 (编码, 内容摘要) 缓存压缩结果的 LRU 缓存，以总字节数为上限"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._size = 0
+        self._entries: OrderedDict[Tuple[str, bytes], bytes] = OrderedDict()
+
+    def get(self, key: Tuple[str, bytes]) -> Optional[bytes]:
+        """读取缓存"""
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Tuple[str, bytes], value: bytes) -> None:
+        """写入缓存，超出容量时淘汰最久未使用的条目"""
+        if len(value) > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= len(old)
+        self._entries[key] = value
+        self._size += len(value)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+
+class CompressionMiddleware:
+    """
+    响应压缩中间件（纯 ASGI）
+
+    只压缩满足以下条件的响应：
+    - 状态码 200，未设置 Content-Encoding，内容类型可压缩
+    - 响应体一次性发送（流式响应直接透传）且不小于最小压缩长度
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        config = settings.compression
+        self.minimum_size = config.minimum_size
+        self.gzip_level = config.gzip_level
+        self.brotli_quality = config.brotli_quality
+        self.offload_min_size = config.offload_min_size
+        self.cacheable_routes = frozenset(settings.server.api_prefix + path for path in CACHEABLE_ROUTES)
+        self.cache = CompressedBodyCache(config.cache_max_bytes)
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        """按指定编码压缩"""
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    def _compress_timed(self, body: bytes, encoding: str) -> Tuple[bytes, float]:
+        """压缩并返回所在线程消耗的 CPU 时间（秒）"""
+        started = time.thread_time()
+        compressed = self._compress(body, encoding)
+        return compressed, time.thread_time() - started
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        中间件入口
+
+        Args:
+            scope: ASGI 连接信息
+            receive: 接收消息的可调用对象
+            send: 发送消息的可调用对象
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                encoding = negotiate_encoding(value.decode("latin-1"))
+                break
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, passthrough
+
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                # 暂存响应头，等拿到响应体后再决定是否压缩
+                start_message = message
+                if not self._is_compressible(message):
+                    passthrough = True
+                    await send(message)
+                return
+
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            compressed = await self._compress_body(scope, body, encoding)
+            headers = []
+            vary = b"Accept-Encoding"
+            for name, value in start_message.get("headers", ()):
+                lowered = name.lower()
+                if lowered == b"vary":
+                    vary = value + b", Accept-Encoding"
+                elif lowered != b"content-length":
+                    headers.append((name, value))
+            headers.append((b"content-encoding", encoding.encode("latin-1")))
+            headers.append((b"content-length", str(len(compressed)).encode("latin-1")))
+            headers.append((b"vary", vary))
+            start_message["headers"] = headers
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+    @staticmethod
+    def _is_compressible(message: Message) -> bool:
+        """根据状态码与响应头判断是否可能压缩"""
+        if message["status"] != 200:
+            return False
+        content_type = b""
+        for name, value in message.get("headers", ()):
+            name = name.lower()
+            if name == b"content-encoding":
+                return False
+            if name == b"content-type":
+                content_type = value.lower()
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    async def _compress_body(self, scope: Scope, body: bytes, encoding: str) -> bytes:
+        """压缩响应体（可缓存接口优先读取缓存，较大的响应体在工作线程中压缩）并记录统计"""
+        route_path = route_template(scope)
+        stats = compression_stats.get(route_path)
+        if stats is None:
+            stats = compression_stats[route_path] = EndpointCompressionStats()
+
+        started = time.thread_time()
+        cache_key = None
+        compressed = None
+        if route_path in self.cacheable_routes:
+            cache_key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+            compressed = self.cache.get(cache_key)
+            if compressed is not None:
+                stats.cache_hits += 1
+        cpu_seconds = time.thread_time() - started
+        if compressed is None:
+            if len(body) >= self.offload_min_size:
+                compressed, compress_seconds = await anyio.to_thread.run_sync(self._compress_timed, body, encoding)
+            else:
+                compressed, compress_seconds = self._compress_timed(body, encoding)
+            cpu_seconds += compress_seconds
+            if cache_key is not None:
+                self.cache.set(cache_key, compressed)
+
+        stats.cpu_seconds += cpu_seconds
+        stats.responses += 1
+        stats.original_bytes += len(body)
+        stats.compressed_bytes += len(compressed)
+        return compressed
@@ -1,14 +1,31 @@
 """
 全局响应中间件
 统一处理所有HTTP响应的CORS头，确保异常响应也携带CORS头
+
+实现为纯 ASGI 中间件：不创建额外任务、不缓冲流式响应，
+CORS 头在启动时按来源预先生成，请求时只做一次字典查找并在 http.response.start 中追加。
 """
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from typing import Dict, Iterable, List, Optional, Tuple
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from app.config.settings import settings
 
 
-class GlobalCorsMiddleware(BaseHTTPMiddleware):
+# 允许的请求方法
+ALLOW_METHODS = "GET, POST, PUT, DELETE, OPTIONS, PATCH"
+
+# 允许的请求头
+ALLOW_HEADERS = "Content-Type, Authorization, Accept, X-Requested-With"
+
+# 暴露的响应头（客户端可读取）
+EXPOSE_HEADERS = "Authorization, Content-Disposition"
+
+# 预检请求缓存时间（1小时）
+PREFLIGHT_MAX_AGE = "3600"
+
+Headers = List[Tuple[bytes, bytes]]
+
+
+class GlobalCorsMiddleware:
     """
     全局CORS响应中间件
 
@@ -16,68 +33,73 @@ class GlobalCorsMiddleware(BaseHTTPMiddleware):
     - 为所有响应注入CORS头
     - 处理OPTIONS预检请求
     - 确保异常响应也携带CORS头（FastAPI异常处理器可能生成不包含CORS头的响应）
+
+    来源规则：
+    - 允许列表中的来源：回显该来源，并允许携带凭证
+    - 无 Origin 头（非浏览器请求）或未授权的来源：使用通配符，不允许凭证
     """
 
-    async def dispatch(self, request: Request, call_next) -> Response:
+    def __init__(self, app: ASGIApp, origins: Optional[Iterable[str]] = None):
+        self.app = app
+
+        common: Headers = [
+            (b"access-control-allow-methods", ALLOW_METHODS.encode("latin-1")),
+            (b"access-control-allow-headers", ALLOW_HEADERS.encode("latin-1")),
+            (b"access-control-expose-headers", EXPOSE_HEADERS.encode("latin-1")),
+        ]
+
+        # 预先生成每个允许来源对应的完整响应头
+        self._origin_headers: Dict[bytes, Headers] = {}
+        for origin in (settings.cors.origins if origins is None else origins):
+            origin_bytes = origin.encode("latin-1")
+            self._origin_headers[origin_bytes] = [
+                (b"access-control-allow-origin", origin_bytes),
+                (b"access-control-allow-credentials", b"true"),
+                *common,
+            ]
+        self._wildcard_headers: Headers = [(b"access-control-allow-origin", b"*"), *common]
+        self._max_age_header: Headers = [(b"access-control-max-age", PREFLIGHT_MAX_AGE.encode("latin-1"))]
+
+    def _headers_for(self, scope: Scope) -> Headers:
+        """根据请求的 Origin 头选择预生成的CORS头"""
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                return self._origin_headers.get(value, self._wildcard_headers)
+        return self._wildcard_headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
-        中间件分发处理
+        中间件入口
 
         Args:
-            request: HTTP请求
-            call_next: 下一个处理函数
-
-        Returns:
-            HTTP响应（包含CORS头）
+            scope: ASGI 连接信息
+            receive: 接收消息的可调用对象
+            send: 发送消息的可调用对象
         """
-        # 处理OPTIONS预检请求
-        if request.method == "OPTIONS":
-            response = Response(status_code=204)
-            self._add_cors_headers(response, request)
-            return response
-
-        # 继续处理请求
-        response = await call_next(request)
-
-        # 为所有响应添加CORS头（无论是否发生异常）
-        self._add_cors_headers(response, request)
-
-        return response
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    def _add_cors_headers(self, response: Response, request: Request) -> None:
-        """
-        添加CORS头到响应
+        cors_headers = self._headers_for(scope)
 
-        Args:
-            response: HTTP响应对象
-            request: HTTP请求对象（用于获取原始请求头）
-        """
-        # 从请求头获取原始来源，用于动态响应
-        origin = request.headers.get("Origin", "")
-
-        # 如果是允许的来源之一，使用该来源；否则拒绝请求
-        allowed_origins = settings.cors.origins
-        if origin in allowed_origins:
-            response.headers["Access-Control-Allow-Origin"] = origin
-        elif not origin:
-            # 如果没有Origin头（非浏览器请求），使用通配符
-            response.headers["Access-Control-Allow-Origin"] = "*"
-        else:
-            # 未授权的来源，使用通配符但不允许凭证
-            response.headers["Access-Control-Allow-Origin"] = "*"
-
-        # 允许携带凭证（仅当使用具体来源时）
-        if response.headers.get("Access-Control-Allow-Origin") != "*":
-            response.headers["Access-Control-Allow-Credentials"] = "true"
-
-        # 允许的请求方法
-        response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS, PATCH"
-
-        # 允许的请求头
-        response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization, Accept, X-Requested-With"
-
-        # 暴露的响应头（客户端可读取）
-        response.headers["Access-Control-Expose-Headers"] = "Authorization, Content-Disposition"
-
-        # 预检请求缓存时间（1小时）
-        if request.method == "OPTIONS":
-            response.headers["Access-Control-Max-Age"] = "3600"
+        # 处理OPTIONS预检请求
+        if scope["method"] == "OPTIONS":
+            await send({
+                "type": "http.response.start",
+                "status": 204,
+                "headers": cors_headers + self._max_age_header,
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # 为所有响应添加CORS头（无论是否发生异常），覆盖下游已设置的同名头
+                headers = [
+                    (name, value) for name, value in message.get("headers", ())
+                    if not name.lower().startswith(b"access-control-")
+                ]
+                message["headers"] = headers + cors_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
@@ -0,0 +1,79 @@
+"""
+请求耗时中间件
+为每个请求统计总耗时与 SQL 执行情况，写入 Server-Timing 响应头与访问日志
+
+实现为纯 ASGI 中间件：不创建额外任务、不经内存流转发响应体，流式与压缩响应按原样逐块发送。
+Server-Timing 在 http.response.start 时写入（此时已完成的耗时），访问日志在最后一个响应体块发送后记录。
+"""
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.database.query_stats import start_request_stats
+from app.utils.logger import setup_logger
+
+
+# 获取访问日志记录器
+logger = setup_logger(__name__)
+
+
+class ServerTimingMiddleware:
+    """
+    请求耗时中间件
+
+    职责：
+    - 在请求上下文中开启 SQL 统计（语句数、累计耗时）
+    - 添加 Server-Timing 响应头，浏览器开发者工具可直接查看
+    - 记录访问日志
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        中间件入口
+
+        Args:
+            scope: ASGI 连接信息
+            receive: 接收消息的可调用对象
+            send: 发送消息的可调用对象
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = start_request_stats()
+        start = time.perf_counter()
+        status_code = 500
+        logged = False
+
+        def log_access() -> None:
+            nonlocal logged
+            logged = True
+            logger.info("%s %s %d %.1fms db=%.1fms queries=%d",
+                        scope["method"], scope["path"], status_code,
+                        (time.perf_counter() - start) * 1000, stats.duration_ms, stats.count)
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                server_timing = (
+                    f'db;dur={stats.duration_ms:.1f};desc="{stats.count} queries", app;dur={elapsed_ms:.1f}'
+                )
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"server-timing", server_timing.encode("latin-1")),
+                ]
+                await send(message)
+                return
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                log_access()
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            if not logged:
+                # 未发送完整响应（异常或客户端断开）时仍记录一条访问日志
+                log_access()
@@ -4,7 +4,7 @@
 """
 from datetime import datetime
 from typing import Optional, List
-from sqlmodel import Field, Relationship, Column, JSON
+from sqlmodel import SQLModel, Field, Relationship, Column, JSON, Index
 from app.models.base import BaseModel
 from app.models.enums import UserRoleEnum, QuestionTypeEnum, DifficultyEnum
 
@@ -15,6 +15,9 @@ from app.models.enums import UserRoleEnum, QuestionTypeEnum, DifficultyEnum
 class User(BaseModel, table=True):
     """用户模型"""
     __tablename__ = "user"
+    __table_args__ = (
+        Index("idx_role", "role"),
+    )
 
     username: str = Field(unique=True, index=True, description="用户名")
     password: str = Field(description="BCrypt加密密码")
@@ -35,6 +38,10 @@ class User(BaseModel, table=True):
 class Subject(BaseModel, table=True):
     """科目模型"""
     __tablename__ = "subject"
+    __table_args__ = (
+        Index("idx_subject_order", "order_num"),
+        Index("idx_subject_enabled", "enabled"),
+    )
 
     name: str = Field(unique=True, description="科目名称")
     code: str = Field(unique=True, description="科目编码")
@@ -55,6 +62,12 @@ class Subject(BaseModel, table=True):
 class Chapter(BaseModel, table=True):
     """章节模型"""
     __tablename__ = "chapter"
+    __table_args__ = (
+        Index("idx_chapter_subject", "subject_id"),
+        Index("idx_chapter_parent", "parent_id"),
+        Index("idx_chapter_order", "order_num"),
+        Index("idx_chapter_enabled", "enabled"),
+    )
 
     subject_id: int = Field(foreign_key="subject.id", description="所属科目ID")
     parent_id: Optional[int] = Field(default=None, foreign_key="chapter.id", description="父章节ID")
@@ -78,6 +91,14 @@ class Chapter(BaseModel, table=True):
 class ExamCategory(BaseModel, table=True):
     """分类标签模型"""
     __tablename__ = "exam_category"
+    __table_args__ = (
+        Index("uk_exam_category_subject_name", "subject_id", "name", unique=True),
+        Index("uk_exam_category_subject_code", "subject_id", "code", unique=True),
+        Index("idx_exam_category_subject", "subject_id"),
+        Index("idx_exam_category_parent", "parent_id"),
+        Index("idx_exam_category_order", "order_num"),
+        Index("idx_exam_category_enabled", "enabled"),
+    )
 
     subject_id: int = Field(foreign_key="subject.id", description="所属科目ID")
     parent_id: Optional[int] = Field(default=None, foreign_key="exam_category.id", description="父分类ID")
@@ -102,6 +123,17 @@ class ExamCategory(BaseModel, table=True):
 class ExamQuestion(BaseModel, table=True):
     """真题模型"""
     __tablename__ = "exam_question"
+    __table_args__ = (
+        Index("idx_year", "year"),
+        Index("idx_exam_subject", "subject_id"),
+        Index("idx_question_type", "question_type"),
+        # 同一年份题号唯一（NULL题号不受限制），同时覆盖 year DESC, question_number ASC 排序
+        Index("idx_year_question_unique", "year", "question_number", unique=True),
+        # 按科目浏览：subject_id 筛选 + 年份/题号排序
+        Index("idx_exam_subject_year_number", "subject_id", "year", "question_number"),
+        # 默认列表排序字段
+        Index("idx_exam_update_time", "update_time"),
+    )
 
     year: int = Field(description="年份")
     question_number: Optional[int] = Field(default=None, description="题号")
@@ -126,6 +158,16 @@ class ExamQuestion(BaseModel, table=True):
 class MockQuestion(BaseModel, table=True):
     """模拟题模型"""
     __tablename__ = "mock_question"
+    __table_args__ = (
+        Index("idx_mock_source", "source"),
+        Index("idx_mock_subject_id", "subject_id"),
+        Index("idx_mock_question_type", "question_type"),
+        Index("idx_mock_difficulty", "difficulty"),
+        # 查重（source + title + question_number）与按来源/标题浏览
+        Index("idx_mock_source_title_number", "source", "title", "question_number"),
+        # 默认列表排序字段
+        Index("idx_mock_update_time", "update_time"),
+    )
 
     source: str = Field(description="来源机构")
     question_number: Optional[int] = Field(default=None, description="题号")
@@ -150,6 +192,9 @@ class MockQuestion(BaseModel, table=True):
 class ResourceFile(BaseModel, table=True):
     """资源文件模型"""
     __tablename__ = "resource_file"
+    __table_args__ = (
+        Index("idx_uploader", "uploader_id"),
+    )
 
     filename: str = Field(description="存储文件名")
     original_filename: str = Field(description="原始文件名")
@@ -176,12 +221,88 @@ class ExamRandomStat(BaseModel, table=True):
     last_attempt_time: datetime = Field(default_factory=datetime.utcnow, description="最近完成时间")
 
 
+# ====================================
+# 真题统计表 (exam_stat)
+# ====================================
+class ExamStat(SQLModel, table=True):
+    """
+    真题统计模型（由真题写操作增量维护，可通过 stats_service 全量重建）
+
+    每道题计入 category="" 的汇总行，以及其每个分类各一行；无科目的题目 subject_id 记为 0。
+    """
+    __tablename__ = "exam_stat"
+    __table_args__ = (
+        Index("idx_exam_stat_category_year", "category", "year"),
+    )
+
+    subject_id: int = Field(default=0, primary_key=True, description="科目ID（0 表示无科目）")
+    year: int = Field(primary_key=True, description="年份")
+    category: str = Field(default="", primary_key=True, description="分类（空字符串表示全部）")
+    question_type: str = Field(primary_key=True, description="题型")
+    count: int = Field(default=0, description="题目数量")
+
+
+# ====================================
+# 模拟题统计表 (mock_stat)
+# ====================================
+class MockStat(SQLModel, table=True):
+    """
+    模拟题统计模型（由模拟题写操作增量维护，可通过 stats_service 全量重建）
+
+    每道题计入 category="" 的汇总行，以及其每个分类各一行；无科目的题目 subject_id 记为 0。
+    """
+    __tablename__ = "mock_stat"
+    __table_args__ = (
+        Index("idx_mock_stat_category_source", "category", "source"),
+    )
+
+    subject_id: int = Field(default=0, primary_key=True, description="科目ID（0 表示无科目）")
+    source: str = Field(primary_key=True, description="来源机构")
+    category: str = Field(default="", primary_key=True, description="分类（空字符串表示全部）")
+    count: int = Field(default=0, description="题目数量")
+
+
+# ====================================
+# 模拟题来源目录表 (mock_catalog)
+# ====================================
+class MockCatalog(SQLModel, table=True):
+    """
+    模拟题来源/试卷目录模型（由模拟题写操作增量维护，可通过 stats_service 全量重建）
+
+    每个 (来源, 标题) 组合一行，无标题的题目计入 title="" 的行。
+    """
+    __tablename__ = "mock_catalog"
+
+    source: str = Field(primary_key=True, description="来源机构")
+    title: str = Field(default="", primary_key=True, description="试卷标题（空字符串表示无标题）")
+    count: int = Field(default=0, description="题目数量")
+
+
+# ====================================
+# 渲染缓存表 (render_cache)
+# ====================================
+class RenderCache(SQLModel, table=True):
+    """
+    Markdown 预渲染缓存模型
+
+    按 (渲染器版本, 原文) 的摘要存放净化后的 HTML：原文不变即可复用，修改后摘要变化自然失效。
+    """
+    __tablename__ = "render_cache"
+
+    content_hash: str = Field(primary_key=True, max_length=32, description="渲染器版本与原文的摘要")
+    html: str = Field(description="净化后的 HTML")
+    create_time: datetime = Field(default_factory=datetime.utcnow, description="创建时间")
+
+
 # ====================================
 # 知识点表 (knowledge_point)
 # ====================================
 class KnowledgePoint(BaseModel, table=True):
     """知识点模型"""
     __tablename__ = "knowledge_point"
+    __table_args__ = (
+        Index("idx_knowledge_point_chapter", "chapter_id"),
+    )
 
     title: str = Field(description="标题")
     category: str = Field(description="分类")
@@ -195,3 +316,35 @@ class KnowledgePoint(BaseModel, table=True):
     # 关系
     chapter: Optional[Chapter] = Relationship(back_populates="knowledge_points")
     author: Optional[User] = Relationship()
+
+
+# ====================================
+# 数据库结构版本表 (schema_version)
+# ====================================
+class SchemaVersion(SQLModel, table=True):
+    """
+    数据库结构版本模型（单行）
+
+    由迁移命令在建表、补齐索引与统计后写入；启动时只读取这一行，
+    与当前模型的结构指纹一致即跳过建表检查与迁移。
+    """
+    __tablename__ = "schema_version"
+
+    id: int = Field(default=1, primary_key=True, description="固定为 1")
+    version: str = Field(max_length=64, description="结构指纹")
+    update_time: datetime = Field(default_factory=datetime.utcnow, description="迁移时间")
+
+
+# ====================================
+# 表写版本变更记录表 (table_change)
+# ====================================
+class TableChange(SQLModel, table=True):
+    """
+    表写版本变更记录模型（跨进程缓存失效）
+
+    每张表一行，写事务提交前在同一事务内递增，各 worker 进程轮询后使本进程的缓存失效。
+    """
+    __tablename__ = "table_change"
+
+    table_name: str = Field(primary_key=True, max_length=64, description="表名")
+    version: int = Field(default=0, description="写版本号")
@@ -14,12 +14,14 @@ from app.schemas.chapter import (
     ChapterCreateRequest,
     ChapterUpdateRequest,
     ChapterResponse,
+    ChapterNodeResponse,
     ChapterTreeResponse
 )
 from app.schemas.category import (
     ExamCategoryCreateRequest,
     ExamCategoryUpdateRequest,
     ExamCategoryResponse,
+    ExamCategoryNodeResponse,
     ExamCategoryTreeResponse,
     ExamCategoryStatResponse,
     ExamCategoryUsageResponse,
@@ -51,6 +53,12 @@ from app.schemas.mock import (
     MockDuplicateCheckResponse,
     PaginatedMockResponse
 )
+from app.schemas.knowledge import (
+    KnowledgePointCreateRequest,
+    KnowledgePointUpdateRequest,
+    KnowledgePointListItem,
+    KnowledgePointResponse
+)
 from app.schemas.image import (
     ImageUsageResponse,
     ImageResourceResponse
@@ -72,11 +80,13 @@ __all__ = [
     "ChapterCreateRequest",
     "ChapterUpdateRequest",
     "ChapterResponse",
+    "ChapterNodeResponse",
     "ChapterTreeResponse",
     # Category
     "ExamCategoryCreateRequest",
     "ExamCategoryUpdateRequest",
     "ExamCategoryResponse",
+    "ExamCategoryNodeResponse",
     "ExamCategoryTreeResponse",
     "ExamCategoryStatResponse",
     "ExamCategoryUsageResponse",
@@ -104,6 +114,11 @@ __all__ = [
     "MockCategoryStatsResponse",
     "MockDuplicateCheckResponse",
     "PaginatedMockResponse",
+    # Knowledge
+    "KnowledgePointCreateRequest",
+    "KnowledgePointUpdateRequest",
+    "KnowledgePointListItem",
+    "KnowledgePointResponse",
     # Image
     "ImageUsageResponse",
     "ImageResourceResponse",
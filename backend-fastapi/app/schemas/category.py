@@ -3,6 +3,7 @@
 """
 from typing import Optional, List
 from pydantic import BaseModel, Field, model_validator, AliasChoices
+from app.schemas.common import ResponseModel
 
 
 class ExamCategoryCreateRequest(BaseModel):
@@ -118,7 +119,7 @@ class ExamCategoryUpdateRequest(BaseModel):
     }
 
 
-class ExamCategoryResponse(BaseModel):
+class ExamCategoryResponse(ResponseModel):
     """分类响应（单个节点）"""
     id: int = Field(..., description="分类ID", examples=[1])
     subject_id: int = Field(..., description="所属科目ID", examples=[1])
@@ -143,7 +144,12 @@ class ExamCategoryResponse(BaseModel):
     }
 
 
-class ExamCategoryTreeResponse(BaseModel):
+class ExamCategoryNodeResponse(ExamCategoryResponse):
+    """分类子树/路径节点（带层级距离）"""
+    depth: int = Field(..., description="与查询分类的层级距离（自身为 0，子分类或父分类为 1）", examples=[1])
+
+
+class ExamCategoryTreeResponse(ResponseModel):
     """分类树形响应（带子分类列表和题目统计）"""
     id: int = Field(..., description="分类ID", examples=[1])
     subject_id: int = Field(..., description="所属科目ID", examples=[1])
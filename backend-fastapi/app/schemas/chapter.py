@@ -3,6 +3,7 @@
 """
 from typing import Optional, List
 from pydantic import BaseModel, Field
+from app.schemas.common import ResponseModel
 
 
 class ChapterCreateRequest(BaseModel):
@@ -90,7 +91,7 @@ class ChapterUpdateRequest(BaseModel):
     }
 
 
-class ChapterResponse(BaseModel):
+class ChapterResponse(ResponseModel):
     """章节响应（单个节点）"""
     id: int = Field(..., description="章节ID", examples=[1])
     subject_id: int = Field(..., description="所属科目ID", examples=[1])
@@ -106,7 +107,12 @@ class ChapterResponse(BaseModel):
     }
 
 
-class ChapterTreeResponse(BaseModel):
+class ChapterNodeResponse(ChapterResponse):
+    """章节子树/路径节点（带层级距离）"""
+    depth: int = Field(..., description="与查询章节的层级距离（自身为 0，子章节或父章节为 1）", examples=[1])
+
+
+class ChapterTreeResponse(ResponseModel):
     """章节树形响应（带子章节列表）"""
     id: int = Field(..., description="章节ID", examples=[1])
     subject_id: int = Field(..., description="所属科目ID", examples=[1])
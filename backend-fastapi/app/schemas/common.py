@@ -2,13 +2,25 @@
 统一响应格式定义模块
 遵循 RESTful API 设计规范
 """
-from typing import Generic, TypeVar, Optional
-from pydantic import BaseModel, Field
+from typing import Dict, Generic, TypeVar, Optional, List
+from pydantic import BaseModel, ConfigDict, Field
+from app.config.settings import settings
 
 
 T = TypeVar("T")
 
 
+class ResponseModel(BaseModel):
+    """
+    服务层响应模型基类
+
+    服务层按字段名直接构建响应模型（由 Pydantic 的 Rust 校验器完成，开销在微秒级）。
+    开启 SERVER_DEBUG 时使用严格模式（不做类型转换），
+    便于在测试中发现数据库返回值与模型定义不一致的问题（如布尔字段读出整数）。
+    """
+    model_config = ConfigDict(strict=settings.server.debug)
+
+
 class Response(BaseModel, Generic[T]):
     """
     统一响应格式
@@ -61,6 +73,88 @@ class PaginatedResponse(Response):
         )
 
 
+class NearDuplicateCandidate(BaseModel):
+    """近似重复候选"""
+    id: Optional[int] = Field(default=None, description="已有题目ID（与本批导入的行相似时为空）", examples=[12])
+    row: Optional[int] = Field(default=None, description="本批导入中相似题目的行号", examples=[None])
+    similarity: float = Field(..., description="估计的文本相似度（0~1）", examples=[0.86])
+
+
+class NearDuplicateCheckRequest(BaseModel):
+    """近似重复检查请求"""
+    content: str = Field(..., min_length=1, description="题目内容")
+    options: Optional[str] = Field(default=None, description="选择题选项（JSON 对象字符串）")
+    exclude_id: Optional[int] = Field(default=None, description="排除的题目ID（编辑已有题目时使用）")
+    threshold: float = Field(default=0.7, ge=0.3, le=1.0, description="相似度阈值")
+
+
+class NearDuplicateGroup(BaseModel):
+    """一组相互近似重复的题目"""
+    ids: List[int] = Field(..., description="题目ID（升序）", examples=[[12, 87]])
+    similarity: float = Field(..., description="组内最高的两两相似度", examples=[0.92])
+
+
+class NearDuplicateReportResponse(BaseModel):
+    """题库近似重复报告"""
+    threshold: float = Field(..., description="相似度阈值")
+    total: int = Field(..., description="参与检测的题目数")
+    pair_count: int = Field(..., description="近似重复的题目对数")
+    groups: List[NearDuplicateGroup] = Field(default_factory=list, description="近似重复分组（按组内最高相似度降序）")
+
+
+class SimilarQuestionItem(BaseModel):
+    """相似题目推荐项"""
+    bank: str = Field(..., description="题库：exam=真题，mock=模拟题", examples=["mock"])
+    id: int = Field(..., description="题目ID", examples=[87])
+    title: Optional[str] = Field(default=None, description="题目标题")
+    question_type: str = Field(..., description="题型", examples=["CHOICE"])
+    year: Optional[int] = Field(default=None, description="年份（真题）", examples=[2023])
+    source: Optional[str] = Field(default=None, description="来源机构（模拟题）", examples=["王道"])
+    question_number: Optional[int] = Field(default=None, description="题号", examples=[5])
+    similarity: float = Field(..., description="TF-IDF 余弦相似度（0~1）", examples=[0.42])
+
+
+class ImportRowResult(BaseModel):
+    """批量导入单行结果"""
+    row: int = Field(..., description="在导入文本中的行号", examples=[3])
+    status: str = Field(
+        ...,
+        description="结果：created=已导入，valid=校验通过（试运行），duplicate=重复，invalid=校验失败，failed=写入失败",
+        examples=["created"]
+    )
+    id: Optional[int] = Field(default=None, description="新建题目ID")
+    message: Optional[str] = Field(default=None, description="失败原因或重复说明")
+    near_duplicates: Optional[List[NearDuplicateCandidate]] = Field(
+        default=None,
+        exclude_if=lambda value: value is None,
+        description="内容近似的已有题目或本批其他行（不阻止导入）"
+    )
+
+
+class ImportReportResponse(BaseModel):
+    """批量导入报告"""
+    dry_run: bool = Field(..., description="是否为试运行（不写入数据库）")
+    total: int = Field(..., description="解析出的题目数")
+    created: int = Field(default=0, description="已导入（试运行时为校验通过）数量")
+    duplicates: int = Field(default=0, description="重复数量")
+    invalid: int = Field(default=0, description="校验失败数量")
+    failed: int = Field(default=0, description="写入失败数量")
+    rows: List[ImportRowResult] = Field(default_factory=list, description="逐行结果")
+
+
+class BulkOperationResponse(BaseModel):
+    """批量更新 / 删除结果"""
+    matched: int = Field(..., description="命中筛选条件的题目数", examples=[300])
+    affected: int = Field(..., description="实际更新或删除的题目数（字段已是目标值的题目不计入）", examples=[280])
+
+
+class RenderedQuestionContent(BaseModel):
+    """题目内容预渲染结果（已净化的 HTML；公式保留为 span.math-tex，由前端 KaTeX 渲染）"""
+    content: Optional[str] = Field(default=None, description="题目内容 HTML")
+    options: Optional[Dict[str, str]] = Field(default=None, description="选项 HTML（键为选项字母）")
+    answer: Optional[str] = Field(default=None, description="答案 HTML")
+
+
 def success_response(data=None, message: str = "成功") -> dict:
     """
     快捷创建成功响应
@@ -1,8 +1,9 @@
 """
 真题管理模块请求与响应模型
 """
-from typing import Optional, List
-from pydantic import BaseModel, Field, field_validator
+from typing import Any, Optional, List
+from pydantic import BaseModel, Field, field_validator, model_validator
+from app.schemas.common import ResponseModel, RenderedQuestionContent, NearDuplicateCandidate
 
 
 class ExamQueryParams(BaseModel):
@@ -16,6 +17,9 @@ class ExamQueryParams(BaseModel):
     keyword: Optional[str] = Field(default=None, description="关键词搜索（匹配title或content）", examples=["链表"])
     sort_field: str = Field(default="update_time", description="排序字段：year/update_time/question_number", examples=["update_time"])
     sort_order: str = Field(default="desc", description="排序方向：asc/desc", examples=["desc"])
+    cursor: Optional[str] = Field(default=None, description="游标分页：上一页返回的 next_cursor，传入后忽略 page")
+    with_total: bool = Field(default=True, description="是否统计总数，无限滚动场景可传 false 跳过 COUNT")
+    total_mode: str = Field(default="exact", description="总数模式：exact=精确，estimated=关键词搜索时返回封顶估计值")
 
     model_config = {
         "json_schema_extra": {
@@ -50,6 +54,13 @@ class ExamQueryParams(BaseModel):
             raise ValueError("排序方向必须为 asc 或 desc")
         return v
 
+    @field_validator("total_mode")
+    @classmethod
+    def validate_total_mode(cls, v: str) -> str:
+        if v not in {"exact", "estimated"}:
+            raise ValueError("总数模式必须为 exact 或 estimated")
+        return v
+
 
 class ExamCreateRequest(BaseModel):
     """真题创建请求"""
@@ -109,7 +120,7 @@ class ExamUpdateRequest(BaseModel):
     }
 
 
-class ExamResponse(BaseModel):
+class ExamResponse(ResponseModel):
     """真题响应"""
     id: int = Field(..., description="主键ID", examples=[1])
     year: int = Field(..., description="年份", examples=[2023])
@@ -159,6 +170,17 @@ class ExamResponse(BaseModel):
         alias="updateTime",
         description="更新时间", examples=["2024-01-02T10:00:00"]
     )
+    rendered: Optional[RenderedQuestionContent] = Field(
+        default=None,
+        exclude_if=lambda value: value is None,
+        description="预渲染的 HTML（仅 rendered=html 时返回）"
+    )
+    near_duplicates: Optional[List[NearDuplicateCandidate]] = Field(
+        default=None,
+        alias="nearDuplicates",
+        exclude_if=lambda value: value is None,
+        description="内容近似的已有题目（仅创建题目时返回）"
+    )
 
     model_config = {
         "populate_by_name": True,
@@ -166,7 +188,7 @@ class ExamResponse(BaseModel):
     }
 
 
-class ExamYearStatResponse(BaseModel):
+class ExamYearStatResponse(ResponseModel):
     """真题年份统计响应"""
     year: int = Field(..., description="年份", examples=[2023])
     count: int = Field(..., description="题目数量", examples=[15])
@@ -251,12 +273,33 @@ class ExamNavItem(BaseModel):
     }
 
 
+class ExamNeighborsResponse(ResponseModel):
+    """真题前后导航（顺序与导航索引一致：年份降序、题号升序）"""
+    id: int = Field(..., description="当前题目ID", examples=[12])
+    prev_id: Optional[int] = Field(
+        default=None,
+        alias="prevId",
+        description="上一题ID，为空表示已是第一题", examples=[11]
+    )
+    next_id: Optional[int] = Field(
+        default=None,
+        alias="nextId",
+        description="下一题ID，为空表示已是最后一题", examples=[13]
+    )
+
+    model_config = {
+        "populate_by_name": True
+    }
+
+
 class PaginatedExamResponse(BaseModel):
     """真题分页响应"""
     data: List[ExamResponse] = Field(default_factory=list, description="数据列表")
-    total: int = Field(..., description="总记录数", examples=[100])
+    total: Optional[int] = Field(default=None, description="总记录数（with_total=false 时为空）", examples=[100])
     page: int = Field(..., description="当前页码", examples=[1])
     page_size: int = Field(..., description="每页大小", examples=[10])
+    next_cursor: Optional[str] = Field(default=None, description="下一页游标，为空表示没有更多数据")
+    total_estimated: bool = Field(default=False, description="total 是否为封顶估计值（实际数量不少于 total）")
 
     model_config = {
         "from_attributes": True
@@ -268,3 +311,126 @@ class ExportResultResponse(BaseModel):
     filename: str = Field(..., description="文件名")
     content_type: str = Field(..., description="内容类型")
     file_bytes: bytes = Field(..., description="文件字节流")
+
+
+class ExportStreamResponse(BaseModel):
+    """真题流式导出响应（chunks 为字节块异步迭代器）"""
+    filename: str = Field(..., description="文件名")
+    content_type: str = Field(..., description="内容类型")
+    chunks: Any = Field(..., description="字节块异步迭代器")
+
+
+class ExamRandomPaperParams(BaseModel):
+    """随机组卷参数"""
+    count: int = Field(default=10, ge=1, le=100, description="抽题数量", examples=[10])
+    subject_id: Optional[int] = Field(default=None, description="科目ID", examples=[1])
+    categories: Optional[List[str]] = Field(default=None, description="分类列表（命中任一即可）", examples=[["栈", "队列"]])
+    question_type: Optional[str] = Field(default=None, description="题型：CHOICE/ESSAY", examples=["CHOICE"])
+    difficulty: Optional[str] = Field(default=None, description="难度：EASY/MEDIUM/HARD", examples=["MEDIUM"])
+    year_from: Optional[int] = Field(default=None, description="起始年份（含）", examples=[2015])
+    year_to: Optional[int] = Field(default=None, description="结束年份（含）", examples=[2023])
+
+
+class ExamRandomStatResponse(BaseModel):
+    """随机出题统计响应"""
+    user_id: int = Field(..., alias="userId", description="用户ID", examples=[1])
+    total_attempts: int = Field(..., alias="totalAttempts", description="完成次数", examples=[3])
+    last_attempt_time: Optional[str] = Field(
+        default=None,
+        alias="lastAttemptTime",
+        description="最近完成时间", examples=["2024-01-01T10:00:00"]
+    )
+
+    model_config = {
+        "populate_by_name": True,
+        "from_attributes": True
+    }
+
+
+class ExamImportRequest(BaseModel):
+    """真题批量导入请求"""
+    format: str = Field(..., pattern="^(jsonl|markdown)$", description="内容格式：jsonl（每行一个真题 JSON）/ markdown（与导出格式一致的试卷）")
+    content: str = Field(..., min_length=1, description="导入内容")
+    dry_run: bool = Field(default=False, description="试运行：只校验与查重，不写入数据库")
+    year: Optional[int] = Field(default=None, ge=1990, le=2100, description="默认年份（Markdown 无年份标题或 JSON 行未提供时使用）")
+    subject_id: Optional[int] = Field(default=None, description="默认科目ID（未提供时使用）")
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "format": "jsonl",
+                    "content": "{\"year\": 2024, \"question_number\": 1, \"question_type\": \"CHOICE\", \"content\": \"...\"}",
+                    "dry_run": True,
+                    "subject_id": 1
+                }
+            ]
+        }
+    }
+
+
+class ExamBulkFilter(BaseModel):
+    """真题批量操作筛选条件（各条件同时满足，至少提供一项）"""
+    year: Optional[int] = Field(default=None, description="年份", examples=[2023])
+    subject_id: Optional[int] = Field(default=None, description="科目ID", examples=[1])
+    category: Optional[str] = Field(default=None, description="分类（JSON数组包含）", examples=["栈"])
+    no_category: Optional[bool] = Field(default=None, description="是否只匹配无分类的题目")
+    keyword: Optional[str] = Field(default=None, description="关键词（匹配title或content）")
+    question_type: Optional[str] = Field(default=None, description="题型：CHOICE/ESSAY")
+    difficulty: Optional[str] = Field(default=None, description="难度：EASY/MEDIUM/HARD")
+
+    @model_validator(mode="after")
+    def validate_not_empty(self) -> "ExamBulkFilter":
+        if not any(v not in (None, "", False) for v in self.model_dump().values()):
+            raise ValueError("筛选条件不能为空")
+        return self
+
+
+class ExamBulkPatch(BaseModel):
+    """
+    真题批量修改内容（只修改传入的字段）
+
+    年份、题号参与唯一性约束，不支持批量修改。
+    """
+    question_type: Optional[str] = Field(default=None, description="题型：CHOICE/ESSAY")
+    difficulty: Optional[str] = Field(default=None, description="难度：EASY/MEDIUM/HARD，传 null 清空")
+    subject_id: Optional[int] = Field(default=None, description="科目ID，传 null 清空")
+    add_categories: List[str] = Field(default_factory=list, description="追加的分类（已有则跳过）", examples=[["栈"]])
+    remove_categories: List[str] = Field(default_factory=list, description="移除的分类", examples=[["队列"]])
+
+    @model_validator(mode="after")
+    def validate_not_empty(self) -> "ExamBulkPatch":
+        if not (self.model_fields_set - {"add_categories", "remove_categories"}
+                or self.add_categories or self.remove_categories):
+            raise ValueError("修改内容不能为空")
+        if "question_type" in self.model_fields_set and self.question_type is None:
+            raise ValueError("题型不能为空")
+        return self
+
+
+class ExamBulkDeleteRequest(BaseModel):
+    """真题批量删除请求（ids 与 filter 二选一）"""
+    ids: Optional[List[int]] = Field(default=None, min_length=1, max_length=5000, description="真题ID列表")
+    filter: Optional[ExamBulkFilter] = Field(default=None, description="筛选条件")
+
+    @model_validator(mode="after")
+    def validate_target(self) -> "ExamBulkDeleteRequest":
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("ids 与 filter 必须且只能提供一项")
+        return self
+
+
+class ExamBulkUpdateRequest(ExamBulkDeleteRequest):
+    """真题批量更新请求（ids 与 filter 二选一）"""
+    patch: ExamBulkPatch = Field(..., description="修改内容")
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "filter": {"subject_id": 1, "category": "栈"},
+                    "patch": {"add_categories": ["线性表"], "difficulty": "MEDIUM"}
+                }
+            ]
+        }
+    }
@@ -3,10 +3,11 @@
 对应 Java 的 ImageResourceVO 和 ImageUsageExamVO
 """
 from typing import Optional, List
-from pydantic import BaseModel, Field
+from pydantic import Field
+from app.schemas.common import ResponseModel
 
 
-class ImageUsageResponse(BaseModel):
+class ImageUsageResponse(ResponseModel):
     """
     图片引用真题信息
     对应 Java 的 ImageUsageExamVO
@@ -17,7 +18,7 @@ class ImageUsageResponse(BaseModel):
     title: str = Field(..., description="标题")
 
 
-class ImageResourceResponse(BaseModel):
+class ImageResourceResponse(ResponseModel):
     """
     图片资源响应对象
     对应 Java 的 ImageResourceVO
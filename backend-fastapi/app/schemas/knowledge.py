@@ -0,0 +1,85 @@
+"""
+知识点模块请求与响应模型
+"""
+from typing import Optional
+from pydantic import BaseModel, Field
+from app.schemas.common import ResponseModel
+
+
+class KnowledgePointCreateRequest(BaseModel):
+    """知识点创建请求"""
+    title: str = Field(
+        ...,
+        min_length=1,
+        max_length=200,
+        description="标题",
+        examples=["栈的顺序存储结构"]
+    )
+    category: str = Field(
+        ...,
+        min_length=1,
+        max_length=100,
+        description="分类",
+        examples=["栈"]
+    )
+    chapter_id: Optional[int] = Field(
+        default=None,
+        description="所属章节ID",
+        examples=[3]
+    )
+    content: str = Field(
+        ...,
+        min_length=1,
+        description="Markdown格式内容",
+        examples=["## 顺序栈\n\n用一组地址连续的存储单元存放栈元素……"]
+    )
+
+
+class KnowledgePointUpdateRequest(BaseModel):
+    """知识点更新请求"""
+    title: Optional[str] = Field(
+        default=None,
+        min_length=1,
+        max_length=200,
+        description="标题"
+    )
+    category: Optional[str] = Field(
+        default=None,
+        min_length=1,
+        max_length=100,
+        description="分类"
+    )
+    chapter_id: Optional[int] = Field(
+        default=None,
+        description="所属章节ID"
+    )
+    content: Optional[str] = Field(
+        default=None,
+        min_length=1,
+        description="Markdown格式内容"
+    )
+
+
+class KnowledgePointListItem(ResponseModel):
+    """知识点列表项（不含正文）"""
+    id: int = Field(..., description="知识点ID", examples=[1])
+    title: str = Field(..., description="标题", examples=["栈的顺序存储结构"])
+    category: str = Field(..., description="分类", examples=["栈"])
+    chapter_id: Optional[int] = Field(default=None, description="所属章节ID", examples=[3])
+    view_count: int = Field(default=0, description="浏览次数", examples=[128])
+    update_time: Optional[str] = Field(default=None, description="更新时间")
+
+
+class KnowledgePointResponse(ResponseModel):
+    """知识点详情响应"""
+    id: int = Field(..., description="知识点ID", examples=[1])
+    title: str = Field(..., description="标题", examples=["栈的顺序存储结构"])
+    category: str = Field(..., description="分类", examples=["栈"])
+    chapter_id: Optional[int] = Field(default=None, description="所属章节ID", examples=[3])
+    chapter_name: Optional[str] = Field(default=None, description="所属章节名称", examples=["栈和队列"])
+    content: str = Field(..., description="Markdown格式内容")
+    author_id: int = Field(..., description="作者ID", examples=[1])
+    author_name: Optional[str] = Field(default=None, description="作者用户名", examples=["admin"])
+    view_count: int = Field(default=0, description="浏览次数（含尚未写回数据库的浏览）", examples=[128])
+    create_time: Optional[str] = Field(default=None, description="创建时间")
+    update_time: Optional[str] = Field(default=None, description="更新时间")
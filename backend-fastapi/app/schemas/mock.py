@@ -2,7 +2,8 @@
 模拟题管理模块请求与响应模型
 """
 from typing import Optional, List
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
+from app.schemas.common import ResponseModel, RenderedQuestionContent, NearDuplicateCandidate
 
 
 class MockQueryParams(BaseModel):
@@ -16,6 +17,9 @@ class MockQueryParams(BaseModel):
     keyword: Optional[str] = Field(default=None, description="关键词搜索（匹配title或content）", examples=["链表"])
     sort_field: str = Field(default="update_time", description="排序字段：source/update_time/question_number")
     sort_order: str = Field(default="desc", description="排序方向：asc/desc")
+    cursor: Optional[str] = Field(default=None, description="游标分页：上一页返回的 next_cursor，传入后忽略 page")
+    with_total: bool = Field(default=True, description="是否统计总数，无限滚动场景可传 false 跳过 COUNT")
+    total_mode: str = Field(default="exact", description="总数模式：exact=精确，estimated=关键词搜索时返回封顶估计值")
 
     model_config = {
         "json_schema_extra": {
@@ -50,6 +54,13 @@ class MockQueryParams(BaseModel):
             raise ValueError("排序方向必须为 asc 或 desc")
         return v
 
+    @field_validator("total_mode")
+    @classmethod
+    def validate_total_mode(cls, v: str) -> str:
+        if v not in {"exact", "estimated"}:
+            raise ValueError("总数模式必须为 exact 或 estimated")
+        return v
+
 
 class MockCreateRequest(BaseModel):
     """模拟题创建请求"""
@@ -109,7 +120,7 @@ class MockUpdateRequest(BaseModel):
     }
 
 
-class MockResponse(BaseModel):
+class MockResponse(ResponseModel):
     """模拟题响应"""
     id: int = Field(..., description="主键ID", examples=[1])
     source: str = Field(..., description="来源机构", examples=["王道"])
@@ -127,13 +138,23 @@ class MockResponse(BaseModel):
     author_name: Optional[str] = Field(default=None, description="作者名称")
     create_time: Optional[str] = Field(default=None, description="创建时间")
     update_time: Optional[str] = Field(default=None, description="更新时间")
+    rendered: Optional[RenderedQuestionContent] = Field(
+        default=None,
+        exclude_if=lambda value: value is None,
+        description="预渲染的 HTML（仅 rendered=html 时返回）"
+    )
+    near_duplicates: Optional[List[NearDuplicateCandidate]] = Field(
+        default=None,
+        exclude_if=lambda value: value is None,
+        description="内容近似的已有题目（仅创建题目时返回）"
+    )
 
     model_config = {
         "from_attributes": True
     }
 
 
-class MockSourceStatResponse(BaseModel):
+class MockSourceStatResponse(ResponseModel):
     """模拟题来源统计响应"""
     source: str = Field(..., description="来源机构", examples=["王道"])
     count: int = Field(..., description="题目数量", examples=[50])
@@ -197,10 +218,107 @@ class MockDuplicateCheckResponse(BaseModel):
 class PaginatedMockResponse(BaseModel):
     """模拟题分页响应"""
     data: List[MockResponse] = Field(default_factory=list, description="数据列表")
-    total: int = Field(..., description="总记录数")
+    total: Optional[int] = Field(default=None, description="总记录数（with_total=false 时为空）")
     page: int = Field(..., description="当前页码")
     page_size: int = Field(..., description="每页大小")
+    next_cursor: Optional[str] = Field(default=None, description="下一页游标，为空表示没有更多数据")
+    total_estimated: bool = Field(default=False, description="total 是否为封顶估计值（实际数量不少于 total）")
 
     model_config = {
         "from_attributes": True
     }
+
+
+class MockImportRequest(BaseModel):
+    """模拟题批量导入请求"""
+    format: str = Field(..., pattern="^(jsonl|markdown)$", description="内容格式：jsonl（每行一个模拟题 JSON）/ markdown（二级标题为试卷标题）")
+    content: str = Field(..., min_length=1, description="导入内容")
+    dry_run: bool = Field(default=False, description="试运行：只校验与查重，不写入数据库")
+    source: Optional[str] = Field(default=None, max_length=100, description="默认来源机构（未提供时使用）")
+    title: Optional[str] = Field(default=None, max_length=200, description="默认试卷标题（Markdown 无二级标题或 JSON 行未提供时使用）")
+    subject_id: Optional[int] = Field(default=None, description="默认科目ID（未提供时使用）")
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "format": "markdown",
+                    "content": "## 王道模拟卷一\n### 第1题\n...\n---",
+                    "dry_run": True,
+                    "source": "王道",
+                    "subject_id": 1
+                }
+            ]
+        }
+    }
+
+
+class MockBulkFilter(BaseModel):
+    """模拟题批量操作筛选条件（各条件同时满足，至少提供一项）"""
+    source: Optional[str] = Field(default=None, description="来源机构", examples=["王道"])
+    title: Optional[str] = Field(default=None, description="试卷标题")
+    subject_id: Optional[int] = Field(default=None, description="科目ID", examples=[1])
+    category: Optional[str] = Field(default=None, description="分类（JSON数组包含）", examples=["栈"])
+    no_category: Optional[bool] = Field(default=None, description="是否只匹配无分类的题目")
+    keyword: Optional[str] = Field(default=None, description="关键词（匹配title或content）")
+    question_type: Optional[str] = Field(default=None, description="题型：CHOICE/ESSAY")
+    difficulty: Optional[str] = Field(default=None, description="难度：EASY/MEDIUM/HARD")
+
+    @model_validator(mode="after")
+    def validate_not_empty(self) -> "MockBulkFilter":
+        if not any(v not in (None, "", False) for v in self.model_dump().values()):
+            raise ValueError("筛选条件不能为空")
+        return self
+
+
+class MockBulkPatch(BaseModel):
+    """
+    模拟题批量修改内容（只修改传入的字段）
+
+    题号参与唯一性约束，不支持批量修改。
+    """
+    source: Optional[str] = Field(default=None, min_length=1, max_length=100, description="来源机构")
+    title: Optional[str] = Field(default=None, max_length=200, description="试卷标题")
+    question_type: Optional[str] = Field(default=None, description="题型：CHOICE/ESSAY")
+    difficulty: Optional[str] = Field(default=None, description="难度：EASY/MEDIUM/HARD，传 null 清空")
+    subject_id: Optional[int] = Field(default=None, description="科目ID，传 null 清空")
+    add_categories: List[str] = Field(default_factory=list, description="追加的分类（已有则跳过）", examples=[["栈"]])
+    remove_categories: List[str] = Field(default_factory=list, description="移除的分类", examples=[["队列"]])
+
+    @model_validator(mode="after")
+    def validate_not_empty(self) -> "MockBulkPatch":
+        if not (self.model_fields_set - {"add_categories", "remove_categories"}
+                or self.add_categories or self.remove_categories):
+            raise ValueError("修改内容不能为空")
+        for field in ("source", "question_type"):
+            if field in self.model_fields_set and getattr(self, field) is None:
+                raise ValueError(f"{field} 不能为空")
+        return self
+
+
+class MockBulkDeleteRequest(BaseModel):
+    """模拟题批量删除请求（ids 与 filter 二选一）"""
+    ids: Optional[List[int]] = Field(default=None, min_length=1, max_length=5000, description="模拟题ID列表")
+    filter: Optional[MockBulkFilter] = Field(default=None, description="筛选条件")
+
+    @model_validator(mode="after")
+    def validate_target(self) -> "MockBulkDeleteRequest":
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("ids 与 filter 必须且只能提供一项")
+        return self
+
+
+class MockBulkUpdateRequest(MockBulkDeleteRequest):
+    """模拟题批量更新请求（ids 与 filter 二选一）"""
+    patch: MockBulkPatch = Field(..., description="修改内容")
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "filter": {"source": "王道", "title": "模拟卷一"},
+                    "patch": {"source": "王道计算机教育"}
+                }
+            ]
+        }
+    }
@@ -3,6 +3,7 @@
 """
 from typing import Optional
 from pydantic import BaseModel, Field, model_validator
+from app.schemas.common import ResponseModel
 
 
 class SubjectCreateRequest(BaseModel):
@@ -96,7 +97,7 @@ class SubjectUpdateRequest(BaseModel):
     }
 
 
-class SubjectResponse(BaseModel):
+class SubjectResponse(ResponseModel):
     """科目响应"""
     id: int = Field(..., description="科目ID", examples=[1])
     name: str = Field(..., description="科目名称", examples=["数据结构"])
@@ -0,0 +1,362 @@
+"""
+题目批量更新 / 删除服务模块
+按ID列表或筛选条件对真题、模拟题执行集合式 UPDATE / DELETE
+
+与逐条调用更新接口相比，一次批量操作只执行：
+    1 次 GROUP BY 查询（按影响统计表的字段分组，用于计算统计差值与分类改写映射）
+    修改模拟题来源或标题时，另有 1 次 GROUP BY 查询检查 (来源, 标题, 题号) 唯一性冲突
+    1 条 UPDATE（分类改写用 CASE 表达式）或 DELETE
+    每张统计表 1 次差值写入
+派生数据在同一事务内保持一致：统计表与模拟题目录按差值更新；
+分页总数缓存与随机组卷索引通过会话事件感知批量写语句，提交后自动失效。
+"""
+import json
+from collections import Counter
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+from sqlalchemy import delete, update, case, or_, and_
+from sqlmodel import select, func, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.exception import ValidationException, ConflictException
+from app.models.entities import ExamQuestion, MockQuestion, Subject
+from app.models.enums import QuestionTypeEnum, DifficultyEnum
+from app.schemas.common import BulkOperationResponse
+from app.schemas.exam import ExamBulkDeleteRequest, ExamBulkUpdateRequest, ExamBulkFilter, ExamQueryParams
+from app.schemas.mock import MockBulkDeleteRequest, MockBulkUpdateRequest, MockBulkFilter, MockQueryParams
+from app.services.exam_service import ExamService
+from app.services.mock_service import MockService
+from app.services.stats_service import StatsService, exam_stat_keys, mock_stat_keys, mock_catalog_keys
+from app.core.question_buckets import parse_categories
+from app.utils.logger import setup_logger
+
+
+# 获取服务日志记录器
+logger = setup_logger(__name__)
+
+_QUESTION_TYPES = {e.value for e in QuestionTypeEnum}
+_DIFFICULTIES = {e.value for e in DifficultyEnum}
+
+# 影响统计表的字段
+_EXAM_STAT_FIELDS = ("subject_id", "year", "question_type", "category")
+_MOCK_STAT_FIELDS = ("subject_id", "source", "title", "category")
+
+# 派生计数表：(计算统计键的函数, 累加差值的方法)
+DerivedCounts = Tuple[Tuple[Callable[[Any], List[tuple]], Callable[[Dict[tuple, int]], Any]], ...]
+
+
+def rewrite_categories(
+    raw: Optional[str],
+    add: List[str],
+    remove: List[str]
+) -> Optional[str]:
+    """
+    改写 category 字段（JSON 数组字符串）：先移除再追加，保持原有顺序
+
+    Args:
+        raw: 原分类字段
+        add: 追加的分类
+        remove: 移除的分类
+
+    Returns:
+        新分类字段（分类为空时为 None）
+    """
+    removed = set(remove)
+    categories = [c for c in parse_categories(raw) if c not in removed]
+    categories.extend(c for c in dict.fromkeys(add) if c and c not in categories)
+    return json.dumps(categories, ensure_ascii=False) if categories else None
+
+
+class QuestionBulkService:
+    """题目批量更新 / 删除服务类"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def update_exams(self, request: ExamBulkUpdateRequest) -> BulkOperationResponse:
+        """
+        批量更新真题
+
+        Args:
+            request: 批量更新请求
+
+        Returns:
+            命中与实际更新的题目数
+
+        Raises:
+            ValidationException: 题型、难度取值非法或科目不存在
+        """
+        logger.info("QuestionBulkService.update_exams started, ids: %s, filter: %s",
+                    len(request.ids) if request.ids else None, bool(request.filter))
+        result = await self._update(
+            ExamQuestion, self._exam_conditions(request.ids, request.filter),
+            request.patch.model_dump(exclude_unset=True), _EXAM_STAT_FIELDS,
+            self._exam_derived()
+        )
+        logger.info("QuestionBulkService.update_exams completed, matched: %d, affected: %d",
+                    result.matched, result.affected)
+        return result
+
+    async def delete_exams(self, request: ExamBulkDeleteRequest) -> BulkOperationResponse:
+        """
+        批量删除真题
+
+        Args:
+            request: 批量删除请求
+
+        Returns:
+            删除的题目数
+        """
+        logger.info("QuestionBulkService.delete_exams started, ids: %s, filter: %s",
+                    len(request.ids) if request.ids else None, bool(request.filter))
+        result = await self._delete(
+            ExamQuestion, self._exam_conditions(request.ids, request.filter), _EXAM_STAT_FIELDS,
+            self._exam_derived()
+        )
+        logger.info("QuestionBulkService.delete_exams completed, affected: %d", result.affected)
+        return result
+
+    async def update_mocks(self, request: MockBulkUpdateRequest) -> BulkOperationResponse:
+        """
+        批量更新模拟题
+
+        Args:
+            request: 批量更新请求
+
+        Returns:
+            命中与实际更新的题目数
+
+        Raises:
+            ValidationException: 题型、难度取值非法或科目不存在
+            ConflictException: 修改后与已有题目（或批次内其他题目）的来源、标题、题号重复
+        """
+        logger.info("QuestionBulkService.update_mocks started, ids: %s, filter: %s",
+                    len(request.ids) if request.ids else None, bool(request.filter))
+        conditions = self._mock_conditions(request.ids, request.filter)
+        patch = request.patch.model_dump(exclude_unset=True)
+        await self._check_mock_key_conflicts(conditions, patch)
+        result = await self._update(
+            MockQuestion, conditions, patch, _MOCK_STAT_FIELDS,
+            self._mock_derived()
+        )
+        logger.info("QuestionBulkService.update_mocks completed, matched: %d, affected: %d",
+                    result.matched, result.affected)
+        return result
+
+    async def delete_mocks(self, request: MockBulkDeleteRequest) -> BulkOperationResponse:
+        """
+        批量删除模拟题
+
+        Args:
+            request: 批量删除请求
+
+        Returns:
+            删除的题目数
+        """
+        logger.info("QuestionBulkService.delete_mocks started, ids: %s, filter: %s",
+                    len(request.ids) if request.ids else None, bool(request.filter))
+        result = await self._delete(
+            MockQuestion, self._mock_conditions(request.ids, request.filter), _MOCK_STAT_FIELDS,
+            self._mock_derived()
+        )
+        logger.info("QuestionBulkService.delete_mocks completed, affected: %d", result.affected)
+        return result
+
+    def _exam_derived(self) -> DerivedCounts:
+        stats = StatsService(self.session)
+        return ((exam_stat_keys, stats.apply_exam_delta),)
+
+    def _mock_derived(self) -> DerivedCounts:
+        stats = StatsService(self.session)
+        return ((mock_stat_keys, stats.apply_mock_delta), (mock_catalog_keys, stats.apply_mock_catalog_delta))
+
+    def _exam_conditions(self, ids: Optional[List[int]], filter: Optional[ExamBulkFilter]) -> List:
+        """真题目标条件（筛选条件与分页查询语义一致）"""
+        if ids is not None:
+            return [ExamQuestion.id.in_(ids)]
+        conditions = ExamService(self.session)._build_query_conditions(ExamQueryParams(
+            year=filter.year,
+            subject_id=filter.subject_id,
+            category=filter.category,
+            no_category=filter.no_category,
+            keyword=filter.keyword
+        ))
+        if filter.question_type is not None:
+            conditions.append(ExamQuestion.question_type == filter.question_type)
+        if filter.difficulty is not None:
+            conditions.append(ExamQuestion.difficulty == filter.difficulty)
+        return conditions
+
+    def _mock_conditions(self, ids: Optional[List[int]], filter: Optional[MockBulkFilter]) -> List:
+        """模拟题目标条件（筛选条件与分页查询语义一致）"""
+        if ids is not None:
+            return [MockQuestion.id.in_(ids)]
+        conditions = MockService(self.session)._build_query_conditions(MockQueryParams(
+            source=filter.source,
+            subject_id=filter.subject_id,
+            category=filter.category,
+            no_category=filter.no_category,
+            keyword=filter.keyword
+        ))
+        if filter.title is not None:
+            conditions.append(MockQuestion.title == filter.title)
+        if filter.question_type is not None:
+            conditions.append(MockQuestion.question_type == filter.question_type)
+        if filter.difficulty is not None:
+            conditions.append(MockQuestion.difficulty == filter.difficulty)
+        return conditions
+
+    async def _group_targets(
+        self,
+        model: Type[SQLModel],
+        conditions: List,
+        stat_fields: Tuple[str, ...]
+    ) -> List[Tuple[Dict[str, Any], int]]:
+        """按影响统计表的字段对目标行分组，返回 [(字段值, 行数)]"""
+        columns = [getattr(model, f) for f in stat_fields]
+        stmt = select(*columns, func.count()).where(*conditions).group_by(*columns)
+        result = await self.session.exec(stmt)
+        return [(dict(zip(stat_fields, row[:-1])), row[-1]) for row in result.all()]
+
+    async def _update(
+        self,
+        model: Type[SQLModel],
+        conditions: List,
+        patch: Dict[str, Any],
+        stat_fields: Tuple[str, ...],
+        derived: DerivedCounts
+    ) -> BulkOperationResponse:
+        """批量更新流程（真题与模拟题共用）"""
+        add = patch.pop("add_categories", None) or []
+        remove = patch.pop("remove_categories", None) or []
+        await self._validate_patch(patch)
+
+        groups = await self._group_targets(model, conditions, stat_fields)
+        matched = sum(count for _, count in groups)
+
+        # 分类改写映射：原分类字段 -> 新分类字段（只记录会变化的值）
+        category_map: Dict[Optional[str], Optional[str]] = {}
+        if add or remove:
+            for fields, _ in groups:
+                old = fields["category"]
+                if old not in category_map:
+                    new = rewrite_categories(old, add, remove)
+                    if new != old:
+                        category_map[old] = new
+
+        # 只更新至少有一个字段会变化的行
+        changes = [getattr(model, f).is_distinct_from(v) for f, v in patch.items()]
+        values = dict(patch)
+        if category_map:
+            category = model.category
+            changes.append(or_(*(
+                category.is_(None) if old is None else category == old for old in category_map
+            )))
+            values["category"] = case(
+                *((category.is_(None) if old is None else category == old, new)
+                  for old, new in category_map.items()),
+                else_=category
+            )
+        if not changes:
+            return BulkOperationResponse(matched=matched, affected=0)
+
+        # 统计差值：每组按修改前后的统计键计算（每张派生计数表一份）
+        deltas: List[Counter] = [Counter() for _ in derived]
+        for fields, count in groups:
+            new_fields = {**fields, **{f: v for f, v in patch.items() if f in fields}}
+            if fields["category"] in category_map:
+                new_fields["category"] = category_map[fields["category"]]
+            if new_fields == fields:
+                continue
+            for (stat_keys, _), delta in zip(derived, deltas):
+                for key in stat_keys(SimpleNamespace(**new_fields)):
+                    delta[key] += count
+                for key in stat_keys(SimpleNamespace(**fields)):
+                    delta[key] -= count
+
+        stmt = (
+            update(model)
+            .where(*conditions, or_(*changes))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        for (_, apply_delta), delta in zip(derived, deltas):
+            await apply_delta({key: n for key, n in delta.items() if n})
+        return BulkOperationResponse(matched=matched, affected=result.rowcount)
+
+    async def _delete(
+        self,
+        model: Type[SQLModel],
+        conditions: List,
+        stat_fields: Tuple[str, ...],
+        derived: DerivedCounts
+    ) -> BulkOperationResponse:
+        """批量删除流程（真题与模拟题共用）"""
+        groups = await self._group_targets(model, conditions, stat_fields)
+        matched = sum(count for _, count in groups)
+        if not matched:
+            return BulkOperationResponse(matched=0, affected=0)
+
+        deltas: List[Counter] = [Counter() for _ in derived]
+        for fields, count in groups:
+            for (stat_keys, _), delta in zip(derived, deltas):
+                for key in stat_keys(SimpleNamespace(**fields)):
+                    delta[key] -= count
+
+        stmt = delete(model).where(*conditions).execution_options(synchronize_session=False)
+        result = await self.session.execute(stmt)
+        for (_, apply_delta), delta in zip(derived, deltas):
+            await apply_delta(dict(delta))
+        return BulkOperationResponse(matched=matched, affected=result.rowcount)
+
+    async def _check_mock_key_conflicts(self, conditions: List, patch: Dict[str, Any]) -> None:
+        """
+        检查修改来源或标题后 (来源, 标题, 题号) 是否冲突（与单条更新的查重规则一致，NULL 视为相同取值）
+
+        一次 GROUP BY 查询：把批次内题目的键换算为修改后的值，与可能撞键的已有题目一起分组，
+        含批次内题目且行数大于 1 的组即为冲突（覆盖与已有题目冲突、批次内互相冲突两种情况）。
+
+        Raises:
+            ConflictException: 存在冲突
+        """
+        if "source" not in patch and "title" not in patch:
+            return
+        in_batch = MockQuestion.id.in_(select(MockQuestion.id).where(*conditions))
+        new_source = case((in_batch, patch["source"]), else_=MockQuestion.source) \
+            if "source" in patch else MockQuestion.source
+        new_title = case((in_batch, patch["title"]), else_=MockQuestion.title) \
+            if "title" in patch else MockQuestion.title
+
+        # 批次外只有来源（与标题）等于新值的题目可能撞键
+        candidates = []
+        if "source" in patch:
+            candidates.append(MockQuestion.source == patch["source"])
+        if "title" in patch:
+            candidates.append(MockQuestion.title.is_(None) if patch["title"] is None
+                              else MockQuestion.title == patch["title"])
+        stmt = (
+            select(new_source, new_title, MockQuestion.question_number)
+            .where(or_(in_batch, and_(*candidates)))
+            .group_by(new_source, new_title, MockQuestion.question_number)
+            .having(func.count() > 1, func.max(case((in_batch, 1), else_=0)) == 1)
+            .limit(1)
+        )
+        result = await self.session.execute(stmt)
+        conflict = result.first()
+        if conflict is not None:
+            logger.warning("QuestionBulkService: duplicate mock key after patch, source: %s, title: %s, "
+                           "question_number: %s", *conflict)
+            raise ConflictException(
+                f"相同来源、标题和题号的模拟题已存在：{conflict[0]} / {conflict[1] or '无标题'} / 第 {conflict[2]} 题"
+            )
+
+    async def _validate_patch(self, patch: Dict[str, Any]) -> None:
+        """校验修改内容的枚举取值与科目"""
+        if "question_type" in patch and patch["question_type"] not in _QUESTION_TYPES:
+            raise ValidationException(f"题型必须为 {'/'.join(sorted(_QUESTION_TYPES))}")
+        if patch.get("difficulty") is not None and patch["difficulty"] not in _DIFFICULTIES:
+            raise ValidationException(f"难度必须为 {'/'.join(sorted(_DIFFICULTIES))}")
+        if patch.get("subject_id") is not None:
+            result = await self.session.exec(select(Subject.id).where(Subject.id == patch["subject_id"]))
+            if result.first() is None:
+                raise ValidationException(f"科目不存在：ID={patch['subject_id']}")
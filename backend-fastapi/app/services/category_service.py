@@ -1,6 +1,6 @@
 """
 分类管理服务模块
-实现分类CRUD、树形结构和统计业务逻辑
+实现分类CRUD、树形结构、子树查询和统计业务逻辑
 """
 from typing import List, Optional
 from collections import defaultdict
@@ -8,11 +8,13 @@ from sqlmodel import select, func, and_, text
 from sqlalchemy.orm import selectinload
 from sqlmodel.ext.asyncio.session import AsyncSession
 from app.models.entities import ExamCategory, ExamQuestion, MockQuestion, Subject
+from app.core.tree_query import TreeQuery
 from app.exception import NotFoundException, ConflictException
 from app.schemas.category import (
     ExamCategoryCreateRequest,
     ExamCategoryUpdateRequest,
     ExamCategoryResponse,
+    ExamCategoryNodeResponse,
     ExamCategoryTreeResponse,
     ExamCategoryStatResponse,
     ExamCategoryUsageResponse,
@@ -24,6 +26,9 @@ from app.utils.logger import setup_logger
 # 获取服务日志记录器
 logger = setup_logger(__name__)
 
+# 分类子树查询
+category_tree = TreeQuery(ExamCategory)
+
 
 class ExamCategoryService:
     """分类服务类"""
@@ -456,17 +461,52 @@ class ExamCategoryService:
         return [self._to_response(c) for c in filtered]
 
     async def _get_descendant_ids(self, category_id: int) -> set:
-        """递归获取分类的所有子孙ID"""
-        stmt = select(ExamCategory.id).where(ExamCategory.parent_id == category_id)
-        result = await self.session.exec(stmt)
-        child_ids = set(result.all())
+        """获取分类的所有子孙ID（一次递归查询）"""
+        return await category_tree.descendant_ids(self.session, category_id)
+
+    async def get_descendants(self, category_id: int, include_self: bool = False) -> List[ExamCategoryNodeResponse]:
+        """
+        查询分类的全部子孙分类（一次递归查询）
+
+        Args:
+            category_id: 分类ID
+            include_self: 是否包含分类自身
 
-        all_descendants = set(child_ids)
-        for child_id in child_ids:
-            descendants = await self._get_descendant_ids(child_id)
-            all_descendants.update(descendants)
+        Returns:
+            子孙分类列表（按层级、排序序号升序）
 
-        return all_descendants
+        Raises:
+            NotFoundException: 分类不存在
+        """
+        rows = await category_tree.descendants(
+            self.session, category_id, include_self=True, options=(selectinload(ExamCategory.subject),)
+        )
+        if not rows:
+            logger.warning("ExamCategoryService.get_descendants: category not found, id: %d", category_id)
+            raise NotFoundException(f"分类不存在：ID={category_id}")
+        return [self._to_node(c, depth) for c, depth in rows if include_self or depth > 0]
+
+    async def get_ancestors(self, category_id: int, include_self: bool = False) -> List[ExamCategoryNodeResponse]:
+        """
+        查询分类的祖先路径（一次递归查询）
+
+        Args:
+            category_id: 分类ID
+            include_self: 是否包含分类自身
+
+        Returns:
+            祖先分类列表（从顶级分类到父分类）
+
+        Raises:
+            NotFoundException: 分类不存在
+        """
+        rows = await category_tree.ancestors(
+            self.session, category_id, include_self=True, options=(selectinload(ExamCategory.subject),)
+        )
+        if not rows:
+            logger.warning("ExamCategoryService.get_ancestors: category not found, id: %d", category_id)
+            raise NotFoundException(f"分类不存在：ID={category_id}")
+        return [self._to_node(c, depth) for c, depth in rows if include_self or depth > 0]
 
     async def check_category_usage(self, category_id: int) -> int:
         """
@@ -708,6 +748,7 @@ class ExamCategoryService:
             enabled=request.enabled
         )
         self.session.add(category)
+        await self.session.flush()
         await self.session.refresh(category)
 
         logger.info("ExamCategoryService.create completed, category_id: %d", category.id)
@@ -751,6 +792,10 @@ class ExamCategoryService:
             if request.parent_id == category_id:
                 logger.warning("ExamCategoryService.update: cannot set category as its own parent")
                 raise ConflictException("不能将分类设置为自己的父分类")
+            if await category_tree.is_descendant(self.session, request.parent_id, category_id):
+                logger.warning("ExamCategoryService.update: cannot move category under its descendant, "
+                               "parent_id: %d", request.parent_id)
+                raise ConflictException("不能将分类移动到其子分类下")
 
             parent_result = await self.session.exec(
                 select(ExamCategory).where(ExamCategory.id == request.parent_id)
@@ -883,3 +928,7 @@ class ExamCategoryService:
             create_time=category.create_time.isoformat() if category.create_time else None,
             update_time=category.update_time.isoformat() if category.update_time else None
         )
+
+    def _to_node(self, category: ExamCategory, depth: int) -> ExamCategoryNodeResponse:
+        """将实体转换为带层级距离的节点响应"""
+        return ExamCategoryNodeResponse(**self._to_response(category).model_dump(), depth=depth)
@@ -1,17 +1,19 @@
 """
 章节管理服务模块
-实现章节CRUD和树形结构业务逻辑
+实现章节CRUD、树形结构和子树查询业务逻辑
 """
 from typing import List, Optional
 from collections import defaultdict
 from sqlmodel import select, func, and_
 from sqlmodel.ext.asyncio.session import AsyncSession
 from app.models.entities import Chapter
+from app.core.tree_query import TreeQuery
 from app.exception import NotFoundException, ConflictException
 from app.schemas.chapter import (
     ChapterCreateRequest,
     ChapterUpdateRequest,
     ChapterResponse,
+    ChapterNodeResponse,
     ChapterTreeResponse
 )
 from app.utils.logger import setup_logger
@@ -20,6 +22,9 @@ from app.utils.logger import setup_logger
 # 获取服务日志记录器
 logger = setup_logger(__name__)
 
+# 章节子树查询
+chapter_tree = TreeQuery(Chapter)
+
 
 class ChapterService:
     """章节服务类"""
@@ -138,6 +143,46 @@ class ChapterService:
 
         return tree
 
+    async def get_descendants(self, chapter_id: int, include_self: bool = False) -> List[ChapterNodeResponse]:
+        """
+        查询章节的全部子孙章节（一次递归查询）
+
+        Args:
+            chapter_id: 章节ID
+            include_self: 是否包含章节自身
+
+        Returns:
+            子孙章节列表（按层级、排序序号升序）
+
+        Raises:
+            NotFoundException: 章节不存在
+        """
+        rows = await chapter_tree.descendants(self.session, chapter_id, include_self=True)
+        if not rows:
+            logger.warning("ChapterService.get_descendants: chapter not found, id: %d", chapter_id)
+            raise NotFoundException(f"章节不存在：ID={chapter_id}")
+        return [self._to_node(c, depth) for c, depth in rows if include_self or depth > 0]
+
+    async def get_ancestors(self, chapter_id: int, include_self: bool = False) -> List[ChapterNodeResponse]:
+        """
+        查询章节的祖先路径（一次递归查询）
+
+        Args:
+            chapter_id: 章节ID
+            include_self: 是否包含章节自身
+
+        Returns:
+            祖先章节列表（从顶级章节到父章节）
+
+        Raises:
+            NotFoundException: 章节不存在
+        """
+        rows = await chapter_tree.ancestors(self.session, chapter_id, include_self=True)
+        if not rows:
+            logger.warning("ChapterService.get_ancestors: chapter not found, id: %d", chapter_id)
+            raise NotFoundException(f"章节不存在：ID={chapter_id}")
+        return [self._to_node(c, depth) for c, depth in rows if include_self or depth > 0]
+
     async def get_by_id(self, chapter_id: int) -> ChapterResponse:
         """
         按ID查询章节
@@ -221,6 +266,7 @@ class ChapterService:
             enabled=request.enabled
         )
         self.session.add(chapter)
+        await self.session.flush()
         await self.session.refresh(chapter)
 
         logger.info("ChapterService.create completed, chapter_id: %d", chapter.id)
@@ -263,6 +309,10 @@ class ChapterService:
             if request.parent_id == chapter_id:
                 logger.warning("ChapterService.update: cannot set chapter as its own parent")
                 raise ConflictException("不能将章节设置为自己的父章节")
+            if await chapter_tree.is_descendant(self.session, request.parent_id, chapter_id):
+                logger.warning("ChapterService.update: cannot move chapter under its descendant, parent_id: %d",
+                               request.parent_id)
+                raise ConflictException("不能将章节移动到其子章节下")
 
             parent_result = await self.session.exec(
                 select(Chapter).where(Chapter.id == request.parent_id)
@@ -303,6 +353,7 @@ class ChapterService:
         for field, value in update_data.items():
             setattr(chapter, field, value)
 
+        await self.session.flush()
         await self.session.refresh(chapter)
 
         logger.info("ChapterService.update completed, chapter_id: %d", chapter_id)
@@ -347,3 +398,7 @@ class ChapterService:
             create_time=chapter.create_time.isoformat() if chapter.create_time else None,
             update_time=chapter.update_time.isoformat() if chapter.update_time else None
         )
+
+    def _to_node(self, chapter: Chapter, depth: int) -> ChapterNodeResponse:
+        """将实体转换为带层级距离的节点响应"""
+        return ChapterNodeResponse(**self._to_response(chapter).model_dump(), depth=depth)
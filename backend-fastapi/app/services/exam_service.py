@@ -2,13 +2,18 @@
 真题管理服务模块
 实现真题CRUD、查询、统计业务逻辑
 """
+import asyncio
+import hashlib
 import json
+import shutil
+import zipfile
 from datetime import datetime
-from typing import List, Optional, Tuple, Dict
-from sqlmodel import select, func, and_, or_, text
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple, Dict
+from sqlmodel import select, func, and_, or_, text, case, exists, literal
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.sql.sqltypes import Integer
-from app.models.entities import ExamQuestion, Subject, User
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.models.entities import ExamCategory, ExamQuestion, ExamRandomStat, ExamStat, Subject, User
 from app.exception import NotFoundException, ConflictException
 from app.schemas.exam import (
     ExamQueryParams,
@@ -21,15 +26,54 @@ from app.schemas.exam import (
     ExamDuplicateCheckResponse,
     ExamIndexItem,
     ExamIndexResponse,
+    ExamNeighborsResponse,
     PaginatedExamResponse,
-    ExportResultResponse
+    ExportResultResponse,
+    ExportStreamResponse,
+    ExamRandomPaperParams,
+    ExamRandomStatResponse
 )
 from app.utils.logger import setup_logger
+from app.utils.markdown_images import extract_image_names_from, localize_image_links
+from app.utils.zip_stream import stream_zip, write_zip_file
+from app.config.settings import settings
+from app.utils.pagination import raw_sort_key, encode_cursor, decode_cursor, keyset_condition
+from app.core.cache import VersionedCache, table_versions
+from app.core.snapshot import SnapshotStore
+from app.database.connection import get_session_context
+from app.core.question_buckets import question_buckets
+from app.core.near_duplicates import exam_near_duplicates
+from app.services.stats_service import StatsService, exam_stat_keys, ALL_CATEGORIES
+from app.services.near_duplicate_service import NearDuplicateService
+from app.services.category_service import category_tree
 
 
 # 获取服务日志记录器
 logger = setup_logger(__name__)
 
+# 分页总数缓存（exam_question 表写入后失效）
+_count_cache = VersionedCache(tables=(ExamQuestion.__tablename__,), max_size=512)
+
+# estimated 模式下关键词搜索的统计上限
+ESTIMATED_TOTAL_CAP = 1000
+
+# 导出格式版本（导出内容的生成方式变化时递增，使已缓存的导出文件失效）
+EXPORT_FORMAT_VERSION = 1
+
+# 科目导出数据版本：subject_id -> (计算时的 exam_question 表版本, 数据版本)
+_export_versions: Dict[int, Tuple[int, str]] = {}
+
+
+async def _load_nav_index(key: Tuple[Optional[int], Optional[str]]) -> List[Dict]:
+    """构建导航索引快照：键为 (科目ID, 分类)"""
+    subject_id, category = key
+    async with get_session_context() as session:
+        return await ExamService(session).find_for_nav_index(category, subject_id)
+
+
+# 导航索引快照（exam_question 表写入提交后在后台重建）
+nav_index_snapshots = SnapshotStore("exam-nav-index", ExamQuestion.__tablename__, _load_nav_index)
+
 
 class ExamService:
     """真题服务类"""
@@ -50,12 +94,68 @@ class ExamService:
         Returns:
             分页结果
         """
-        logger.info("ExamService.get_paginated started, page: %d, page_size: %d, year: %s, subject_id: %s",
-                    params.page, params.page_size, params.year, params.subject_id)
+        logger.info("ExamService.get_paginated started, page: %d, page_size: %d, year: %s, subject_id: %s, cursor: %s",
+                    params.page, params.page_size, params.year, params.subject_id, bool(params.cursor))
 
         # 构建查询条件
+        conditions = self._build_query_conditions(params)
+
+        # 查询总数（with_total=false 时跳过，供无限滚动场景使用）
+        total = None
+        total_estimated = False
+        if params.with_total:
+            total, total_estimated = await self._count_total(params, conditions)
+
+        # 排序键 + id 作为稳定排序，游标模式下以 keyset 条件代替 OFFSET
+        sort_column = raw_sort_key(self._get_order_column(params.sort_field))
+        descending = params.sort_order != "asc"
+        if params.cursor:
+            cursor_value, cursor_id = decode_cursor(params.cursor, params.sort_field, params.sort_order)
+            conditions.append(keyset_condition(sort_column, ExamQuestion.id, cursor_value, cursor_id, descending))
+            offset = 0
+        else:
+            offset = (params.page - 1) * params.page_size
+
+        if descending:
+            order_by = (sort_column.desc(), ExamQuestion.id.desc())
+        else:
+            order_by = (sort_column.asc(), ExamQuestion.id.asc())
+
+        # 多取一行用于判断是否还有下一页
+        stmt = (
+            select(ExamQuestion, sort_column.label("sort_key"))
+            .where(*conditions)
+            .order_by(*order_by)
+            .offset(offset)
+            .limit(params.page_size + 1)
+        )
+        result = await self.session.exec(stmt)
+        rows = result.all()
+        has_more = len(rows) > params.page_size
+        rows = rows[:params.page_size]
+
+        next_cursor = None
+        if has_more:
+            last_question, last_sort_key = rows[-1]
+            next_cursor = encode_cursor(params.sort_field, params.sort_order, last_sort_key, last_question.id)
+
+        # 转换为响应对象
+        data_list = [await self._to_response(q) for q, _ in rows]
+
+        logger.info("ExamService.get_paginated completed, total: %s, count: %d", total, len(data_list))
+
+        return PaginatedExamResponse(
+            data=data_list,
+            total=total,
+            page=params.page,
+            page_size=params.page_size,
+            next_cursor=next_cursor,
+            total_estimated=total_estimated
+        )
+
+    def _build_query_conditions(self, params: ExamQueryParams) -> List:
+        """构建查询条件列表"""
         conditions = []
-        exec_params = {}
 
         if params.year is not None:
             conditions.append(ExamQuestion.year == params.year)
@@ -89,34 +189,53 @@ class ExamService:
                 )
             )
 
-        # 查询总数
-        count_stmt = select(func.count(ExamQuestion.id)).select_from(ExamQuestion).where(*conditions)
-        count_result = await self.session.exec(count_stmt)
-        total = count_result.first() or 0
+        return conditions
 
-        # 查询数据
-        offset = (params.page - 1) * params.page_size
-        order_column = self._get_order_column(params.sort_field)
-        if params.sort_order == "asc":
-            order_column = order_column.asc()
-        else:
-            order_column = order_column.desc()
+    async def _count_total(
+        self,
+        params: ExamQueryParams,
+        conditions: List
+    ) -> Tuple[int, bool]:
+        """
+        统计分页总数
 
-        stmt = select(ExamQuestion).where(*conditions).order_by(order_column).offset(offset).limit(params.page_size)
-        result = await self.session.exec(stmt)
-        questions = result.all()
+        结果按规范化后的筛选条件缓存，exam_question 表有写入提交后自动失效，
+        翻页时只需统计一次。estimated 模式下关键词搜索只统计到上限为止。
 
-        # 转换为响应对象
-        data_list = [await self._to_response(q) for q in questions]
+        Args:
+            params: 查询参数
+            conditions: 查询条件列表（不含游标条件）
 
-        logger.info("ExamService.get_paginated completed, total: %d", total)
+        Returns:
+            (总数, 是否为封顶估计值)
+        """
+        estimated = params.total_mode == "estimated" and bool(params.keyword and params.keyword.strip())
+        cache_key = (self._filter_key(params), estimated)
+        cached = _count_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        version = _count_cache.current_version()
+        if estimated:
+            # 关键词 LIKE 无法使用索引，找到足够多的匹配行即停止扫描
+            capped = select(ExamQuestion.id).where(*conditions).limit(ESTIMATED_TOTAL_CAP).subquery()
+            count_stmt = select(func.count()).select_from(capped)
+        else:
+            count_stmt = select(func.count(ExamQuestion.id)).select_from(ExamQuestion).where(*conditions)
+        count_result = await self.session.exec(count_stmt)
+        total = count_result.first() or 0
 
-        return PaginatedExamResponse(
-            data=data_list,
-            total=total,
-            page=params.page,
-            page_size=params.page_size
-        )
+        value = (total, estimated and total >= ESTIMATED_TOTAL_CAP)
+        _count_cache.set(cache_key, value, version)
+        return value
+
+    def _filter_key(self, params: ExamQueryParams) -> Tuple:
+        """将筛选条件规范化为缓存键（与 _build_query_conditions 的语义保持一致）"""
+        keyword = params.keyword if params.keyword and params.keyword.strip() else None
+        category = None
+        if params.no_category is not True and params.category is not None and params.category.strip():
+            category = params.category
+        return (params.year, params.subject_id, params.no_category is True, category, keyword)
 
     def _get_order_column(self, sort_field: str):
         """获取排序字段"""
@@ -208,32 +327,20 @@ class ExamService:
             年份统计列表
         """
         logger.info("ExamService.get_year_stats started, category: %s", category)
-        conditions = []
+        stat_category = category if category and category.strip() else ALL_CATEGORIES
 
-        if category and category.strip():
-            pattern = f'%"{category}"%'
-            conditions.append(
-                and_(
-                    ExamQuestion.category.isnot(None),
-                    ExamQuestion.category.like(pattern)
-                )
-            )
-
-        # 按年份分组统计
+        # 读取统计表（按 category, year 索引）
         stmt = (
             select(
-                ExamQuestion.year,
-                func.count().label("count"),
+                ExamStat.year,
+                func.sum(ExamStat.count).label("count"),
                 func.sum(
-                    func.cast(
-                        func.if_(ExamQuestion.question_type == "CHOICE", 1, 0),
-                        Integer
-                    )
+                    case((ExamStat.question_type == "CHOICE", ExamStat.count), else_=0)
                 ).label("choice_count")
             )
-            .where(*conditions)
-            .group_by(ExamQuestion.year)
-            .order_by(ExamQuestion.year.desc())
+            .where(ExamStat.category == stat_category)
+            .group_by(ExamStat.year)
+            .order_by(ExamStat.year.desc())
         )
 
         result = await self.session.exec(stmt)
@@ -257,7 +364,7 @@ class ExamService:
         subject_id: Optional[int] = None
     ) -> ExamCategoryStatsResponse:
         """
-        获取分类统计（从JSON数组展开）
+        获取分类统计（读取增量维护的 exam_stat 统计表）
 
         Args:
             subject_id: 可选科目ID筛选
@@ -266,47 +373,34 @@ class ExamService:
             分类统计结果
         """
         logger.info("ExamService.get_category_stats started, subject_id: %s", subject_id)
-        conditions = [
-            ExamQuestion.category.isnot(None),
-            ExamQuestion.category != ""  # 简单字符串非空检查
-        ]
+        conditions = [ExamStat.category != ALL_CATEGORIES]
 
         if subject_id:
-            conditions.append(ExamQuestion.subject_id == subject_id)
+            conditions.append(ExamStat.subject_id == subject_id)
 
-        # 由于SQLite不支持JSON_TABLE，使用内存聚合方式
-        # 先查询所有符合条件的记录
-        stmt = select(ExamQuestion).where(*conditions)
+        # 读取统计表（分类已在写入时展开）
+        stmt = (
+            select(
+                ExamStat.category,
+                func.sum(ExamStat.count).label("count"),
+                func.sum(
+                    case((ExamStat.question_type == "CHOICE", ExamStat.count), else_=0)
+                ).label("choice_count")
+            )
+            .where(*conditions)
+            .group_by(ExamStat.category)
+            .order_by(ExamStat.category)
+        )
         result = await self.session.exec(stmt)
-        questions = result.all()
 
-        # 内存中展开JSON数组进行统计
-        category_counts: dict[str, dict] = {}
-        for q in questions:
-            if q.category:
-                try:
-                    categories = json.loads(q.category)
-                    if isinstance(categories, list):
-                        for cat in categories:
-                            if cat not in category_counts:
-                                category_counts[cat] = {"count": 0, "choice": 0, "subjective": 0}
-                            category_counts[cat]["count"] += 1
-                            if q.question_type == "CHOICE":
-                                category_counts[cat]["choice"] += 1
-                            else:
-                                category_counts[cat]["subjective"] += 1
-                except json.JSONDecodeError:
-                    continue
-
-        # 转换为响应列表
         stats_items = [
             ExamCategoryStatItem(
-                category=cat,
-                count=data["count"],
-                choice_count=data["choice"],
-                subjective_count=data["subjective"]
+                category=row.category,
+                count=row.count,
+                choice_count=row.choice_count,
+                subjective_count=row.count - row.choice_count
             )
-            for cat, data in sorted(category_counts.items())
+            for row in result.all()
         ]
 
         # 获取科目信息
@@ -425,10 +519,19 @@ class ExamService:
             author_id=author_id
         )
         self.session.add(question)
+        await self.session.flush()
         await self.session.refresh(question)
+        await StatsService(self.session).apply_exam_change([], question)
 
-        logger.info("ExamService.create completed, question_id: %d", question.id)
-        return await self._to_response(question)
+        response = await self._to_response(question)
+        # 内容近似的已有题目只做提示，不阻止创建
+        response.near_duplicates = await NearDuplicateService(self.session).find_for_question(
+            exam_near_duplicates, question.content, question.options, exclude_id=question.id
+        )
+
+        logger.info("ExamService.create completed, question_id: %d, near_duplicates: %d",
+                    question.id, len(response.near_duplicates))
+        return response
 
     async def update(
         self,
@@ -477,11 +580,14 @@ class ExamService:
                     )
 
         # 更新字段
+        old_stat_keys = exam_stat_keys(question)
         update_data = request.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(question, field, value)
 
+        await self.session.flush()
         await self.session.refresh(question)
+        await StatsService(self.session).apply_exam_change(old_stat_keys, question)
 
         logger.info("ExamService.update completed, question_id: %d", question_id)
         return await self._to_response(question)
@@ -508,7 +614,9 @@ class ExamService:
             raise NotFoundException(f"真题不存在：ID={question_id}")
 
         # 删除
+        old_stat_keys = exam_stat_keys(question)
         await self.session.delete(question)
+        await StatsService(self.session).apply_exam_change(old_stat_keys, None)
 
         logger.info("ExamService.delete completed, question_id: %d", question_id)
 
@@ -685,19 +793,25 @@ class ExamService:
 
     async def find_for_nav_index(
         self,
-        category: Optional[str] = None
+        category: Optional[str] = None,
+        subject_id: Optional[int] = None
     ) -> List[Dict]:
         """
         查询用于侧边栏导航的轻量级真题索引数据
 
+        接口通过 nav_index_snapshots 读取预计算的快照，本方法只在构建快照时调用。
+
         Args:
             category: 可选分类筛选
+            subject_id: 可选科目ID筛选
 
         Returns:
             轻量级真题列表（仅包含导航所需字段）
         """
-        logger.info("ExamService.find_for_nav_index started, category: %s", category)
+        logger.info("ExamService.find_for_nav_index started, category: %s, subject_id: %s", category, subject_id)
         conditions = []
+        if subject_id is not None:
+            conditions.append(ExamQuestion.subject_id == subject_id)
         if category and category.strip():
             pattern = f'%"{category}"%'
             conditions.append(
@@ -741,10 +855,88 @@ class ExamService:
         logger.info("ExamService.find_for_nav_index completed, count: %d", len(nav_items))
         return nav_items
 
+    async def get_neighbors(
+        self,
+        question_id: int,
+        category: Optional[str] = None,
+        subject_id: Optional[int] = None
+    ) -> ExamNeighborsResponse:
+        """
+        查询真题在导航顺序（年份降序、题号升序、ID升序）中的上一题与下一题
+
+        每个方向为一次索引定位：先在本年份内按 (year, question_number) 索引找相邻题号，
+        本年份内没有时取相邻年份的首题/末题，两个方向合并为一条查询，不需要加载整个导航列表。
+
+        Args:
+            question_id: 真题ID
+            category: 可选分类筛选（与导航索引相同的 JSON 数组包含语义）
+            subject_id: 可选科目ID筛选
+
+        Returns:
+            上一题与下一题ID
+
+        Raises:
+            NotFoundException: 真题不存在
+        """
+        logger.info("ExamService.get_neighbors started, question_id: %d, category: %s, subject_id: %s",
+                    question_id, category, subject_id)
+        result = await self.session.exec(
+            select(ExamQuestion.year, ExamQuestion.question_number).where(ExamQuestion.id == question_id)
+        )
+        current = result.first()
+        if current is None:
+            logger.warning("ExamService.get_neighbors: question not found, id: %d", question_id)
+            raise NotFoundException(f"真题不存在：ID={question_id}")
+        year, number = current
+
+        conditions = []
+        if subject_id is not None:
+            conditions.append(ExamQuestion.subject_id == subject_id)
+        if category and category.strip():
+            conditions.append(
+                and_(
+                    ExamQuestion.category.isnot(None),
+                    ExamQuestion.category.like(f'%"{category}"%')
+                )
+            )
+
+        def seek(ahead: bool):
+            """ahead=True 取下一题，False 取上一题"""
+            if ahead:
+                order = (ExamQuestion.question_number.asc(), ExamQuestion.id.asc())
+                adjacent_year = select(func.max(ExamQuestion.year)).where(*conditions, ExamQuestion.year < year)
+            else:
+                order = (ExamQuestion.question_number.desc(), ExamQuestion.id.desc())
+                adjacent_year = select(func.min(ExamQuestion.year)).where(*conditions, ExamQuestion.year > year)
+            same_year = (
+                select(ExamQuestion.id)
+                .where(*conditions, ExamQuestion.year == year,
+                       keyset_condition(ExamQuestion.question_number, ExamQuestion.id,
+                                        number, question_id, descending=not ahead))
+                .order_by(*order)
+                .limit(1)
+                .scalar_subquery()
+            )
+            other_year = (
+                select(ExamQuestion.id)
+                .where(*conditions, ExamQuestion.year == adjacent_year.scalar_subquery())
+                .order_by(*order)
+                .limit(1)
+                .scalar_subquery()
+            )
+            return func.coalesce(same_year, other_year)
+
+        result = await self.session.exec(select(seek(ahead=False), seek(ahead=True)))
+        prev_id, next_id = result.one()
+
+        logger.info("ExamService.get_neighbors completed, prev_id: %s, next_id: %s", prev_id, next_id)
+        return ExamNeighborsResponse(id=question_id, prev_id=prev_id, next_id=next_id)
+
     async def find_by_subject_and_category(
         self,
         subject_id: Optional[int],
-        category: str
+        category: str,
+        include_children: bool = False
     ) -> List[ExamResponse]:
         """
         根据科目和分类查询真题
@@ -752,20 +944,18 @@ class ExamService:
         Args:
             subject_id: 可选科目ID
             category: 分类名称
+            include_children: 是否包含子孙分类下的题目（与分类子树一次递归查询完成）
 
         Returns:
             符合条件的真题列表
         """
-        logger.info("ExamService.find_by_subject_and_category started, subject_id: %s, category: %s",
-                    subject_id, category)
-        conditions = []
-        pattern = f'%"{category}"%'
-        conditions.append(
-            and_(
-                ExamQuestion.category.isnot(None),
-                ExamQuestion.category.like(pattern)
-            )
-        )
+        logger.info("ExamService.find_by_subject_and_category started, subject_id: %s, category: %s, "
+                    "include_children: %s", subject_id, category, include_children)
+        conditions = [ExamQuestion.category.isnot(None)]
+        if include_children:
+            conditions.append(self._category_subtree_condition(subject_id, category))
+        else:
+            conditions.append(ExamQuestion.category.like(f'%"{category}"%'))
 
         if subject_id:
             conditions.append(ExamQuestion.subject_id == subject_id)
@@ -783,6 +973,96 @@ class ExamService:
         logger.info("ExamService.find_by_subject_and_category completed, count: %d", len(responses))
         return responses
 
+    @staticmethod
+    def _category_subtree_condition(subject_id: Optional[int], category: str):
+        """题目标签命中指定分类或其任一子孙分类（EXISTS + 递归 CTE）"""
+        roots = [ExamCategory.name == category]
+        if subject_id:
+            roots.append(ExamCategory.subject_id == subject_id)
+        subtree = category_tree.descendants_cte(*roots)
+        return exists(
+            select(1)
+            .select_from(subtree)
+            .join(ExamCategory, ExamCategory.id == subtree.c.id)
+            .where(ExamQuestion.category.like(literal('%"').concat(ExamCategory.name).concat('"%')))
+        )
+
+    async def get_random_paper(self, params: ExamRandomPaperParams) -> List[ExamResponse]:
+        """
+        随机组卷
+
+        从内存中的题目ID桶按条件抽样（开销与抽题数量成正比，与题库大小无关），
+        再用一次 IN 查询取回题目详情。
+
+        Args:
+            params: 组卷参数
+
+        Returns:
+            随机抽取的真题列表（题目不足时数量少于 count）
+        """
+        logger.info("ExamService.get_random_paper started, count: %d, subject_id: %s",
+                    params.count, params.subject_id)
+        await question_buckets.ensure_loaded()
+        question_ids = question_buckets.sample(
+            params.count,
+            subject_id=params.subject_id,
+            question_type=params.question_type,
+            categories=params.categories,
+            difficulty=params.difficulty,
+            year_from=params.year_from,
+            year_to=params.year_to
+        )
+        if not question_ids:
+            logger.info("ExamService.get_random_paper completed, count: 0")
+            return []
+
+        result = await self.session.exec(select(ExamQuestion).where(ExamQuestion.id.in_(question_ids)))
+        questions = {q.id: q for q in result.all()}
+        responses = [await self._to_response(questions[qid]) for qid in question_ids if qid in questions]
+
+        logger.info("ExamService.get_random_paper completed, count: %d", len(responses))
+        return responses
+
+    async def record_random_completion(self, user_id: int) -> ExamRandomStatResponse:
+        """
+        记录一次随机组卷完成
+
+        使用 INSERT ... ON CONFLICT(user_id) DO UPDATE 一条语句完成新增或累加。
+
+        Args:
+            user_id: 用户ID
+
+        Returns:
+            更新后的随机出题统计
+        """
+        logger.info("ExamService.record_random_completion started, user_id: %d", user_id)
+        now = datetime.utcnow()
+        stmt = sqlite_insert(ExamRandomStat).values(
+            user_id=user_id,
+            total_attempts=1,
+            last_attempt_time=now,
+            create_time=now,
+            update_time=now
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ExamRandomStat.user_id],
+            set_={
+                "total_attempts": ExamRandomStat.total_attempts + 1,
+                "last_attempt_time": now,
+                "update_time": now
+            }
+        ).returning(ExamRandomStat.total_attempts)
+        result = await self.session.execute(stmt)
+        total_attempts = result.scalar_one()
+
+        logger.info("ExamService.record_random_completion completed, user_id: %d, total_attempts: %d",
+                    user_id, total_attempts)
+        return ExamRandomStatResponse(
+            user_id=user_id,
+            total_attempts=total_attempts,
+            last_attempt_time=now.isoformat()
+        )
+
     async def export_by_subject(
         self,
         subject_id: int,
@@ -824,6 +1104,118 @@ class ExamService:
             file_bytes=md_content.encode("utf-8")
         )
 
+    async def export_zip_by_subject(self, subject_id: int) -> ExportStreamResponse:
+        """
+        按科目导出真题离线包（ZIP，流式输出）
+
+        压缩包内每个年份一个 Markdown 文件（格式与 Markdown 导出一致，可直接用于批量导入），
+        题目引用的图片放在 images/ 目录下，文中图片链接改写为相对路径。
+        题目数据在返回前一次查询完毕；压缩与读取图片文件在工作线程中边生成边输出。
+
+        Args:
+            subject_id: 科目ID
+
+        Returns:
+            流式导出结果
+        """
+        logger.info("ExamService.export_zip_by_subject started, subject_id: %d", subject_id)
+        write_entries = await self._prepare_zip_entries(subject_id)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return ExportStreamResponse(
+            filename=f"真题_{subject_id}_{timestamp}.zip",
+            content_type="application/zip",
+            chunks=stream_zip(write_entries)
+        )
+
+    async def export_zip_to_file(self, subject_id: int, path: Path) -> None:
+        """
+        按科目导出真题离线包并写入文件（内容与 export_zip_by_subject 相同，压缩在工作线程中执行）
+
+        Args:
+            subject_id: 科目ID
+            path: 目标文件路径
+        """
+        logger.info("ExamService.export_zip_to_file started, subject_id: %d", subject_id)
+        write_entries = await self._prepare_zip_entries(subject_id)
+        await asyncio.to_thread(write_zip_file, path, write_entries)
+        logger.info("ExamService.export_zip_to_file completed, subject_id: %d", subject_id)
+
+    async def _prepare_zip_entries(self, subject_id: int) -> Callable[[zipfile.ZipFile], None]:
+        """查询导出数据，返回在工作线程中写入 ZIP 条目的函数"""
+        # 只查询导出所需字段（行对象与会话无关，可在工作线程中读取）
+        stmt = (
+            select(
+                ExamQuestion.year,
+                ExamQuestion.question_number,
+                ExamQuestion.title,
+                ExamQuestion.content,
+                ExamQuestion.options,
+                ExamQuestion.answer
+            )
+            .where(ExamQuestion.subject_id == subject_id)
+            .order_by(ExamQuestion.year.desc(), ExamQuestion.question_number.asc())
+        )
+        result = await self.session.exec(stmt)
+        questions = result.all()
+
+        year_groups: Dict[int, list] = {}
+        for q in questions:
+            year_groups.setdefault(q.year, []).append(q)
+        image_names = sorted(extract_image_names_from(questions, ("content", "options", "answer")))
+        upload_dir = Path(settings.upload.upload_dir)
+        generated_at = datetime.now().timetuple()[:6]
+
+        def write_entries(archive: zipfile.ZipFile) -> None:
+            for year, items in year_groups.items():
+                info = zipfile.ZipInfo(f"{year}年.md", date_time=generated_at)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                archive.writestr(info, localize_image_links(self._generate_markdown(items)))
+            for name in image_names:
+                path = upload_dir / name
+                if not path.is_file():
+                    logger.warning("ExamService.export_zip: image not found: %s", name)
+                    continue
+                # 图片本身已压缩，直接存储
+                info = zipfile.ZipInfo.from_file(path, f"images/{name}")
+                info.compress_type = zipfile.ZIP_STORED
+                with open(path, "rb") as src, archive.open(info, "w") as dst:
+                    shutil.copyfileobj(src, dst, 64 * 1024)
+
+        logger.info("ExamService._prepare_zip_entries completed, count: %d, years: %d, images: %d",
+                    len(questions), len(year_groups), len(image_names))
+        return write_entries
+
+    async def get_export_version(self, subject_id: int) -> str:
+        """
+        获取科目导出数据版本（用于导出文件缓存）
+
+        版本为该科目全部真题 (id, update_time) 与导出格式版本的摘要：新增、修改、删除题目都会改变版本，
+        重启后版本不变，已缓存的导出文件仍可使用。exam_question 表无写入时直接返回上次计算结果。
+
+        Args:
+            subject_id: 科目ID
+
+        Returns:
+            版本字符串
+        """
+        table_version = table_versions.get(ExamQuestion.__tablename__)
+        cached = _export_versions.get(subject_id)
+        if cached is not None and cached[0] == table_version:
+            return cached[1]
+
+        stmt = (
+            select(ExamQuestion.id, raw_sort_key(ExamQuestion.update_time))
+            .where(ExamQuestion.subject_id == subject_id)
+            .order_by(ExamQuestion.id)
+        )
+        result = await self.session.exec(stmt)
+        digest = hashlib.blake2b(f"export-v{EXPORT_FORMAT_VERSION}".encode(), digest_size=10)
+        for question_id, update_time in result.all():
+            digest.update(f"|{question_id}:{update_time}".encode())
+        version = digest.hexdigest()
+        _export_versions[subject_id] = (table_version, version)
+        return version
+
     def _generate_markdown(self, questions: List[ExamQuestion]) -> str:
         """生成Markdown格式的真题内容"""
         md_lines = ["# 真题列表\n"]
@@ -0,0 +1,246 @@
+"""
+导出文件缓存模块
+按 (科目ID, 导出格式, 数据版本) 缓存生成好的导出文件，命中时直接以文件响应返回，无需重新查询与压缩
+
+    - 数据版本由 ExamService.get_export_version 计算，题目有增删改时版本变化，旧版本文件随之淘汰
+    - 同一个键同时只生成一次，并发请求等待同一个生成任务（请求断开不会中断生成）
+    - 文件先写入临时文件再原子替换，多进程部署时其他进程生成的文件也可直接使用
+    - 缓存目录总大小超过上限时按最近使用时间淘汰（使用时更新文件修改时间，重启后顺序仍然有效）
+    - 被淘汰的文件可能仍在传输（Windows 下无法删除打开中的文件），删除失败时记下路径，下次淘汰时重试
+"""
+import asyncio
+import os
+import re
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+from app.config.settings import settings
+from app.database.connection import get_session_context
+from app.services.exam_service import ExamService
+from app.utils.logger import setup_logger
+
+
+# 获取服务日志记录器
+logger = setup_logger(__name__)
+
+# 导出格式 -> (文件扩展名, 内容类型)
+EXPORT_FORMATS: Dict[str, Tuple[str, str]] = {
+    "markdown": ("md", "text/markdown; charset=utf-8"),
+    "zip": ("zip", "application/zip"),
+}
+
+# 最近这段时间内使用过的文件暂不淘汰（可能仍在传输）
+EVICTION_GRACE_SECONDS = 30
+
+# 缓存文件名：{科目ID}_{格式}_{版本}.{扩展名}
+_FILENAME_PATTERN = re.compile(r"^(\d+)_([a-z]+)_([0-9a-f]+)\.[a-z]+$")
+
+ArtifactKey = Tuple[int, str, str]
+
+
+def normalize_export_format(format: str) -> str:
+    """
+    规范化导出格式（与导出接口语义一致：zip 为离线包，其他取值导出 Markdown）
+
+    Args:
+        format: 请求中的导出格式
+
+    Returns:
+        "zip" 或 "markdown"
+    """
+    return "zip" if format == "zip" else "markdown"
+
+
+class ExportArtifact:
+    """一个已生成的导出文件"""
+
+    __slots__ = ("key", "path", "size", "last_used")
+
+    def __init__(self, key: ArtifactKey, path: Path, size: int):
+        self.key = key
+        self.path = path
+        self.size = size
+        self.last_used = time.monotonic()
+
+    @property
+    def media_type(self) -> str:
+        return EXPORT_FORMATS[self.key[1]][1]
+
+    def download_name(self) -> str:
+        """下载文件名（与直接导出时的命名一致）"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return f"真题_{self.key[0]}_{timestamp}.{EXPORT_FORMATS[self.key[1]][0]}"
+
+
+class ExportArtifactCache:
+    """导出文件缓存（按最近使用顺序维护的磁盘文件索引）"""
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._artifacts: Optional[OrderedDict[ArtifactKey, ExportArtifact]] = None
+        self._jobs: Dict[ArtifactKey, asyncio.Task] = {}
+        # 已淘汰但删除失败、待重试删除的文件
+        self._pending_deletes: Set[Path] = set()
+
+    async def get(self, subject_id: int, format: str, version: str) -> ExportArtifact:
+        """
+        获取导出文件（未缓存时生成）
+
+        Args:
+            subject_id: 科目ID
+            format: 导出格式（markdown / zip）
+            version: 数据版本
+
+        Returns:
+            导出文件
+        """
+        key = (subject_id, format, version)
+        artifacts = self._index()
+        artifact = artifacts.get(key)
+        if artifact is None:
+            # 可能已由其他进程生成
+            artifact = self._register(key, self._path(key))
+        elif not artifact.path.is_file():
+            del artifacts[key]
+            artifact = None
+        if artifact is not None:
+            self._touch(artifact)
+            logger.info("ExportArtifactCache hit, key: %s", key)
+            return artifact
+
+        task = self._jobs.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._generate(key))
+            self._jobs[key] = task
+            task.add_done_callback(lambda finished: self._jobs.pop(key, None))
+        return await asyncio.shield(task)
+
+    def clear(self) -> None:
+        """删除全部缓存文件"""
+        for artifact in list(self._index().values()):
+            self._remove(artifact)
+        self._retry_deletes()
+
+    def _path(self, key: ArtifactKey) -> Path:
+        subject_id, format, version = key
+        return self.cache_dir / f"{subject_id}_{format}_{version}.{EXPORT_FORMATS[format][0]}"
+
+    def _index(self) -> OrderedDict:
+        """首次使用时扫描缓存目录建立索引（按文件修改时间排序，清理遗留的临时文件）"""
+        if self._artifacts is not None:
+            return self._artifacts
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        found = []
+        for entry in os.scandir(self.cache_dir):
+            if not entry.is_file():
+                continue
+            if entry.name.endswith(".tmp"):
+                Path(entry.path).unlink(missing_ok=True)
+                continue
+            match = _FILENAME_PATTERN.match(entry.name)
+            if match is None or match.group(2) not in EXPORT_FORMATS:
+                continue
+            stat = entry.stat()
+            key = (int(match.group(1)), match.group(2), match.group(3))
+            found.append((stat.st_mtime, key, Path(entry.path), stat.st_size))
+        found.sort(key=lambda item: item[0])
+        self._artifacts = OrderedDict(
+            (key, ExportArtifact(key, path, size)) for _, key, path, size in found
+        )
+        logger.info("ExportArtifactCache loaded, files: %d, dir: %s", len(found), self.cache_dir)
+        return self._artifacts
+
+    def _register(self, key: ArtifactKey, path: Path) -> Optional[ExportArtifact]:
+        """将已存在的文件加入索引（文件不存在时返回 None）"""
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return None
+        artifact = ExportArtifact(key, path, size)
+        self._index()[key] = artifact
+        self._pending_deletes.discard(path)
+        return artifact
+
+    def _touch(self, artifact: ExportArtifact) -> None:
+        """标记为最近使用"""
+        artifact.last_used = time.monotonic()
+        self._index().move_to_end(artifact.key)
+        try:
+            os.utime(artifact.path)
+        except OSError:
+            pass
+
+    async def _generate(self, key: ArtifactKey) -> ExportArtifact:
+        """生成导出文件：写入临时文件后原子替换"""
+        subject_id, format, version = key
+        started = time.perf_counter()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            async with get_session_context() as session:
+                service = ExamService(session)
+                if format == "zip":
+                    await service.export_zip_to_file(subject_id, tmp_path)
+                else:
+                    result = await service.export_by_subject(subject_id, format)
+                    await asyncio.to_thread(tmp_path.write_bytes, result.file_bytes)
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        artifact = self._register(key, path)
+        self._evict(artifact)
+        logger.info("ExportArtifactCache generated, key: %s, bytes: %d, elapsed: %.3fs",
+                    key, artifact.size, time.perf_counter() - started)
+        return artifact
+
+    def _evict(self, keep: ExportArtifact) -> None:
+        """删除同一科目、格式的旧版本文件，再按最近使用顺序淘汰直到总大小不超过上限"""
+        self._retry_deletes()
+        artifacts = self._index()
+        now = time.monotonic()
+
+        def evictable(artifact: ExportArtifact) -> bool:
+            return artifact is not keep and now - artifact.last_used >= EVICTION_GRACE_SECONDS
+
+        for artifact in list(artifacts.values()):
+            if artifact.key[:2] == keep.key[:2] and evictable(artifact):
+                self._remove(artifact)
+
+        total = sum(artifact.size for artifact in artifacts.values())
+        for artifact in list(artifacts.values()):
+            if total <= self.max_bytes:
+                break
+            if evictable(artifact):
+                total -= artifact.size
+                self._remove(artifact)
+
+    def _remove(self, artifact: ExportArtifact) -> None:
+        self._index().pop(artifact.key, None)
+        try:
+            artifact.path.unlink(missing_ok=True)
+        except OSError as e:
+            # 文件仍在传输等情况下无法删除，下次淘汰时重试
+            self._pending_deletes.add(artifact.path)
+            logger.warning("ExportArtifactCache delete deferred, key: %s, error: %s", artifact.key, e)
+            return
+        logger.info("ExportArtifactCache evicted, key: %s, bytes: %d", artifact.key, artifact.size)
+
+    def _retry_deletes(self) -> None:
+        """重试删除此前删除失败的文件"""
+        for path in list(self._pending_deletes):
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                continue
+            self._pending_deletes.discard(path)
+            logger.info("ExportArtifactCache deferred delete completed, path: %s", path.name)
+
+
+# 全局导出文件缓存
+export_cache = ExportArtifactCache(settings.export.cache_dir, settings.export.cache_max_bytes)
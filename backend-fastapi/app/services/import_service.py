@@ -0,0 +1,336 @@
+"""
+题目批量导入服务模块
+实现真题、模拟题的批量导入：解析 → 逐行校验 → 单次查询查重 → 近似重复标注 → 分批 executemany 写入
+
+与逐条调用创建接口相比，整批导入只做一次查重查询和一次科目校验查询，
+写入按 IMPORT_CHUNK_SIZE 分批执行（每批一个 SAVEPOINT，单批失败不影响其他批次），
+统计表按整批差值一次性更新。
+"""
+import json
+import re
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import and_, insert, or_, tuple_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import select, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.near_duplicates import NearDuplicateIndex, exam_near_duplicates, mock_near_duplicates
+from app.exception import ValidationException
+from app.models.entities import ExamQuestion, MockQuestion, Subject
+from app.models.enums import QuestionTypeEnum, DifficultyEnum
+from app.schemas.common import ImportReportResponse, ImportRowResult
+from app.schemas.exam import ExamCreateRequest, ExamImportRequest
+from app.schemas.mock import MockCreateRequest, MockImportRequest
+from app.services.near_duplicate_service import NearDuplicateService
+from app.services.stats_service import StatsService, exam_stat_keys, mock_stat_keys, mock_catalog_keys
+from app.utils.logger import setup_logger
+from app.utils.question_parser import ParsedRow, SECTION_KEY, parse_jsonl, parse_markdown_paper
+
+
+# 获取服务日志记录器
+logger = setup_logger(__name__)
+
+# 每批写入的行数
+IMPORT_CHUNK_SIZE = 200
+
+# 单次导入的最大题目数
+MAX_IMPORT_ROWS = 5000
+
+_QUESTION_TYPES = {e.value for e in QuestionTypeEnum}
+_DIFFICULTIES = {e.value for e in DifficultyEnum}
+_YEAR_PATTERN = re.compile(r"(\d{4})")
+
+
+class _ValidRow:
+    """通过校验、等待查重与写入的行"""
+
+    __slots__ = ("result", "request", "key")
+
+    def __init__(self, result: ImportRowResult, request: BaseModel, key: tuple):
+        self.result = result
+        self.request = request
+        self.key = key
+
+
+async def _apply_mock_stats(stats: StatsService, items: List[BaseModel]) -> None:
+    """导入模拟题后累加 mock_stat 与 mock_catalog 计数"""
+    await stats.apply_mock_delta(Counter(key for item in items for key in mock_stat_keys(item)))
+    await stats.apply_mock_catalog_delta(Counter(key for item in items for key in mock_catalog_keys(item)))
+
+
+class QuestionImportService:
+    """题目批量导入服务类"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def import_exams(self, request: ExamImportRequest, author_id: int) -> ImportReportResponse:
+        """
+        批量导入真题
+
+        查重键为 (year, question_number)，题号为空时按 IS NULL 匹配（与单条创建时的查重一致）。
+        Markdown 中的二级标题（如 “## 2024年”）作为年份。
+
+        Args:
+            request: 导入请求
+            author_id: 作者ID
+
+        Returns:
+            导入报告
+
+        Raises:
+            ValidationException: 内容为空或题目数超出上限
+        """
+        logger.info("QuestionImportService.import_exams started, format: %s, dry_run: %s",
+                    request.format, request.dry_run)
+
+        def section_fields(section: str) -> Dict[str, Any]:
+            match = _YEAR_PATTERN.search(section)
+            return {"year": int(match.group(1))} if match else {}
+
+        report = await self._import(
+            request.format, request.content, request.dry_run, author_id,
+            defaults={"year": request.year, "subject_id": request.subject_id},
+            section_fields=section_fields,
+            schema=ExamCreateRequest,
+            model=ExamQuestion,
+            key_fields=("year", "question_number"),
+            near_duplicates=exam_near_duplicates,
+            apply_stats=lambda stats, items: stats.apply_exam_delta(
+                Counter(key for item in items for key in exam_stat_keys(item))
+            )
+        )
+        logger.info("QuestionImportService.import_exams completed, created: %d, duplicates: %d, invalid: %d, failed: %d",
+                    report.created, report.duplicates, report.invalid, report.failed)
+        return report
+
+    async def import_mocks(self, request: MockImportRequest, author_id: int) -> ImportReportResponse:
+        """
+        批量导入模拟题
+
+        查重键为 (source, title, question_number)，为空的字段按 IS NULL 匹配（与单条创建时的查重一致，如无标题的模拟题）。
+        Markdown 中的二级标题作为试卷标题。
+
+        Args:
+            request: 导入请求
+            author_id: 作者ID
+
+        Returns:
+            导入报告
+
+        Raises:
+            ValidationException: 内容为空或题目数超出上限
+        """
+        logger.info("QuestionImportService.import_mocks started, format: %s, dry_run: %s",
+                    request.format, request.dry_run)
+        report = await self._import(
+            request.format, request.content, request.dry_run, author_id,
+            defaults={"source": request.source, "title": request.title, "subject_id": request.subject_id},
+            section_fields=lambda section: {"title": section},
+            schema=MockCreateRequest,
+            model=MockQuestion,
+            key_fields=("source", "title", "question_number"),
+            near_duplicates=mock_near_duplicates,
+            apply_stats=_apply_mock_stats
+        )
+        logger.info("QuestionImportService.import_mocks completed, created: %d, duplicates: %d, invalid: %d, failed: %d",
+                    report.created, report.duplicates, report.invalid, report.failed)
+        return report
+
+    async def _import(
+        self,
+        format: str,
+        content: str,
+        dry_run: bool,
+        author_id: int,
+        defaults: Dict[str, Any],
+        section_fields: Callable[[str], Dict[str, Any]],
+        schema: Type[BaseModel],
+        model: Type[SQLModel],
+        key_fields: Tuple[str, ...],
+        near_duplicates: NearDuplicateIndex,
+        apply_stats: Callable[[StatsService, List[BaseModel]], Any]
+    ) -> ImportReportResponse:
+        """导入流程（真题与模拟题共用）"""
+        parsed = parse_markdown_paper(content) if format == "markdown" else parse_jsonl(content)
+        if not parsed:
+            raise ValidationException("导入内容中没有可识别的题目")
+        if len(parsed) > MAX_IMPORT_ROWS:
+            raise ValidationException(f"单次最多导入 {MAX_IMPORT_ROWS} 道题目，当前 {len(parsed)} 道")
+
+        results: List[ImportRowResult] = []
+        candidates: List[_ValidRow] = []
+        for item in parsed:
+            result = ImportRowResult(row=item.row, status="invalid")
+            results.append(result)
+            if item.error:
+                result.message = item.error
+                continue
+            request, error = self._validate(item, defaults, section_fields, schema)
+            if error:
+                result.message = error
+                continue
+            result.status = "valid"
+            key = tuple(getattr(request, f) for f in key_fields)
+            candidates.append(_ValidRow(result, request, key))
+
+        await self._check_subjects(candidates)
+        await self._mark_duplicates(candidates, model, key_fields)
+        # 内容近似的题目只做提示，不阻止导入
+        await NearDuplicateService(self.session).annotate_import_rows(
+            near_duplicates, [c for c in candidates if c.result.status == "valid"]
+        )
+
+        if not dry_run:
+            pending = [c for c in candidates if c.result.status == "valid"]
+            await self._insert(pending, model, author_id, apply_stats)
+
+        counts = Counter(r.status for r in results)
+        return ImportReportResponse(
+            dry_run=dry_run,
+            total=len(results),
+            created=counts["valid"] if dry_run else counts["created"],
+            duplicates=counts["duplicate"],
+            invalid=counts["invalid"],
+            failed=counts["failed"],
+            rows=results
+        )
+
+    @staticmethod
+    def _validate(
+        item: ParsedRow,
+        defaults: Dict[str, Any],
+        section_fields: Callable[[str], Dict[str, Any]],
+        schema: Type[BaseModel]
+    ) -> Tuple[Optional[BaseModel], Optional[str]]:
+        """补全默认值、规范化字段并校验，返回 (请求对象, 错误信息)"""
+        data = {k: v for k, v in defaults.items() if v is not None}
+        section = item.data.get(SECTION_KEY)
+        if section:
+            data.update(section_fields(section))
+        data.update({k: v for k, v in item.data.items() if k != SECTION_KEY})
+
+        # 分类、选项允许直接给出数组/对象，统一存为 JSON 字符串
+        category = data.get("category")
+        if isinstance(category, list):
+            data["category"] = json.dumps(category, ensure_ascii=False)
+        elif isinstance(category, str) and category:
+            try:
+                if not isinstance(json.loads(category), list):
+                    raise ValueError
+            except ValueError:
+                return None, "category: 分类必须是 JSON 数组"
+        options = data.get("options")
+        if isinstance(options, (dict, list)):
+            data["options"] = json.dumps(options, ensure_ascii=False)
+        elif isinstance(options, str) and options:
+            try:
+                json.loads(options)
+            except ValueError:
+                return None, "options: 选项必须是合法的 JSON"
+
+        try:
+            request = schema(**data)
+        except ValidationError as e:
+            return None, "; ".join(
+                f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+            )
+        if request.question_type not in _QUESTION_TYPES:
+            return None, f"question_type: 题型必须为 {'/'.join(sorted(_QUESTION_TYPES))}"
+        if request.difficulty is not None and request.difficulty not in _DIFFICULTIES:
+            return None, f"difficulty: 难度必须为 {'/'.join(sorted(_DIFFICULTIES))}"
+        return request, None
+
+    async def _check_subjects(self, candidates: List[_ValidRow]) -> None:
+        """一次查询校验全部科目ID是否存在"""
+        subject_ids = {c.request.subject_id for c in candidates if c.request.subject_id is not None}
+        if not subject_ids:
+            return
+        result = await self.session.exec(select(Subject.id).where(Subject.id.in_(subject_ids)))
+        existing = set(result.all())
+        for c in candidates:
+            if c.request.subject_id is not None and c.request.subject_id not in existing:
+                c.result.status = "invalid"
+                c.result.message = f"subject_id: 科目不存在：ID={c.request.subject_id}"
+
+    async def _mark_duplicates(
+        self,
+        candidates: List[_ValidRow],
+        model: Type[SQLModel],
+        key_fields: Tuple[str, ...]
+    ) -> None:
+        """
+        标记与数据库已有题目或与本批前面行重复的题目（数据库查重只执行一次查询）
+
+        键中为 None 的字段按 IS NULL 匹配（与单条创建时的查重一致，如无标题的模拟题）。
+        """
+        keys = {c.key for c in candidates if c.result.status == "valid"}
+        existing: Dict[tuple, int] = {}
+        if keys:
+            columns = [getattr(model, f) for f in key_fields]
+            # 按为 None 的字段位置分组：这些字段用 IS NULL，其余字段用 (a, b) IN (...)
+            groups: Dict[Tuple[int, ...], List[tuple]] = {}
+            for key in keys:
+                null_positions = tuple(i for i, value in enumerate(key) if value is None)
+                groups.setdefault(null_positions, []).append(key)
+            conditions = []
+            for null_positions, group_keys in groups.items():
+                present = [i for i in range(len(columns)) if i not in null_positions]
+                clauses = [columns[i].is_(None) for i in null_positions]
+                if present:
+                    clauses.append(tuple_(*(columns[i] for i in present)).in_(
+                        [tuple(key[i] for i in present) for key in group_keys]
+                    ))
+                conditions.append(and_(*clauses))
+            stmt = select(model.id, *columns).where(or_(*conditions))
+            result = await self.session.exec(stmt)
+            for row in result.all():
+                existing.setdefault(tuple(row[1:]), row[0])
+
+        first_rows: Dict[tuple, int] = {}
+        for c in candidates:
+            if c.result.status != "valid":
+                continue
+            if c.key in existing:
+                c.result.status = "duplicate"
+                c.result.message = f"与已有题目重复：ID={existing[c.key]}"
+            elif c.key in first_rows:
+                c.result.status = "duplicate"
+                c.result.message = f"与第 {first_rows[c.key]} 行重复"
+            else:
+                first_rows[c.key] = c.result.row
+
+    async def _insert(
+        self,
+        rows: List[_ValidRow],
+        model: Type[SQLModel],
+        author_id: int,
+        apply_stats: Callable[[StatsService, List[BaseModel]], Any]
+    ) -> None:
+        """分批 executemany 写入，每批一个 SAVEPOINT"""
+        stats = StatsService(self.session)
+        stmt = insert(model).returning(model.id, sort_by_parameter_order=True)
+        now = datetime.utcnow()
+        for start in range(0, len(rows), IMPORT_CHUNK_SIZE):
+            chunk = rows[start:start + IMPORT_CHUNK_SIZE]
+            params = [
+                {**c.request.model_dump(), "author_id": author_id, "create_time": now, "update_time": now}
+                for c in chunk
+            ]
+            try:
+                async with self.session.begin_nested():
+                    result = await self.session.execute(stmt, params)
+                    ids: Sequence[Optional[int]] = result.scalars().all()
+                    await apply_stats(stats, [c.request for c in chunk])
+            except SQLAlchemyError as e:
+                logger.warning("QuestionImportService._insert: chunk starting at row %d failed: %s",
+                               chunk[0].result.row, e)
+                for c in chunk:
+                    c.result.status = "failed"
+                    c.result.message = f"写入失败：{getattr(e, 'orig', e)}"
+                continue
+            for c, new_id in zip(chunk, ids):
+                c.result.status = "created"
+                c.result.id = new_id
@@ -0,0 +1,226 @@
+"""
+知识点服务模块
+实现知识点CRUD、按章节查询
+
+浏览次数由 knowledge_view_counter 在内存中累加、定期批量写回（app.core.view_counter），
+查询详情不会开启写事务；返回的浏览次数为数据库计数与未写回计数之和。
+"""
+from datetime import datetime
+from typing import List, Optional
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.config.settings import settings
+from app.core.view_counter import ViewCounter
+from app.exception import NotFoundException
+from app.models.entities import Chapter, KnowledgePoint, User
+from app.schemas.knowledge import (
+    KnowledgePointCreateRequest,
+    KnowledgePointUpdateRequest,
+    KnowledgePointListItem,
+    KnowledgePointResponse
+)
+from app.utils.logger import setup_logger
+
+
+# 获取服务日志记录器
+logger = setup_logger(__name__)
+
+# 知识点浏览次数累加器（由应用生命周期启动与停止）
+knowledge_view_counter = ViewCounter(
+    KnowledgePoint.__table__,
+    column="view_count",
+    interval=settings.knowledge.view_flush_interval
+)
+
+
+class KnowledgeService:
+    """知识点服务类"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def list_by_chapter(self, chapter_id: int) -> List[KnowledgePointListItem]:
+        """
+        查询章节下的知识点列表（不含正文）
+
+        Args:
+            chapter_id: 章节ID
+
+        Returns:
+            知识点列表（按ID升序）
+
+        Raises:
+            NotFoundException: 章节不存在
+        """
+        logger.info("KnowledgeService.list_by_chapter started, chapter_id: %d", chapter_id)
+        await self._ensure_chapter(chapter_id)
+
+        stmt = (
+            select(
+                KnowledgePoint.id,
+                KnowledgePoint.title,
+                KnowledgePoint.category,
+                KnowledgePoint.chapter_id,
+                KnowledgePoint.view_count,
+                KnowledgePoint.update_time
+            )
+            .where(KnowledgePoint.chapter_id == chapter_id)
+            .order_by(KnowledgePoint.id)
+        )
+        result = await self.session.exec(stmt)
+        items = [
+            KnowledgePointListItem(
+                id=row.id,
+                title=row.title,
+                category=row.category,
+                chapter_id=row.chapter_id,
+                view_count=(row.view_count or 0) + knowledge_view_counter.pending(row.id),
+                update_time=row.update_time.isoformat() if row.update_time else None
+            )
+            for row in result.all()
+        ]
+
+        logger.info("KnowledgeService.list_by_chapter completed, chapter_id: %d, count: %d",
+                    chapter_id, len(items))
+        return items
+
+    async def get_by_id(self, point_id: int, record_view: bool = False) -> KnowledgePointResponse:
+        """
+        按ID查询知识点详情
+
+        Args:
+            point_id: 知识点ID
+            record_view: 是否计入一次浏览（只写内存，定期写回）
+
+        Returns:
+            知识点详情
+
+        Raises:
+            NotFoundException: 知识点不存在
+        """
+        logger.info("KnowledgeService.get_by_id started, point_id: %d", point_id)
+        point = await self._get_entity(point_id)
+        if record_view:
+            knowledge_view_counter.record(point_id)
+
+        logger.info("KnowledgeService.get_by_id completed, point_id: %d", point_id)
+        return await self._to_response(point)
+
+    async def create(self, request: KnowledgePointCreateRequest, author_id: int) -> KnowledgePointResponse:
+        """
+        创建知识点
+
+        Args:
+            request: 创建请求
+            author_id: 作者ID
+
+        Returns:
+            创建的知识点
+
+        Raises:
+            NotFoundException: 章节不存在
+        """
+        logger.info("KnowledgeService.create started, title: %s, chapter_id: %s",
+                    request.title, request.chapter_id)
+        if request.chapter_id is not None:
+            await self._ensure_chapter(request.chapter_id)
+
+        point = KnowledgePoint(
+            title=request.title,
+            category=request.category,
+            chapter_id=request.chapter_id,
+            content=request.content,
+            author_id=author_id
+        )
+        self.session.add(point)
+        await self.session.flush()
+        await self.session.refresh(point)
+
+        logger.info("KnowledgeService.create completed, point_id: %d", point.id)
+        return await self._to_response(point)
+
+    async def update(self, point_id: int, request: KnowledgePointUpdateRequest) -> KnowledgePointResponse:
+        """
+        更新知识点
+
+        Args:
+            point_id: 知识点ID
+            request: 更新请求
+
+        Returns:
+            更新后的知识点
+
+        Raises:
+            NotFoundException: 知识点或章节不存在
+        """
+        logger.info("KnowledgeService.update started, point_id: %d", point_id)
+        point = await self._get_entity(point_id)
+
+        update_data = request.model_dump(exclude_unset=True)
+        if update_data.get("chapter_id") is not None:
+            await self._ensure_chapter(update_data["chapter_id"])
+        for field, value in update_data.items():
+            setattr(point, field, value)
+        point.update_time = datetime.utcnow()
+
+        await self.session.flush()
+        await self.session.refresh(point)
+
+        logger.info("KnowledgeService.update completed, point_id: %d", point_id)
+        return await self._to_response(point)
+
+    async def delete(self, point_id: int) -> None:
+        """
+        删除知识点
+
+        Args:
+            point_id: 知识点ID
+
+        Raises:
+            NotFoundException: 知识点不存在
+        """
+        logger.info("KnowledgeService.delete started, point_id: %d", point_id)
+        point = await self._get_entity(point_id)
+        await self.session.delete(point)
+        knowledge_view_counter.discard(point_id)
+        logger.info("KnowledgeService.delete completed, point_id: %d", point_id)
+
+    async def _get_entity(self, point_id: int) -> KnowledgePoint:
+        result = await self.session.exec(select(KnowledgePoint).where(KnowledgePoint.id == point_id))
+        point = result.first()
+        if point is None:
+            logger.warning("KnowledgeService: knowledge point not found, id: %d", point_id)
+            raise NotFoundException(f"知识点不存在：ID={point_id}")
+        return point
+
+    async def _ensure_chapter(self, chapter_id: int) -> None:
+        result = await self.session.exec(select(Chapter.id).where(Chapter.id == chapter_id))
+        if result.first() is None:
+            logger.warning("KnowledgeService: chapter not found, id: %d", chapter_id)
+            raise NotFoundException(f"章节不存在：ID={chapter_id}")
+
+    async def _to_response(self, point: KnowledgePoint) -> KnowledgePointResponse:
+        """将实体转换为响应对象"""
+        chapter_name: Optional[str] = None
+        if point.chapter_id:
+            result = await self.session.exec(select(Chapter.name).where(Chapter.id == point.chapter_id))
+            chapter_name = result.first()
+
+        author_name: Optional[str] = None
+        if point.author_id:
+            result = await self.session.exec(select(User.username).where(User.id == point.author_id))
+            author_name = result.first()
+
+        return KnowledgePointResponse(
+            id=point.id,
+            title=point.title,
+            category=point.category,
+            chapter_id=point.chapter_id,
+            chapter_name=chapter_name,
+            content=point.content,
+            author_id=point.author_id,
+            author_name=author_name,
+            view_count=(point.view_count or 0) + knowledge_view_counter.pending(point.id),
+            create_time=point.create_time.isoformat() if point.create_time else None,
+            update_time=point.update_time.isoformat() if point.update_time else None
+        )
@@ -2,10 +2,10 @@
 模拟题管理服务模块
 实现模拟题CRUD、查询、统计业务逻辑
 """
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlmodel import select, func, and_, or_, text
 from sqlmodel.ext.asyncio.session import AsyncSession
-from app.models.entities import MockQuestion, Subject, User
+from app.models.entities import MockCatalog, MockQuestion, MockStat, Subject, User
 from app.exception import NotFoundException, ConflictException
 from app.schemas.mock import (
     MockQueryParams,
@@ -21,11 +21,22 @@ from app.schemas.mock import (
     PaginatedMockResponse
 )
 from app.utils.logger import setup_logger
+from app.utils.pagination import raw_sort_key, encode_cursor, decode_cursor, keyset_condition
+from app.core.cache import VersionedCache
+from app.core.near_duplicates import mock_near_duplicates
+from app.services.stats_service import StatsService, mock_stat_keys, mock_catalog_keys, ALL_CATEGORIES
+from app.services.near_duplicate_service import NearDuplicateService
 
 
 # 获取服务日志记录器
 logger = setup_logger(__name__)
 
+# 分页总数缓存（mock_question 表写入后失效）
+_count_cache = VersionedCache(tables=(MockQuestion.__tablename__,), max_size=512)
+
+# estimated 模式下关键词搜索的统计上限
+ESTIMATED_TOTAL_CAP = 1000
+
 
 class MockService:
     """模拟题服务类"""
@@ -46,39 +57,63 @@ class MockService:
         Returns:
             分页结果
         """
-        logger.info("MockService.get_paginated started, page: %d, page_size: %d, source: %s, subject_id: %s",
-                    params.page, params.page_size, params.source, params.subject_id)
+        logger.info("MockService.get_paginated started, page: %d, page_size: %d, source: %s, subject_id: %s, cursor: %s",
+                    params.page, params.page_size, params.source, params.subject_id, bool(params.cursor))
 
         # 构建查询条件
         conditions = self._build_query_conditions(params)
 
-        # 查询总数
-        count_stmt = select(func.count()).select_from(MockQuestion).where(*conditions)
-        count_result = await self.session.exec(count_stmt)
-        total = count_result.first() or 0
+        # 查询总数（with_total=false 时跳过，供无限滚动场景使用）
+        total = None
+        total_estimated = False
+        if params.with_total:
+            total, total_estimated = await self._count_total(params, conditions)
+
+        # 排序键 + id 作为稳定排序，游标模式下以 keyset 条件代替 OFFSET
+        sort_column = raw_sort_key(self._get_order_column(params.sort_field))
+        descending = params.sort_order != "asc"
+        if params.cursor:
+            cursor_value, cursor_id = decode_cursor(params.cursor, params.sort_field, params.sort_order)
+            conditions.append(keyset_condition(sort_column, MockQuestion.id, cursor_value, cursor_id, descending))
+            offset = 0
+        else:
+            offset = (params.page - 1) * params.page_size
 
-        # 查询数据
-        offset = (params.page - 1) * params.page_size
-        order_column = self._get_order_column(params.sort_field)
-        if params.sort_order == "asc":
-            order_column = order_column.asc()
+        if descending:
+            order_by = (sort_column.desc(), MockQuestion.id.desc())
         else:
-            order_column = order_column.desc()
+            order_by = (sort_column.asc(), MockQuestion.id.asc())
 
-        stmt = select(MockQuestion).where(*conditions).order_by(order_column).offset(offset).limit(params.page_size)
+        # 多取一行用于判断是否还有下一页
+        stmt = (
+            select(MockQuestion, sort_column.label("sort_key"))
+            .where(*conditions)
+            .order_by(*order_by)
+            .offset(offset)
+            .limit(params.page_size + 1)
+        )
         result = await self.session.exec(stmt)
-        questions = result.all()
+        rows = result.all()
+        has_more = len(rows) > params.page_size
+        rows = rows[:params.page_size]
+
+        next_cursor = None
+        if has_more:
+            last_question, last_sort_key = rows[-1]
+            next_cursor = encode_cursor(params.sort_field, params.sort_order, last_sort_key, last_question.id)
 
         # 转换为响应对象
-        data_list = [await self._to_response(q) for q in questions]
+        data_list = [await self._to_response(q) for q, _ in rows]
 
-        logger.info("MockService.get_paginated completed, total: %d", total)
+        logger.info("MockService.get_paginated completed, total: %s, count: %d", total, len(data_list))
 
         return PaginatedMockResponse(
             data=data_list,
             total=total,
             page=params.page,
-            page_size=params.page_size
+            page_size=params.page_size,
+            next_cursor=next_cursor,
+            total_estimated=total_estimated
         )
 
     def _build_query_conditions(self, params: MockQueryParams) -> List:
@@ -119,6 +154,50 @@ class MockService:
 
         return conditions
 
+    async def _count_total(
+        self,
+        params: MockQueryParams,
+        conditions: List
+    ) -> Tuple[int, bool]:
+        """
+        统计分页总数
+
+        结果按规范化后的筛选条件缓存，mock_question 表有写入提交后自动失效，
+        翻页时只需统计一次。estimated 模式下关键词搜索只统计到上限为止。
+
+        Args:
+            params: 查询参数
+            conditions: 查询条件列表（不含游标条件）
+
+        Returns:
+            (总数, 是否为封顶估计值)
+        """
+        estimated = params.total_mode == "estimated" and bool(params.keyword)
+        cache_key = (self._filter_key(params), estimated)
+        cached = _count_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        version = _count_cache.current_version()
+        if estimated:
+            # 关键词 LIKE 无法使用索引，找到足够多的匹配行即停止扫描
+            capped = select(MockQuestion.id).where(*conditions).limit(ESTIMATED_TOTAL_CAP).subquery()
+            count_stmt = select(func.count()).select_from(capped)
+        else:
+            count_stmt = select(func.count(MockQuestion.id)).select_from(MockQuestion).where(*conditions)
+        count_result = await self.session.exec(count_stmt)
+        total = count_result.first() or 0
+
+        value = (total, estimated and total >= ESTIMATED_TOTAL_CAP)
+        _count_cache.set(cache_key, value, version)
+        return value
+
+    def _filter_key(self, params: MockQueryParams) -> Tuple:
+        """将筛选条件规范化为缓存键（与 _build_query_conditions 的语义保持一致）"""
+        keyword = params.keyword or None
+        category = params.category if params.no_category is not True else None
+        return (params.source, params.subject_id, params.no_category is True, category, keyword)
+
     def _get_order_column(self, sort_field: str):
         """获取排序字段"""
         field_map = {
@@ -212,25 +291,18 @@ class MockService:
         Returns:
             来源统计列表
         """
-        conditions = [MockQuestion.source.isnot(None)]
-
-        if category:
-            pattern = f'%"{category}"%'
-            conditions.append(
-                and_(
-                    MockQuestion.category.isnot(None),
-                    MockQuestion.category.like(pattern)
-                )
-            )
+        stat_category = category if category else ALL_CATEGORIES
 
+        # 读取统计表（按 category, source 索引）
+        total = func.sum(MockStat.count)
         stmt = (
             select(
-                MockQuestion.source,
-                func.count().label("count")
+                MockStat.source,
+                total.label("count")
             )
-            .where(*conditions)
-            .group_by(MockQuestion.source)
-            .order_by(func.count().desc())
+            .where(MockStat.category == stat_category)
+            .group_by(MockStat.source)
+            .order_by(total.desc())
         )
 
         result = await self.session.exec(stmt)
@@ -249,13 +321,14 @@ class MockService:
         Returns:
             来源列表
         """
+        # 读取模拟题目录（每个来源、试卷一行，行数远小于题目数）
         stmt = (
             select(
-                MockQuestion.source,
-                func.count().label("question_count")
+                MockCatalog.source,
+                func.sum(MockCatalog.count).label("question_count")
             )
-            .group_by(MockQuestion.source)
-            .order_by(MockQuestion.source)
+            .group_by(MockCatalog.source)
+            .order_by(MockCatalog.source)
         )
         result = await self.session.exec(stmt)
         rows = result.all()
@@ -280,37 +353,29 @@ class MockService:
         Returns:
             分类统计结果
         """
-        conditions = [
-            MockQuestion.subject_id == subject_id,
-            MockQuestion.category.isnot(None)
-        ]
-
-        # 先查询所有符合条件的记录
-        stmt = select(MockQuestion).where(*conditions)
+        # 读取统计表（分类已在写入时展开）
+        stmt = (
+            select(
+                MockStat.category,
+                func.sum(MockStat.count).label("count")
+            )
+            .where(MockStat.subject_id == subject_id, MockStat.category != ALL_CATEGORIES)
+            .group_by(MockStat.category)
+            .order_by(MockStat.category)
+        )
         result = await self.session.exec(stmt)
-        questions = result.all()
-
-        # 内存中展开JSON数组进行统计
-        category_counts: dict[str, int] = {}
-        question_ids = set()  # 用于去重统计实际题目数
-        for q in questions:
-            question_ids.add(q.id)
-            if q.category:
-                import json
-                try:
-                    categories = json.loads(q.category)
-                    if isinstance(categories, list):
-                        for cat in categories:
-                            category_counts[cat] = category_counts.get(cat, 0) + 1
-                except json.JSONDecodeError:
-                    continue
-
-        # 转换为响应列表
         stats_items = [
-            MockCategoryStatItem(category=cat, count=count)
-            for cat, count in sorted(category_counts.items())
+            MockCategoryStatItem(category=row.category, count=row.count)
+            for row in result.all()
         ]
 
+        # 有分类字段的题目数
+        count_stmt = select(func.count()).select_from(MockQuestion).where(
+            MockQuestion.subject_id == subject_id,
+            MockQuestion.category.isnot(None)
+        )
+        total_count = (await self.session.exec(count_stmt)).one()
+
         # 获取科目信息
         subject_name = None
         subj_result = await self.session.exec(
@@ -324,7 +389,7 @@ class MockService:
             subject_id=subject_id,
             subject_name=subject_name,
             stats=stats_items,
-            total_count=len(question_ids)  # 去重后的实际题目数
+            total_count=total_count
         )
 
     async def create(
@@ -373,10 +438,19 @@ class MockService:
             author_id=author_id
         )
         self.session.add(question)
+        await self.session.flush()
         await self.session.refresh(question)
+        await StatsService(self.session).apply_mock_change([], [], question)
 
-        logger.info("MockService.create completed, question_id: %d", question.id)
-        return await self._to_response(question)
+        response = await self._to_response(question)
+        # 内容近似的已有题目只做提示，不阻止创建
+        response.near_duplicates = await NearDuplicateService(self.session).find_for_question(
+            mock_near_duplicates, question.content, question.options, exclude_id=question.id
+        )
+
+        logger.info("MockService.create completed, question_id: %d, near_duplicates: %d",
+                    question.id, len(response.near_duplicates))
+        return response
 
     async def update(
         self,
@@ -426,11 +500,15 @@ class MockService:
                 raise ConflictException("相同来源、标题和题号的模拟题已存在")
 
         # 更新字段
+        old_stat_keys = mock_stat_keys(question)
+        old_catalog_keys = mock_catalog_keys(question)
         update_data = request.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(question, field, value)
 
+        await self.session.flush()
         await self.session.refresh(question)
+        await StatsService(self.session).apply_mock_change(old_stat_keys, old_catalog_keys, question)
 
         logger.info("MockService.update completed, question_id: %d", question_id)
         return await self._to_response(question)
@@ -457,7 +535,10 @@ class MockService:
             raise NotFoundException(f"模拟题不存在：ID={question_id}")
 
         # 删除
+        old_stat_keys = mock_stat_keys(question)
+        old_catalog_keys = mock_catalog_keys(question)
         await self.session.delete(question)
+        await StatsService(self.session).apply_mock_change(old_stat_keys, old_catalog_keys, None)
 
         logger.info("MockService.delete completed, question_id: %d", question_id)
 
@@ -586,14 +667,20 @@ class MockService:
         Returns:
             各科目的模拟题数量统计列表
         """
+        # 各科目汇总行（category 为空字符串）
+        counts = (
+            select(MockStat.subject_id, func.sum(MockStat.count).label("count"))
+            .where(MockStat.category == ALL_CATEGORIES)
+            .group_by(MockStat.subject_id)
+            .subquery()
+        )
         stmt = (
             select(
                 Subject.id,
                 Subject.name,
-                func.count(MockQuestion.id).label("count")
+                counts.c.count
             )
-            .outerjoin(MockQuestion, MockQuestion.subject_id == Subject.id)
-            .group_by(Subject.id, Subject.name)
+            .outerjoin(counts, counts.c.subject_id == Subject.id)
             .order_by(Subject.name)
         )
         result = await self.session.exec(stmt)
@@ -618,18 +705,14 @@ class MockService:
         Returns:
             标题列表（去重、排序）
         """
+        # 读取模拟题目录（按 (source, title) 主键范围扫描）
         stmt = (
-            select(MockQuestion.title)
+            select(MockCatalog.title)
             .where(
-                and_(
-                    MockQuestion.source == source,
-                    MockQuestion.title.isnot(None)
-                )
+                MockCatalog.source == source,
+                MockCatalog.title != ""
             )
-            .distinct()
-            .order_by(MockQuestion.title)
+            .order_by(MockCatalog.title)
         )
         result = await self.session.exec(stmt)
-        titles = result.all()
-
-        return [t[0] for t in titles if t[0]]
+        return list(result.all())
@@ -0,0 +1,199 @@
+"""
+近似重复题目检测服务模块
+基于 MinHash/LSH 索引（app.core.near_duplicates）提供：
+    - 按题目文本查找近似重复的已有题目（创建、导入前的提示）
+    - 整个题库的近似重复报告（两两相似的题目按连通关系合并为分组）
+"""
+from typing import Dict, List, Optional
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.near_duplicates import (
+    DEFAULT_THRESHOLD,
+    MinHashLSH,
+    NearDuplicateIndex,
+    exam_near_duplicates,
+    minhash_signature,
+    mock_near_duplicates,
+    question_text
+)
+from app.schemas.common import (
+    NearDuplicateCandidate,
+    NearDuplicateCheckRequest,
+    NearDuplicateGroup,
+    NearDuplicateReportResponse
+)
+from app.utils.logger import setup_logger
+
+
+# 获取服务日志记录器
+logger = setup_logger(__name__)
+
+# 每道题最多返回的候选数
+MAX_CANDIDATES = 10
+
+
+class NearDuplicateService:
+    """近似重复题目检测服务类"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def check_exam(self, request: NearDuplicateCheckRequest) -> List[NearDuplicateCandidate]:
+        """
+        查找与给定内容近似重复的真题
+
+        Args:
+            request: 检查请求
+
+        Returns:
+            候选列表（按相似度降序）
+        """
+        return await self._check(exam_near_duplicates, request)
+
+    async def check_mock(self, request: NearDuplicateCheckRequest) -> List[NearDuplicateCandidate]:
+        """
+        查找与给定内容近似重复的模拟题
+
+        Args:
+            request: 检查请求
+
+        Returns:
+            候选列表（按相似度降序）
+        """
+        return await self._check(mock_near_duplicates, request)
+
+    async def report_exams(self, threshold: float = DEFAULT_THRESHOLD) -> NearDuplicateReportResponse:
+        """
+        真题题库近似重复报告
+
+        Args:
+            threshold: 相似度阈值
+
+        Returns:
+            报告
+        """
+        return await self._report(exam_near_duplicates, threshold)
+
+    async def report_mocks(self, threshold: float = DEFAULT_THRESHOLD) -> NearDuplicateReportResponse:
+        """
+        模拟题题库近似重复报告
+
+        Args:
+            threshold: 相似度阈值
+
+        Returns:
+            报告
+        """
+        return await self._report(mock_near_duplicates, threshold)
+
+    async def find_for_question(
+        self,
+        index: NearDuplicateIndex,
+        content: Optional[str],
+        options: Optional[str],
+        exclude_id: Optional[int] = None
+    ) -> List[NearDuplicateCandidate]:
+        """
+        查找与一道题近似重复的已有题目（创建题目后调用）
+
+        Args:
+            index: 题库索引
+            content: 题目内容
+            options: 选项
+            exclude_id: 排除的题目ID
+
+        Returns:
+            候选列表（按相似度降序）
+        """
+        matches = await index.find(question_text(content, options), exclude_id=exclude_id)
+        return [
+            NearDuplicateCandidate(id=question_id, similarity=round(similarity, 4))
+            for question_id, similarity in matches[:MAX_CANDIDATES]
+        ]
+
+    async def annotate_import_rows(self, index: NearDuplicateIndex, rows: List) -> None:
+        """
+        为导入行标注近似重复候选：与已有题目比较，并与本批前面的行比较
+
+        Args:
+            index: 题库索引
+            rows: 通过校验的导入行（具有 result 与 request 属性）
+        """
+        await index.ensure_loaded()
+        batch = MinHashLSH()
+        flagged = 0
+        for item in rows:
+            signature = minhash_signature(question_text(item.request.content, item.request.options))
+            if signature is None:
+                continue
+            candidates = [
+                NearDuplicateCandidate(id=question_id, similarity=round(similarity, 4))
+                for question_id, similarity in index.lsh.query(signature)
+            ]
+            candidates.extend(
+                NearDuplicateCandidate(row=row, similarity=round(similarity, 4))
+                for row, similarity in batch.query(signature)
+            )
+            batch.add(item.result.row, signature)
+            if candidates:
+                candidates.sort(key=lambda c: -c.similarity)
+                item.result.near_duplicates = candidates[:MAX_CANDIDATES]
+                flagged += 1
+        logger.info("NearDuplicateService.annotate_import_rows completed, rows: %d, flagged: %d",
+                    len(rows), flagged)
+
+    async def _check(
+        self,
+        index: NearDuplicateIndex,
+        request: NearDuplicateCheckRequest
+    ) -> List[NearDuplicateCandidate]:
+        """检查流程（真题与模拟题共用）"""
+        matches = await index.find(
+            question_text(request.content, request.options),
+            threshold=request.threshold,
+            exclude_id=request.exclude_id
+        )
+        logger.info("NearDuplicateService.check completed, table: %s, matches: %d",
+                    index.model.__tablename__, len(matches))
+        return [
+            NearDuplicateCandidate(id=question_id, similarity=round(similarity, 4))
+            for question_id, similarity in matches[:MAX_CANDIDATES]
+        ]
+
+    async def _report(self, index: NearDuplicateIndex, threshold: float) -> NearDuplicateReportResponse:
+        """报告流程：LSH 候选对 → 相似度过滤 → 并查集合并为分组"""
+        await index.ensure_loaded()
+        pairs = index.lsh.similar_pairs(threshold)
+
+        parent: Dict[int, int] = {}
+
+        def find(x: int) -> int:
+            parent.setdefault(x, x)
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        best: Dict[int, float] = {}
+        for first, second, _ in pairs:
+            parent[find(first)] = find(second)
+        for first, _, similarity in pairs:
+            root = find(first)
+            best[root] = max(best.get(root, 0.0), similarity)
+
+        members: Dict[int, List[int]] = {}
+        for question_id in parent:
+            members.setdefault(find(question_id), []).append(question_id)
+        groups = [
+            NearDuplicateGroup(ids=sorted(ids), similarity=round(best[root], 4))
+            for root, ids in members.items()
+        ]
+        groups.sort(key=lambda g: (-g.similarity, g.ids[0]))
+
+        logger.info("NearDuplicateService.report completed, table: %s, total: %d, pairs: %d, groups: %d",
+                    index.model.__tablename__, len(index.lsh), len(pairs), len(groups))
+        return NearDuplicateReportResponse(
+            threshold=threshold,
+            total=len(index.lsh),
+            pair_count=len(pairs),
+            groups=groups
+        )
@@ -0,0 +1,149 @@
+"""
+题目内容预渲染服务模块
+为 rendered=html 请求附加题目内容、选项、答案的 HTML
+
+渲染结果按 (渲染器版本, 原文) 的摘要存入 render_cache 表，每段原文只渲染一次：
+    - 一次请求内的全部文本合并为 1 次缓存查询
+    - 未命中的文本合并为一个批次交给渲染进程池（Markdown 解析与净化为纯 CPU 计算，不占用事件循环）
+    - 渲染结果以 INSERT OR IGNORE 写入缓存表，并发请求重复渲染同一文本也不会冲突
+"""
+import asyncio
+import hashlib
+import json
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.config.settings import settings
+from app.models.entities import RenderCache
+from app.schemas.common import RenderedQuestionContent
+from app.utils.logger import setup_logger
+from app.utils.markdown_render import RENDERER_VERSION, render_markdown_batch
+
+
+# 获取服务日志记录器
+logger = setup_logger(__name__)
+
+# 单条 SQL 中的摘要数上限（避免超出 SQLite 变量数限制）
+_HASH_CHUNK_SIZE = 500
+
+_render_pool: Optional[Executor] = None
+
+
+def _get_render_pool() -> Optional[Executor]:
+    """渲染进程池（首次使用时创建；pool_workers=0 时返回 None，在默认线程池中渲染）"""
+    global _render_pool
+    if _render_pool is None and settings.render.pool_workers > 0:
+        # 使用 spawn 启动子进程，不继承事件循环与数据库连接
+        _render_pool = ProcessPoolExecutor(
+            max_workers=settings.render.pool_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _render_pool
+
+
+def shutdown_render_pool() -> None:
+    """关闭渲染进程池（应用关闭时调用）"""
+    global _render_pool
+    if _render_pool is not None:
+        _render_pool.shutdown(wait=False, cancel_futures=True)
+        _render_pool = None
+
+
+def content_hash(text: str) -> str:
+    """渲染缓存键：渲染器版本与原文的摘要"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"v{RENDERER_VERSION}\0".encode())
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class RenderService:
+    """题目内容预渲染服务类"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def render_many(self, texts: Iterable[str]) -> Dict[str, str]:
+        """
+        批量获取 Markdown 文本的 HTML（优先读取渲染缓存）
+
+        Args:
+            texts: Markdown 原文
+
+        Returns:
+            原文 -> HTML
+        """
+        by_hash: Dict[str, str] = {}
+        for text in texts:
+            if text:
+                by_hash.setdefault(content_hash(text), text)
+        if not by_hash:
+            return {}
+
+        rendered: Dict[str, str] = {}
+        hashes = list(by_hash)
+        for start in range(0, len(hashes), _HASH_CHUNK_SIZE):
+            chunk = hashes[start:start + _HASH_CHUNK_SIZE]
+            result = await self.session.exec(
+                select(RenderCache.content_hash, RenderCache.html).where(RenderCache.content_hash.in_(chunk))
+            )
+            for key, html in result.all():
+                rendered[by_hash[key]] = html
+
+        missing = [key for key in hashes if by_hash[key] not in rendered]
+        if missing:
+            sources = [by_hash[key] for key in missing]
+            loop = asyncio.get_running_loop()
+            htmls = await loop.run_in_executor(_get_render_pool(), render_markdown_batch, sources)
+            now = datetime.utcnow()
+            for start in range(0, len(missing), _HASH_CHUNK_SIZE):
+                stmt = sqlite_insert(RenderCache).values([
+                    {"content_hash": key, "html": html, "create_time": now}
+                    for key, html in zip(missing[start:start + _HASH_CHUNK_SIZE],
+                                         htmls[start:start + _HASH_CHUNK_SIZE])
+                ]).on_conflict_do_nothing(index_elements=["content_hash"])
+                await self.session.execute(stmt)
+            rendered.update(zip(sources, htmls))
+
+        logger.info("RenderService.render_many completed, texts: %d, rendered: %d",
+                    len(hashes), len(missing))
+        return rendered
+
+    async def attach(self, questions: List) -> None:
+        """
+        为题目响应附加预渲染的 HTML（rendered 字段）
+
+        Args:
+            questions: 题目响应列表（ExamResponse / MockResponse）
+        """
+        option_maps = [self._parse_options(q.options) for q in questions]
+        texts: List[str] = []
+        for question, options in zip(questions, option_maps):
+            texts.append(question.content)
+            texts.append(question.answer)
+            texts.extend(options.values())
+        rendered = await self.render_many(texts)
+
+        for question, options in zip(questions, option_maps):
+            question.rendered = RenderedQuestionContent(
+                content=rendered.get(question.content, "") if question.content is not None else None,
+                options={key: rendered.get(value, "") for key, value in options.items()} if options else None,
+                answer=rendered.get(question.answer, "") if question.answer is not None else None
+            )
+
+    @staticmethod
+    def _parse_options(raw: Optional[str]) -> Dict[str, str]:
+        """解析选项字段（JSON 对象字符串，无法解析时视为无选项）"""
+        if not raw:
+            return {}
+        try:
+            options = json.loads(raw)
+        except (TypeError, ValueError):
+            return {}
+        if not isinstance(options, dict):
+            return {}
+        return {str(key): value for key, value in options.items() if isinstance(value, str)}
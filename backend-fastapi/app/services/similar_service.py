@@ -0,0 +1,156 @@
+"""
+相似题目推荐服务模块
+基于真题与模拟题文本的 TF-IDF 矩阵（app.core.similarity）推荐内容相关的题目，
+如学生做完一道真题后推荐同一知识点的模拟题
+"""
+from typing import Dict, List, Optional, Tuple
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.near_duplicates import question_text
+from app.core.similarity import DocKey, SimilarityIndex
+from app.database.connection import get_session_context
+from app.exception import NotFoundException
+from app.models.entities import ExamQuestion, MockQuestion
+from app.schemas.common import SimilarQuestionItem
+from app.utils.logger import setup_logger
+
+
+# 获取服务日志记录器
+logger = setup_logger(__name__)
+
+# 题库 -> 实体
+_BANK_MODELS = {"exam": ExamQuestion, "mock": MockQuestion}
+_BANK_NAMES = {"exam": "真题", "mock": "模拟题"}
+
+
+def similarity_text(title: Optional[str], content: Optional[str], options: Optional[str]) -> str:
+    """参与相似度计算的题目文本：标题 + 题干 + 选项内容"""
+    return "\n".join(filter(None, (title, question_text(content, options))))
+
+
+async def _load_documents() -> List[Tuple[DocKey, str]]:
+    """加载全部真题与模拟题文本（构建矩阵时调用，自行打开数据库会话）"""
+    docs: List[Tuple[DocKey, str]] = []
+    async with get_session_context() as session:
+        for bank, model in _BANK_MODELS.items():
+            result = await session.exec(select(model.id, model.title, model.content, model.options))
+            docs.extend(((bank, question_id), similarity_text(title, content, options))
+                        for question_id, title, content, options in result.all())
+    return docs
+
+
+# 全局相似题目索引（真题与模拟题共用一个矩阵，IDF 在两个题库上统计）
+similar_questions = SimilarityIndex(
+    "similar-questions",
+    (ExamQuestion.__tablename__, MockQuestion.__tablename__),
+    _load_documents
+)
+
+
+class SimilarQuestionService:
+    """相似题目推荐服务类"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def similar_to_exam(
+        self,
+        exam_id: int,
+        bank: Optional[str] = "mock",
+        limit: int = 10
+    ) -> List[SimilarQuestionItem]:
+        """
+        推荐与一道真题相似的题目
+
+        Args:
+            exam_id: 真题ID
+            bank: 推荐范围：mock / exam，None 表示两个题库
+            limit: 返回数量
+
+        Returns:
+            相似题目列表（按相似度降序）
+
+        Raises:
+            NotFoundException: 真题不存在
+        """
+        return await self._similar_to("exam", exam_id, bank, limit)
+
+    async def similar_to_mock(
+        self,
+        mock_id: int,
+        bank: Optional[str] = "mock",
+        limit: int = 10
+    ) -> List[SimilarQuestionItem]:
+        """
+        推荐与一道模拟题相似的题目
+
+        Args:
+            mock_id: 模拟题ID
+            bank: 推荐范围：mock / exam，None 表示两个题库
+            limit: 返回数量
+
+        Returns:
+            相似题目列表（按相似度降序）
+
+        Raises:
+            NotFoundException: 模拟题不存在
+        """
+        return await self._similar_to("mock", mock_id, bank, limit)
+
+    async def _similar_to(
+        self,
+        source_bank: str,
+        question_id: int,
+        bank: Optional[str],
+        limit: int
+    ) -> List[SimilarQuestionItem]:
+        """推荐流程（真题与模拟题共用）：读取原题文本 → 矩阵检索 → 批量查询展示字段"""
+        model = _BANK_MODELS[source_bank]
+        result = await self.session.exec(
+            select(model.title, model.content, model.options).where(model.id == question_id)
+        )
+        source = result.first()
+        if source is None:
+            logger.warning("SimilarQuestionService: question not found, bank: %s, id: %d", source_bank, question_id)
+            raise NotFoundException(f"{_BANK_NAMES[source_bank]}不存在：ID={question_id}")
+
+        # 多取一些候选：矩阵重建前被删除的题目会在下面的查询中被过滤
+        matches = await similar_questions.search(
+            similarity_text(*source), limit * 2, bank=bank, exclude=(source_bank, question_id)
+        )
+        rows = await self._fetch_rows(key for key, _ in matches)
+        items: List[SimilarQuestionItem] = []
+        for key, similarity in matches:
+            row = rows.get(key)
+            if row is None:
+                continue
+            items.append(SimilarQuestionItem(bank=key[0], id=key[1], similarity=round(similarity, 4), **row))
+            if len(items) >= limit:
+                break
+
+        logger.info("SimilarQuestionService completed, bank: %s, id: %d, scope: %s, candidates: %d, returned: %d",
+                    source_bank, question_id, bank or "all", len(matches), len(items))
+        return items
+
+    async def _fetch_rows(self, keys) -> Dict[DocKey, dict]:
+        """按题库批量查询推荐项的展示字段（每个题库一次查询）"""
+        ids_by_bank: Dict[str, List[int]] = {}
+        for bank, question_id in keys:
+            ids_by_bank.setdefault(bank, []).append(question_id)
+
+        rows: Dict[DocKey, dict] = {}
+        for bank, ids in ids_by_bank.items():
+            model = _BANK_MODELS[bank]
+            extra = model.year if bank == "exam" else model.source
+            result = await self.session.exec(
+                select(model.id, model.title, model.question_type, model.question_number, extra)
+                .where(model.id.in_(ids))
+            )
+            for question_id, title, question_type, question_number, value in result.all():
+                rows[(bank, question_id)] = {
+                    "title": title,
+                    "question_type": question_type,
+                    "question_number": question_number,
+                    "year" if bank == "exam" else "source": value
+                }
+        return rows
@@ -0,0 +1,311 @@
+"""
+统计表维护服务模块
+增量维护 exam_stat / mock_stat 统计表与 mock_catalog 模拟题来源目录，并提供全量重建与一致性检查
+
+真题、模拟题的新增、修改、删除在同一事务内调用 apply_exam_change / apply_mock_change，
+按题目变化前后的统计键计算差值，以 INSERT ... ON CONFLICT DO UPDATE 累加计数。
+统计表数据异常时可全量重建或只做检查（在 backend-fastapi 目录下）：
+    python -m app.services.stats_service
+    python -m app.services.stats_service --check
+"""
+import argparse
+import asyncio
+import sys
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.question_buckets import parse_categories
+from app.models.entities import ExamQuestion, ExamStat, MockCatalog, MockQuestion, MockStat
+from app.utils.logger import setup_logger
+
+
+# 获取服务日志记录器
+logger = setup_logger(__name__)
+
+# 汇总行的分类值
+ALL_CATEGORIES = ""
+
+# 真题统计键：(subject_id, year, category, question_type)
+ExamStatKey = Tuple[int, int, str, str]
+# 模拟题统计键：(subject_id, source, category)
+MockStatKey = Tuple[int, str, str]
+# 模拟题目录键：(source, title)
+MockCatalogKey = Tuple[str, str]
+
+
+def exam_stat_keys(question: Optional[ExamQuestion]) -> List[ExamStatKey]:
+    """计算一道真题计入的统计键（汇总行 + 每个分类一行）"""
+    if question is None:
+        return []
+    subject_id = question.subject_id or 0
+    return [
+        (subject_id, question.year, category, question.question_type)
+        for category in (ALL_CATEGORIES, *parse_categories(question.category))
+    ]
+
+
+def mock_stat_keys(question: Optional[MockQuestion]) -> List[MockStatKey]:
+    """计算一道模拟题计入的统计键（汇总行 + 每个分类一行）"""
+    if question is None:
+        return []
+    subject_id = question.subject_id or 0
+    return [
+        (subject_id, question.source, category)
+        for category in (ALL_CATEGORIES, *parse_categories(question.category))
+    ]
+
+
+def mock_catalog_keys(question: Optional[MockQuestion]) -> List[MockCatalogKey]:
+    """计算一道模拟题计入的目录键（无标题记为空字符串）"""
+    if question is None:
+        return []
+    return [(question.source, question.title or "")]
+
+
+def _diff(old_keys: List[tuple], new_keys: List[tuple]) -> Dict[tuple, int]:
+    """计算新旧统计键的计数差值（忽略差值为 0 的键）"""
+    delta: Counter = Counter(new_keys)
+    delta.subtract(old_keys)
+    return {key: value for key, value in delta.items() if value}
+
+
+class StatsService:
+    """统计表维护服务类"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def apply_exam_change(
+        self,
+        old_keys: List[ExamStatKey],
+        new: Optional[ExamQuestion]
+    ) -> None:
+        """
+        按一道真题的变化更新 exam_stat
+
+        Args:
+            old_keys: 变化前的统计键（新增时为空列表，可由 exam_stat_keys 取得）
+            new: 变化后的真题（删除时为 None）
+        """
+        await self.apply_exam_delta(_diff(old_keys, exam_stat_keys(new)))
+
+    async def apply_mock_change(
+        self,
+        old_keys: List[MockStatKey],
+        old_catalog_keys: List[MockCatalogKey],
+        new: Optional[MockQuestion]
+    ) -> None:
+        """
+        按一道模拟题的变化更新 mock_stat 与 mock_catalog
+
+        Args:
+            old_keys: 变化前的统计键（新增时为空列表，可由 mock_stat_keys 取得）
+            old_catalog_keys: 变化前的目录键（新增时为空列表，可由 mock_catalog_keys 取得）
+            new: 变化后的模拟题（删除时为 None）
+        """
+        await self.apply_mock_delta(_diff(old_keys, mock_stat_keys(new)))
+        await self.apply_mock_catalog_delta(_diff(old_catalog_keys, mock_catalog_keys(new)))
+
+    async def apply_exam_delta(self, delta: Dict[ExamStatKey, int]) -> None:
+        """将计数差值累加到 exam_stat（计数归零的行随即删除）"""
+        if not delta:
+            return
+        rows = [
+            {"subject_id": s, "year": y, "category": c, "question_type": t, "count": n}
+            for (s, y, c, t), n in delta.items()
+        ]
+        await self._upsert(ExamStat, ["subject_id", "year", "category", "question_type"], rows,
+                           has_decrement=any(n < 0 for n in delta.values()))
+
+    async def apply_mock_delta(self, delta: Dict[MockStatKey, int]) -> None:
+        """将计数差值累加到 mock_stat（计数归零的行随即删除）"""
+        if not delta:
+            return
+        rows = [
+            {"subject_id": s, "source": src, "category": c, "count": n}
+            for (s, src, c), n in delta.items()
+        ]
+        await self._upsert(MockStat, ["subject_id", "source", "category"], rows,
+                           has_decrement=any(n < 0 for n in delta.values()))
+
+    async def apply_mock_catalog_delta(self, delta: Dict[MockCatalogKey, int]) -> None:
+        """将计数差值累加到 mock_catalog（计数归零的行随即删除）"""
+        if not delta:
+            return
+        rows = [{"source": src, "title": t, "count": n} for (src, t), n in delta.items()]
+        await self._upsert(MockCatalog, ["source", "title"], rows,
+                           has_decrement=any(n < 0 for n in delta.values()))
+
+    async def _upsert(self, model, key_columns: List[str], rows: List[dict], has_decrement: bool) -> None:
+        stmt = sqlite_insert(model)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=key_columns,
+            set_={"count": model.count + stmt.excluded.count}
+        )
+        await self.session.execute(stmt, rows)
+        if has_decrement:
+            await self.session.execute(delete(model).where(model.count <= 0))
+
+    async def rebuild(self) -> Tuple[int, int, int]:
+        """
+        全量重建统计表与模拟题目录
+
+        Returns:
+            (exam_stat 行数, mock_stat 行数, mock_catalog 行数)
+        """
+        return await self.session.run_sync(lambda sync_session: rebuild_stats(sync_session.connection()))
+
+    async def check(self) -> List[str]:
+        """
+        检查统计表与模拟题目录是否与题目表一致
+
+        Returns:
+            不一致项说明（一致时为空列表）
+        """
+        return await self.session.run_sync(lambda sync_session: check_stats(sync_session.connection()))
+
+
+def _count_exam_stats(conn: Connection) -> Counter:
+    """由真题表计算 exam_stat 的应有计数"""
+    counts: Counter = Counter()
+    rows = conn.execute(select(
+        ExamQuestion.subject_id, ExamQuestion.year, ExamQuestion.question_type, ExamQuestion.category
+    ))
+    for row in rows:
+        counts.update(exam_stat_keys(row))
+    return counts
+
+
+def _count_mock_stats(conn: Connection) -> Tuple[Counter, Counter]:
+    """由模拟题表计算 mock_stat 与 mock_catalog 的应有计数"""
+    stat_counts: Counter = Counter()
+    catalog_counts: Counter = Counter()
+    rows = conn.execute(select(
+        MockQuestion.subject_id, MockQuestion.source, MockQuestion.title, MockQuestion.category
+    ))
+    for row in rows:
+        stat_counts.update(mock_stat_keys(row))
+        catalog_counts.update(mock_catalog_keys(row))
+    return stat_counts, catalog_counts
+
+
+def _write_mock_catalog(conn: Connection, counts: Counter) -> None:
+    conn.execute(delete(MockCatalog))
+    if counts:
+        conn.execute(MockCatalog.__table__.insert(), [
+            {"source": src, "title": t, "count": n} for (src, t), n in counts.items()
+        ])
+
+
+def rebuild_stats(conn: Connection) -> Tuple[int, int, int]:
+    """
+    由题目表全量重建 exam_stat、mock_stat 与 mock_catalog
+
+    Args:
+        conn: 同步数据库连接（通过 AsyncConnection.run_sync 调用）
+
+    Returns:
+        (exam_stat 行数, mock_stat 行数, mock_catalog 行数)
+    """
+    exam_counts = _count_exam_stats(conn)
+    mock_counts, catalog_counts = _count_mock_stats(conn)
+
+    conn.execute(delete(ExamStat))
+    conn.execute(delete(MockStat))
+    if exam_counts:
+        conn.execute(ExamStat.__table__.insert(), [
+            {"subject_id": s, "year": y, "category": c, "question_type": t, "count": n}
+            for (s, y, c, t), n in exam_counts.items()
+        ])
+    if mock_counts:
+        conn.execute(MockStat.__table__.insert(), [
+            {"subject_id": s, "source": src, "category": c, "count": n}
+            for (s, src, c), n in mock_counts.items()
+        ])
+    _write_mock_catalog(conn, catalog_counts)
+
+    logger.info("rebuild_stats completed, exam_stat: %d, mock_stat: %d, mock_catalog: %d",
+                len(exam_counts), len(mock_counts), len(catalog_counts))
+    return len(exam_counts), len(mock_counts), len(catalog_counts)
+
+
+def check_stats(conn: Connection) -> List[str]:
+    """
+    比对 exam_stat、mock_stat、mock_catalog 与由题目表重新计算的结果
+
+    Args:
+        conn: 同步数据库连接
+
+    Returns:
+        不一致项说明（一致时为空列表）
+    """
+    expected_mock, expected_catalog = _count_mock_stats(conn)
+    tables = (
+        (ExamStat, ("subject_id", "year", "category", "question_type"), _count_exam_stats(conn)),
+        (MockStat, ("subject_id", "source", "category"), expected_mock),
+        (MockCatalog, ("source", "title"), expected_catalog),
+    )
+    problems: List[str] = []
+    for model, key_columns, expected in tables:
+        actual = {
+            tuple(row[:-1]): row[-1]
+            for row in conn.execute(select(*(getattr(model, c) for c in key_columns), model.count))
+        }
+        for key in sorted(set(expected) | set(actual), key=repr):
+            if expected.get(key, 0) != actual.get(key, 0):
+                problems.append(f"{model.__tablename__} {key}: 应为 {expected.get(key, 0)}，实际 {actual.get(key, 0)}")
+
+    if problems:
+        logger.warning("check_stats found %d mismatches", len(problems))
+    return problems
+
+
+def ensure_stats(conn: Connection) -> None:
+    """
+    统计表为空而题目表有数据时（新建统计表后首次启动）执行全量重建；
+    只有模拟题目录为空时（已有统计表的库新增目录表后首次启动）只重建目录
+    """
+    stats_empty = (
+        conn.execute(select(ExamStat.year).limit(1)).first() is None
+        and conn.execute(select(MockStat.source).limit(1)).first() is None
+    )
+    has_questions = (
+        conn.execute(select(ExamQuestion.year).limit(1)).first() is not None
+        or conn.execute(select(MockQuestion.source).limit(1)).first() is not None
+    )
+    if stats_empty and has_questions:
+        rebuild_stats(conn)
+        return
+    catalog_empty = conn.execute(select(MockCatalog.source).limit(1)).first() is None
+    if catalog_empty and conn.execute(select(MockQuestion.source).limit(1)).first() is not None:
+        _, catalog_counts = _count_mock_stats(conn)
+        _write_mock_catalog(conn, catalog_counts)
+        logger.info("ensure_stats: mock_catalog rebuilt, rows: %d", len(catalog_counts))
+
+
+async def _main(check_only: bool):
+    from app.database.connection import engine
+
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+        result = await conn.run_sync(check_stats if check_only else rebuild_stats)
+    await engine.dispose()
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="重建或检查统计表与模拟题目录")
+    parser.add_argument("--check", action="store_true", help="只检查是否与题目表一致，不写入")
+    args = parser.parse_args()
+    if args.check:
+        mismatches = asyncio.run(_main(check_only=True))
+        for line in mismatches:
+            print(f"[stats] {line}")
+        print(f"[stats] 检查完成：{len(mismatches)} 处不一致" if mismatches else "[stats] 检查完成：一致")
+        sys.exit(1 if mismatches else 0)
+    exam_rows, mock_rows, catalog_rows = asyncio.run(_main(check_only=False))
+    print(f"[stats] 重建完成：exam_stat {exam_rows} 行，mock_stat {mock_rows} 行，mock_catalog {catalog_rows} 行")
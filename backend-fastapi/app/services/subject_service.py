@@ -173,6 +173,7 @@ class SubjectService:
             enabled=request.enabled
         )
         self.session.add(subject)
+        await self.session.flush()
         await self.session.refresh(subject)
 
         logger.info("SubjectService.create completed, subject_id: %d", subject.id)
@@ -242,6 +243,7 @@ class SubjectService:
         for field, value in update_data.items():
             setattr(subject, field, value)
 
+        await self.session.flush()
         await self.session.refresh(subject)
 
         logger.info("SubjectService.update completed, subject_id: %d", subject_id)
@@ -12,6 +12,7 @@ from app.models.entities import ExamQuestion, MockQuestion
 from app.exception import NotFoundException, ValidationException
 from app.schemas.image import ImageResourceResponse, ImageUsageResponse
 from app.utils.logger import setup_logger
+from app.utils.markdown_images import extract_image_names
 
 
 # 获取服务日志记录器
@@ -217,57 +218,31 @@ class UploadService:
         # 创建文件名到ImageResourceResponse的映射
         image_map = {img.filename: img for img in images}
 
-        # 检查真题引用
+        # 检查真题引用（每道题一次正则扫描提取引用的文件名，再与图片集合求交集）
         for exam in exams:
-            text_parts = []
-            if exam.content:
-                text_parts.append(exam.content)
-            if exam.answer:
-                text_parts.append(exam.answer)
-            if exam.options:
-                text_parts.append(exam.options)
-
-            text = " ".join(text_parts)
-            if not text:
-                continue
-
-            for filename in filename_set:
-                if filename in text:
-                    img = image_map[filename]
-                    img.referenced = True
-                    img.exams.append(ImageUsageResponse(
-                        id=exam.id,
-                        year=exam.year,
-                        question_number=exam.question_number,
-                        title=exam.title or f"真题-{exam.year}年第{exam.question_number or '?'}题"
-                    ))
+            for filename in extract_image_names(exam.content, exam.answer, exam.options) & filename_set:
+                img = image_map[filename]
+                img.referenced = True
+                img.exams.append(ImageUsageResponse(
+                    id=exam.id,
+                    year=exam.year,
+                    question_number=exam.question_number,
+                    title=exam.title or f"真题-{exam.year}年第{exam.question_number or '?'}题"
+                ))
 
         # 检查模拟题引用
         for mock in mocks:
-            text_parts = []
-            if mock.content:
-                text_parts.append(mock.content)
-            if mock.answer:
-                text_parts.append(mock.answer)
-            if mock.options:
-                text_parts.append(mock.options)
-
-            text = " ".join(text_parts)
-            if not text:
-                continue
-
-            for filename in filename_set:
-                if filename in text:
-                    img = image_map[filename]
-                    img.referenced = True
-                    # 避免重复添加
-                    if not any(e.id == mock.id for e in img.exams):
-                        img.exams.append(ImageUsageResponse(
-                            id=mock.id,
-                            year=None,
-                            question_number=mock.question_number,
-                            title=f"[模拟题] {mock.title or mock.source}"
-                        ))
+            for filename in extract_image_names(mock.content, mock.answer, mock.options) & filename_set:
+                img = image_map[filename]
+                img.referenced = True
+                # 避免重复添加
+                if not any(e.id == mock.id for e in img.exams):
+                    img.exams.append(ImageUsageResponse(
+                        id=mock.id,
+                        year=None,
+                        question_number=mock.question_number,
+                        title=f"[模拟题] {mock.title or mock.source}"
+                    ))
 
     def _get_file_extension(self, filename: str) -> str:
         """
@@ -1,14 +1,23 @@
 """
 日志配置模块
 提供统一的日志配置功能，支持时间轮转
+
+所有日志器共用一条队列管道：业务代码只把日志记录放入内存队列（不阻塞事件循环），
+由后台线程的 QueueListener 统一写入控制台与同一个轮转文件。
 """
+import atexit
 import logging
 import os
+import queue
+import re
 import sys
 import shutil
+import threading
+from contextvars import ContextVar
 from datetime import datetime
-from logging.handlers import TimedRotatingFileHandler
-from typing import Optional
+from logging.handlers import TimedRotatingFileHandler, QueueHandler, QueueListener
+from typing import Dict, Optional
+from app.config.settings import settings
 
 
 class WindowsCompatibleTimedRotatingFileHandler(TimedRotatingFileHandler):
@@ -73,6 +82,163 @@ LOG_BACKUP_COUNT = 7            # 保留的历史日志文件数量
 LOG_FORMAT = "[%(asctime)s] [%(filename)s:%(lineno)d] [%(name)s] [%(levelname)s] %(message)s"
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+# 服务层方法入口/出口日志（"XService.method started/completed, ..."），请求量大时可采样
+LIFECYCLE_MESSAGE_PATTERN = re.compile(r"^(\S+) (started|completed)\b")
+
+# 当前上下文（请求任务）中各方法入口日志的采样结果，出口日志沿用同一结果
+_lifecycle_decisions: ContextVar[Optional[Dict[str, bool]]] = ContextVar("lifecycle_decisions", default=None)
+
+
+class LifecycleSamplingFilter(logging.Filter):
+    """
+    服务层入口/出口日志采样过滤器
+
+    只对 INFO 及以下级别、匹配 LIFECYCLE_MESSAGE_PATTERN 的记录采样，
+    警告、错误及其他日志始终保留。按调用采样：在 started 日志处决定保留与否，
+    结果记入上下文变量，同一调用的 completed 日志沿用该结果，入口与出口日志成对保留或丢弃。
+    保留比例按累加计数控制，结果可预期：rate=0.1 时每 10 次调用保留 1 次。
+    没有对应 started 日志的 completed 日志单独按计数采样。
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = max(0.0, min(1.0, rate))
+        self._credit = 0.0
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate >= 1.0 or record.levelno > logging.INFO:
+            return True
+        if not isinstance(record.msg, str):
+            return True
+        match = LIFECYCLE_MESSAGE_PATTERN.match(record.msg)
+        if match is None:
+            return True
+        call_key = f"{record.name}:{match.group(1)}"
+        decisions = _lifecycle_decisions.get() or {}
+        if match.group(2) == "completed" and call_key in decisions:
+            keep = decisions[call_key]
+            _lifecycle_decisions.set({k: v for k, v in decisions.items() if k != call_key})
+            return keep
+        keep = self._draw()
+        if match.group(2) == "started":
+            # 复制后再写入，不影响父任务或其他请求的上下文
+            _lifecycle_decisions.set({**decisions, call_key: keep})
+        return keep
+
+    def _draw(self) -> bool:
+        """从累加计数中决定一次调用是否保留"""
+        with self._lock:
+            self._credit += self.rate
+            if self._credit >= 1.0:
+                self._credit -= 1.0
+                return True
+        return False
+
+
+# 共享日志管道（首次调用 setup_logger 时创建）
+_log_queue: Optional[queue.SimpleQueue] = None
+_queue_handler: Optional[QueueHandler] = None
+_console_handler: Optional[logging.Handler] = None
+_listener: Optional[QueueListener] = None
+_pipeline_lock = threading.Lock()
+
+
+def _create_file_handler(
+    log_file: Optional[str],
+    backup_count: int,
+    rotation_when: str,
+    rotation_interval: int
+) -> logging.Handler:
+    """创建共享的时间轮转文件处理器 (Windows 兼容版本)"""
+    if log_file is None:
+        log_file = datetime.now().strftime("%Y-%m-%d") + ".log"
+    file_path = os.path.join(LOG_DIR, log_file)
+    file_handler = WindowsCompatibleTimedRotatingFileHandler(
+        filename=file_path,
+        when=rotation_when,
+        interval=rotation_interval,
+        backupCount=backup_count,
+        encoding="utf-8",
+        atTime=datetime.strptime("00:00:00", "%H:%M:%S")
+    )
+    # 轮转后的文件后缀格式
+    file_handler.suffix = "%Y-%m-%d"
+    file_handler.setLevel(logging.DEBUG)
+    return file_handler
+
+
+def _ensure_pipeline(
+    level: int | str,
+    log_file: Optional[str],
+    console: bool,
+    backup_count: int,
+    rotation_when: str,
+    rotation_interval: int
+) -> None:
+    """
+    创建共享日志管道并挂载到根日志器（只执行一次）
+
+    各模块日志器不再各自持有处理器，而是通过传播交给根日志器上唯一的 QueueHandler，
+    既避免了同一条日志被重复输出，也让文件写入离开事件循环线程。
+    """
+    global _log_queue, _queue_handler, _console_handler, _listener
+
+    with _pipeline_lock:
+        if _listener is not None:
+            return
+
+        # 创建日志目录
+        os.makedirs(LOG_DIR, exist_ok=True)
+
+        # 格式化器
+        formatter = logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT)
+
+        handlers = []
+        # 控制台处理器
+        if console:
+            _console_handler = logging.StreamHandler()
+            _console_handler.setLevel(level)
+            _console_handler.setFormatter(formatter)
+            handlers.append(_console_handler)
+
+        # 文件处理器 - 所有模块共用一个
+        file_handler = _create_file_handler(log_file, backup_count, rotation_when, rotation_interval)
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+
+        _log_queue = queue.SimpleQueue()
+        _queue_handler = QueueHandler(_log_queue)
+        _listener = QueueListener(_log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+
+        # 根日志器使用配置级别，避免第三方库（aiosqlite 等）的 DEBUG 日志写入文件；
+        # 本项目的模块日志器由 setup_logger 设置为 DEBUG
+        root = logging.getLogger()
+        root.setLevel(level)
+        root.addHandler(_queue_handler)
+
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """
+    停止后台写日志线程并写出队列中剩余的记录
+
+    应用关闭时调用；可重复调用。
+    """
+    global _listener
+
+    with _pipeline_lock:
+        listener, _listener = _listener, None
+    if listener is None:
+        return
+
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+    logging.getLogger().removeHandler(_queue_handler)
+
 
 def setup_logger(
     name: Optional[str] = None,
@@ -81,59 +247,48 @@ def setup_logger(
     console: bool = True,
     backup_count: int = LOG_BACKUP_COUNT,
     rotation_when: str = LOG_ROTATION_WHEN,
-    rotation_interval: int = LOG_ROTATION_INTERVAL
+    rotation_interval: int = LOG_ROTATION_INTERVAL,
+    sample_rate: Optional[float] = None
 ) -> logging.Logger:
     """
     配置并返回日志记录器
 
+    处理器相关参数（level、log_file、console、轮转配置）只在首次调用、
+    创建共享日志管道时生效；其后调用仅获取日志器并配置采样。
+    根日志器（name=None）再次传入 level 时会更新控制台输出级别。
+
     Args:
         name: 日志器名称，None则返回根日志器
-        level: 日志级别
+        level: 控制台日志级别
         log_file: 日志文件名，默认自动命名
         console: 是否输出到控制台
         backup_count: 保留的历史日志文件数量
         rotation_when: 日志轮转单位 (midnight, D, H, M, S)
         rotation_interval: 日志轮转间隔
+        sample_rate: 服务层 started/completed 日志的保留比例 (0~1)，
+            None 时使用配置项 LOGGING_LIFECYCLE_SAMPLE_RATE
 
     Returns:
         配置好的 logging.Logger 实例
     """
-    # 创建日志目录
-    os.makedirs(LOG_DIR, exist_ok=True)
-
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.DEBUG)
+    _ensure_pipeline(level, log_file, console, backup_count, rotation_when, rotation_interval)
 
-    # 避免重复添加处理器
-    if logger.handlers:
+    if name is None:
+        logger = logging.getLogger()
+        logger.setLevel(level)
+        if _console_handler is not None:
+            _console_handler.setLevel(level)
         return logger
 
-    # 格式化器
-    formatter = logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT)
-
-    # 控制台处理器
-    if console:
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(level)
-        console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.DEBUG)
 
-    # 文件处理器 - 使用时间轮转 (Windows 兼容版本)
-    if log_file is None:
-        log_file = datetime.now().strftime("%Y-%m-%d") + ".log"
-    file_path = os.path.join(LOG_DIR, log_file)
-    file_handler = WindowsCompatibleTimedRotatingFileHandler(
-        filename=file_path,
-        when=rotation_when,
-        interval=rotation_interval,
-        backupCount=backup_count,
-        encoding="utf-8",
-        atTime=datetime.strptime("00:00:00", "%H:%M:%S")
-    )
-    # 轮转后的文件后缀格式
-    file_handler.suffix = "%Y-%m-%d"
-    file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    # 采样配置（重复调用时替换原有过滤器）
+    if sample_rate is None:
+        sample_rate = settings.logging.lifecycle_sample_rate
+    for existing in [f for f in logger.filters if isinstance(f, LifecycleSamplingFilter)]:
+        logger.removeFilter(existing)
+    if sample_rate < 1.0:
+        logger.addFilter(LifecycleSamplingFilter(sample_rate))
 
     return logger
@@ -0,0 +1,63 @@
+"""
+题目图片引用解析模块
+题目内容中的图片以上传接口返回的 URL 引用（/uploads/images/<文件名>，可能带有站点前缀），
+这里用一次正则扫描提取引用的文件名，代替逐个文件名在文本中做子串查找
+"""
+import re
+from typing import Iterable, Optional, Set
+
+
+# 图片 URL：可选的 http(s)://host 前缀 + /uploads/images/<文件名>
+# 文件名限定为上传时生成的字符集（不含路径分隔符），可直接拼接到上传目录下
+IMAGE_URL_PATTERN = re.compile(r"(?:https?://[^\s/()\"'<>]+)?/uploads/images/([\w\-]+(?:\.[\w\-]+)*)")
+
+
+def extract_image_names(*texts: Optional[str]) -> Set[str]:
+    """
+    提取文本中引用的图片文件名
+
+    Args:
+        texts: 待扫描的文本（可为 None）
+
+    Returns:
+        文件名集合
+    """
+    names: Set[str] = set()
+    for text in texts:
+        if text and "/uploads/images/" in text:
+            names.update(IMAGE_URL_PATTERN.findall(text))
+    return names
+
+
+def extract_image_names_from(rows: Iterable, fields: Iterable[str]) -> Set[str]:
+    """
+    提取一组记录中引用的全部图片文件名
+
+    Args:
+        rows: 记录（支持属性访问）
+        fields: 需要扫描的字段名
+
+    Returns:
+        文件名集合
+    """
+    fields = tuple(fields)
+    names: Set[str] = set()
+    for row in rows:
+        names |= extract_image_names(*(getattr(row, f) for f in fields))
+    return names
+
+
+def localize_image_links(text: str, prefix: str = "images/") -> str:
+    """
+    将图片 URL 改写为相对路径（用于离线导出包）
+
+    Args:
+        text: Markdown 文本
+        prefix: 图片在导出包中的相对目录
+
+    Returns:
+        改写后的文本
+    """
+    if "/uploads/images/" not in text:
+        return text
+    return IMAGE_URL_PATTERN.sub(lambda m: prefix + m.group(1), text)
@@ -0,0 +1,265 @@
+"""
+Markdown 服务端预渲染模块
+将题目内容渲染为净化后的 HTML，渲染规则与前端 MarkdownViewer 保持一致：
+    - 字面量 "\\n" 视为换行
+    - 公式（$$…$$、\\[…\\]、$…$、\\(…\\)）先替换为占位符，避免被 Markdown 语法破坏，
+      渲染后输出为 <span class="math-tex" data-display="…">TeX</span>，由前端 KaTeX 直接渲染
+    - 允许内嵌 HTML，```svg 代码块直接输出 SVG
+    - 输出按白名单净化（标签、属性与前端 XSS 白名单一致，链接只允许 http(s)、mailto 与相对地址）
+
+本模块只依赖 markdown-it-py，函数均为纯函数，可在子进程中执行。
+"""
+import html
+import re
+from html.parser import HTMLParser
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Optional
+
+if TYPE_CHECKING:
+    from markdown_it import MarkdownIt
+
+
+# 渲染器版本（渲染规则或白名单变化时递增，使渲染缓存失效）
+RENDERER_VERSION = 1
+
+# 公式模式（按优先级排序：块级 → 行内）
+_MATH_PATTERNS = (
+    (re.compile(r"\$\$([\s\S]+?)\$\$"), True),
+    (re.compile(r"\\\[([\s\S]+?)\\\]"), True),
+    (re.compile(r"\$([^$\n]+?)\$"), False),
+    (re.compile(r"\\\(([\s\S]+?)\\\)"), False),
+)
+_PLACEHOLDER_PATTERN = re.compile(r"(<code>)?`?KATEX([BI])(\d+)PH`?(</code>)?")
+
+# 标签白名单：标签 -> 允许的属性（HTMLParser 输出小写名称，浏览器解析内联 SVG 时会还原大小写）
+_COMMON_ATTRS = frozenset({"class", "style"})
+_SVG_PRESENTATION = frozenset({"fill", "stroke", "stroke-width", "class", "style"})
+_ALLOWED_TAGS: Dict[str, FrozenSet[str]] = {
+    # Markdown 输出
+    "p": _COMMON_ATTRS, "br": frozenset(), "hr": frozenset(),
+    "h1": frozenset(), "h2": frozenset(), "h3": frozenset(),
+    "h4": frozenset(), "h5": frozenset(), "h6": frozenset(),
+    "blockquote": frozenset(), "pre": frozenset(), "code": frozenset({"class"}),
+    "ul": frozenset(), "ol": frozenset({"start"}), "li": frozenset(),
+    "em": _COMMON_ATTRS, "strong": _COMMON_ATTRS, "s": frozenset(), "del": frozenset(),
+    "b": _COMMON_ATTRS, "i": _COMMON_ATTRS, "u": frozenset(), "sub": frozenset(), "sup": frozenset(),
+    "a": frozenset({"href", "title", "xlink:href", "target", "class"}),
+    "img": frozenset({"src", "alt", "title", "width", "height", "class", "style"}),
+    "table": _COMMON_ATTRS, "thead": frozenset(), "tbody": frozenset(), "tr": _COMMON_ATTRS,
+    "th": _COMMON_ATTRS | {"colspan", "rowspan"}, "td": _COMMON_ATTRS | {"colspan", "rowspan"},
+    "div": _COMMON_ATTRS | {"xmlns"}, "span": _COMMON_ATTRS | {"aria-hidden"},
+    # SVG
+    "svg": frozenset({"width", "height", "viewbox", "xmlns", "xmlns:xlink", "class", "style"}),
+    "g": frozenset({"class", "transform", "id", "style"}),
+    "line": _SVG_PRESENTATION | {"x1", "y1", "x2", "y2"},
+    "circle": _SVG_PRESENTATION | {"cx", "cy", "r"},
+    "ellipse": _SVG_PRESENTATION | {"cx", "cy", "rx", "ry"},
+    "rect": _SVG_PRESENTATION | {"x", "y", "width", "height", "rx", "ry"},
+    "path": _SVG_PRESENTATION | {"d", "marker-end", "marker-start"},
+    "polygon": _SVG_PRESENTATION | {"points"},
+    "polyline": _SVG_PRESENTATION | {"points", "marker-end", "marker-start"},
+    "text": frozenset({"x", "y", "dx", "dy", "text-anchor", "font-size", "font-family",
+                       "font-weight", "fill", "class", "style"}),
+    "tspan": frozenset({"x", "y", "dx", "dy", "class", "style"}),
+    "textpath": frozenset({"href", "xlink:href", "class", "style"}),
+    "defs": frozenset(),
+    "use": frozenset({"href", "xlink:href", "x", "y", "width", "height", "class"}),
+    "symbol": frozenset({"id", "viewbox", "class"}),
+    "switch": _COMMON_ATTRS,
+    "image": frozenset({"x", "y", "width", "height", "href", "xlink:href", "class", "style",
+                        "preserveaspectratio"}),
+    "clippath": frozenset({"id", "class"}),
+    "mask": frozenset({"id", "x", "y", "width", "height", "class"}),
+    "lineargradient": frozenset({"id", "x1", "y1", "x2", "y2", "gradientunits", "class"}),
+    "radialgradient": frozenset({"id", "cx", "cy", "r", "fx", "fy", "gradientunits", "class"}),
+    "stop": frozenset({"offset", "stop-color", "stop-opacity", "class", "style"}),
+    "filter": frozenset({"id", "x", "y", "width", "height", "class"}),
+    "fegaussianblur": frozenset({"in", "stddeviation"}),
+    "feoffset": frozenset({"dx", "dy"}),
+    "feblend": frozenset({"mode", "in", "in2"}),
+    "title": frozenset(), "desc": frozenset(), "metadata": frozenset(),
+    "marker": frozenset({"id", "viewbox", "refx", "refy", "markerwidth", "markerheight", "orient", "class"}),
+    "pattern": frozenset({"id", "x", "y", "width", "height", "patternunits", "patterntransform", "class"}),
+    "foreignobject": frozenset({"x", "y", "width", "height", "class"}),
+}
+_VOID_TAGS = frozenset({"br", "hr", "img"})
+# 连同内容一起丢弃的标签
+_DROP_CONTENT_TAGS = frozenset({"script", "style", "iframe", "object", "embed", "noscript", "template", "textarea"})
+_URL_ATTRS = frozenset({"href", "src", "xlink:href"})
+_SAFE_URL = re.compile(r"^(?:https?:|mailto:|/|\.|#|[^:]*$)", re.IGNORECASE)
+_SAFE_IMAGE_DATA_URL = re.compile(r"^data:image/(?:png|jpe?g|gif|webp);", re.IGNORECASE)
+_UNSAFE_STYLE = re.compile(r"expression|javascript:|url\s*\(|@import|behavior", re.IGNORECASE)
+
+
+def _create_markdown() -> "MarkdownIt":
+    """与前端一致的 markdown-it 配置（默认规则 + 内嵌 HTML + svg 代码块；首次渲染时才导入 markdown-it）"""
+    from markdown_it import MarkdownIt
+
+    md = MarkdownIt("js-default", {"html": True})
+    default_fence = md.renderer.rules["fence"]
+
+    def fence(renderer, tokens, idx, options, env):
+        token = tokens[idx]
+        if token.info.strip() == "svg":
+            return f'<div class="custom-svg-block">{token.content}</div>'
+        return default_fence(tokens, idx, options, env)
+
+    md.add_render_rule("fence", fence)
+    return md
+
+
+_markdown: Optional["MarkdownIt"] = None
+
+
+class _Sanitizer(HTMLParser):
+    """按白名单净化 HTML：移除不允许的标签与属性，补齐未闭合的标签"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self.open_tags: List[str] = []
+        self.drop_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        self._start(tag, attrs, self_closing=False)
+
+    def handle_startendtag(self, tag, attrs):
+        self._start(tag, attrs, self_closing=True)
+
+    def _start(self, tag, attrs, self_closing):
+        if tag in _DROP_CONTENT_TAGS:
+            if not self_closing:
+                self.drop_depth += 1
+            return
+        if self.drop_depth or tag not in _ALLOWED_TAGS:
+            return
+        allowed = _ALLOWED_TAGS[tag]
+        rendered = []
+        for name, value in attrs:
+            if name not in allowed:
+                continue
+            value = value or ""
+            if name in _URL_ATTRS and not self._safe_url(tag, value):
+                continue
+            if name == "style" and _UNSAFE_STYLE.search(value):
+                continue
+            rendered.append(f' {name}="{html.escape(value, quote=True)}"')
+        attributes = "".join(rendered)
+        if tag in _VOID_TAGS:
+            self.parts.append(f"<{tag}{attributes}>")
+        elif self_closing:
+            # HTML 元素不支持自闭合写法，统一输出成对标签
+            self.parts.append(f"<{tag}{attributes}></{tag}>")
+        else:
+            self.parts.append(f"<{tag}{attributes}>")
+            self.open_tags.append(tag)
+
+    @staticmethod
+    def _safe_url(tag: str, value: str) -> bool:
+        value = value.strip()
+        if tag in ("img", "image") and _SAFE_IMAGE_DATA_URL.match(value):
+            return True
+        return bool(_SAFE_URL.match(value))
+
+    def handle_endtag(self, tag):
+        if tag in _DROP_CONTENT_TAGS:
+            self.drop_depth = max(0, self.drop_depth - 1)
+            return
+        if self.drop_depth or tag not in self.open_tags:
+            return
+        # 关闭到最近的同名标签（中间未闭合的标签一并关闭）
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            self.parts.append(f"</{open_tag}>")
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.drop_depth:
+            self.parts.append(html.escape(data, quote=False))
+
+    def result(self) -> str:
+        self.close()
+        return "".join(self.parts) + "".join(f"</{tag}>" for tag in reversed(self.open_tags))
+
+
+def sanitize_html(source: str) -> str:
+    """
+    按白名单净化 HTML
+
+    Args:
+        source: 原始 HTML
+
+    Returns:
+        净化后的 HTML
+    """
+    sanitizer = _Sanitizer()
+    sanitizer.feed(source)
+    return sanitizer.result()
+
+
+def _extract_math(text: str):
+    """将公式替换为占位符，返回 (替换后文本, [(TeX, 是否块级, 原文)])"""
+    expressions = []
+
+    def replace(match, display):
+        expressions.append((match.group(1), display, match.group(0)))
+        return f"`KATEX{'B' if display else 'I'}{len(expressions) - 1}PH`"
+
+    for pattern, display in _MATH_PATTERNS:
+        text = pattern.sub(lambda m: replace(m, display), text)
+    return text, expressions
+
+
+def _math_html(tex: str, display: bool) -> str:
+    """公式节点（预处理 KaTeX 不支持的语法，与前端一致）"""
+    tex = re.sub(r"@\{[^}]*\}", "", tex)
+    tex = re.sub(r"\\\\?\s*\\hline\s*", r"\\\\ \\hline ", tex)
+    wrapper = "katex-display-wrapper" if display else "katex-inline-wrapper"
+    return (f'<span class="{wrapper}"><span class="math-tex" data-display="{"true" if display else "false"}">'
+            f"{html.escape(tex, quote=False)}</span></span>")
+
+
+def render_markdown(text: str) -> str:
+    """
+    将 Markdown（含公式）渲染为净化后的 HTML
+
+    Args:
+        text: Markdown 原文
+
+    Returns:
+        HTML
+    """
+    global _markdown
+    if _markdown is None:
+        _markdown = _create_markdown()
+    if not text:
+        return ""
+    safe_text, expressions = _extract_math(text.replace("\\n", "\n"))
+    rendered = sanitize_html(_markdown.render(safe_text))
+    if not expressions:
+        return rendered
+
+    def restore(match):
+        index = int(match.group(3))
+        if index >= len(expressions):
+            return match.group(0)
+        tex, display, original = expressions[index]
+        if match.group(1) and match.group(4):
+            return _math_html(tex, display)
+        # 位于代码块等处的占位符还原为原文
+        return (match.group(1) or "") + html.escape(original, quote=False) + (match.group(4) or "")
+
+    return _PLACEHOLDER_PATTERN.sub(restore, rendered)
+
+
+def render_markdown_batch(texts: List[str]) -> List[str]:
+    """
+    批量渲染（渲染进程池的任务入口，减少进程间往返）
+
+    Args:
+        texts: Markdown 原文列表
+
+    Returns:
+        HTML 列表（与输入一一对应）
+    """
+    return [render_markdown(text) for text in texts]
@@ -0,0 +1,110 @@
+"""
+游标分页工具模块
+提供基于 (排序键, id) 的 keyset 分页游标编码、解码与查询条件构建
+"""
+import base64
+import json
+from typing import Any, Optional, Tuple
+from sqlalchemy import String, DateTime, type_coerce, and_, or_
+from app.exception import ValidationException
+
+
+def raw_sort_key(column):
+    """
+    获取用于游标比较的排序键表达式
+
+    SQLite 中时间字段以文本存储，且历史数据与 SQLAlchemy 写入的格式不同
+    （'2025-01-01T00:00:00' 与 '2025-01-01 00:00:00.000000'）。ORDER BY 按原始文本排序，
+    因此游标也必须保存并比较原始文本；type_coerce 不生成 CAST，索引仍然可用。
+
+    Args:
+        column: 模型列
+
+    Returns:
+        可用于 SELECT 与比较的列表达式
+    """
+    # SQLModel 的时间类型为 TypeDecorator，需同时检查其底层类型
+    column_type = column.type
+    if isinstance(column_type, DateTime) or isinstance(getattr(column_type, "impl", None), DateTime):
+        return type_coerce(column, String)
+    return column
+
+
+def encode_cursor(sort_field: str, sort_order: str, value: Any, last_id: int) -> str:
+    """
+    编码分页游标（对客户端不透明）
+
+    Args:
+        sort_field: 排序字段
+        sort_order: 排序方向
+        value: 当前页最后一行的排序键原始值
+        last_id: 当前页最后一行的ID
+
+    Returns:
+        URL 安全的游标字符串
+    """
+    payload = json.dumps([sort_field, sort_order, value, last_id], ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_field: str, sort_order: str) -> Tuple[Any, int]:
+    """
+    解码分页游标并校验其排序条件
+
+    Args:
+        cursor: 游标字符串
+        sort_field: 本次请求的排序字段
+        sort_order: 本次请求的排序方向
+
+    Returns:
+        (排序键原始值, ID)
+
+    Raises:
+        ValidationException: 游标无效或与排序条件不匹配
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        field, order, value, last_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise ValidationException("无效的分页游标")
+
+    if field != sort_field or order != sort_order or not isinstance(last_id, int):
+        raise ValidationException("分页游标与排序条件不匹配")
+    return value, last_id
+
+
+def keyset_condition(sort_column, id_column, value: Optional[Any], last_id: int, descending: bool):
+    """
+    构建“位于游标之后”的查询条件
+
+    排序为 (sort_column, id) 同向；遵循 SQLite 的 NULL 排序规则：
+    升序时 NULL 在最前，降序时 NULL 在最后。
+
+    Args:
+        sort_column: 排序键表达式（raw_sort_key 的返回值）
+        id_column: 主键列
+        value: 游标中的排序键值
+        last_id: 游标中的ID
+        descending: 是否降序
+
+    Returns:
+        SQLAlchemy 条件表达式
+    """
+    if descending:
+        if value is None:
+            return and_(sort_column.is_(None), id_column < last_id)
+        return or_(
+            sort_column < value,
+            and_(sort_column == value, id_column < last_id),
+            sort_column.is_(None)
+        )
+
+    if value is None:
+        return or_(
+            and_(sort_column.is_(None), id_column > last_id),
+            sort_column.isnot(None)
+        )
+    return or_(
+        sort_column > value,
+        and_(sort_column == value, id_column > last_id)
+    )
@@ -0,0 +1,211 @@
+"""
+题目批量导入解析模块
+将 JSON Lines 或 Markdown 试卷文本解析为逐条的题目字段字典
+
+Markdown 格式与真题导出格式一致：
+    ## 2024年                 （二级标题：真题为年份，模拟题为试卷标题）
+    ### 第1题
+    **题目标题**               （可选，紧跟题号标题）
+    题目内容……
+    **选项：**
+    - **A**: 选项A
+    **答案：** 答案内容……
+    ---
+另外支持可选的 “**分类：** 栈, 队列” 与 “**难度：** MEDIUM” 行。
+"""
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+
+# 解析结果中的分组标题字段名（由调用方映射为年份或试卷标题）
+SECTION_KEY = "_section"
+
+_SECTION_PATTERN = re.compile(r"^##\s+(.+?)\s*$")
+_QUESTION_PATTERN = re.compile(r"^###\s*第\s*(\d+|None)?\s*题\s*$")
+_TITLE_PATTERN = re.compile(r"^\*\*(.+?)\*\*\s*$")
+_OPTIONS_HEADER = re.compile(r"^\*\*选项[：:]\*\*\s*$")
+_OPTION_PATTERN = re.compile(r"^-\s*\*\*(.+?)\*\*\s*[：:]\s*(.*)$")
+_ANSWER_PATTERN = re.compile(r"^\*\*答案[：:]\*\*[ \t]*(.*)$")
+_CATEGORY_PATTERN = re.compile(r"^\*\*分类[：:]\*\*\s*(.*)$")
+_DIFFICULTY_PATTERN = re.compile(r"^\*\*难度[：:]\*\*\s*(.*)$")
+_SEPARATOR = "---"
+
+
+class ParsedRow:
+    """解析出的一条题目（row 为在原文中的行号，从 1 开始；无法解析时 error 为原因）"""
+
+    __slots__ = ("row", "data", "error")
+
+    def __init__(self, row: int, data: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
+        self.row = row
+        self.data: Dict[str, Any] = data if data is not None else {}
+        self.error = error
+
+
+def parse_jsonl(text: str) -> List[ParsedRow]:
+    """
+    解析 JSON Lines 文本（每个非空行为一个 JSON 对象）
+
+    Args:
+        text: 原始文本
+
+    Returns:
+        解析结果列表，无法解析的行带有 error
+    """
+    rows: List[ParsedRow] = []
+    for line_no, line in enumerate(text.splitlines(), start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            value = json.loads(line)
+        except json.JSONDecodeError as e:
+            rows.append(ParsedRow(row=line_no, error=f"JSON 解析失败：{e.msg}"))
+            continue
+        if not isinstance(value, dict):
+            rows.append(ParsedRow(row=line_no, error="每行必须是一个 JSON 对象"))
+            continue
+        rows.append(ParsedRow(row=line_no, data=value))
+    return rows
+
+
+def parse_markdown_paper(text: str) -> List[ParsedRow]:
+    """
+    解析 Markdown 试卷文本
+
+    每道题以 “### 第N题” 开始，以 “---” 或下一道题结束；
+    所属的二级标题文本记录在 SECTION_KEY 字段中。
+    题目正文、答案中也可能出现 “## ” 标题和 “---” 分隔线，它们只在后面紧跟下一道题时才作为结构解析。
+
+    Args:
+        text: 原始文本
+
+    Returns:
+        解析结果列表
+    """
+    rows: List[ParsedRow] = []
+    section: Optional[str] = None
+    current: Optional[ParsedRow] = None
+    content: List[str] = []
+    answer: Optional[List[str]] = None
+    options: Optional[Dict[str, str]] = None
+    in_options = False
+    in_fence = False
+    lines = text.splitlines()
+
+    def next_content(index: int) -> int:
+        """index 之后第一个非空行的下标（没有时返回行数）"""
+        for following in range(index + 1, len(lines)):
+            if lines[following].strip():
+                return following
+        return len(lines)
+
+    def next_is_question(index: int) -> bool:
+        following = next_content(index)
+        return following < len(lines) and bool(_QUESTION_PATTERN.match(lines[following].strip()))
+
+    def ends_question(index: int) -> bool:
+        """分隔线后为文本结尾、下一题或紧接下一题的二级标题时才视为题目结束"""
+        following = next_content(index)
+        if following == len(lines) or next_is_question(index):
+            return True
+        return bool(_SECTION_PATTERN.match(lines[following].strip())) and next_is_question(following)
+
+    def finish() -> None:
+        nonlocal current
+        if current is None:
+            return
+        data = current.data
+        data["content"] = "\n".join(content).strip()
+        if options:
+            data["options"] = options
+            data.setdefault("question_type", "CHOICE")
+        if answer is not None:
+            data["answer"] = "\n".join(answer).strip() or None
+        rows.append(current)
+        current = None
+
+    for index, line in enumerate(lines):
+        line_no = index + 1
+        stripped = line.strip()
+
+        match = _QUESTION_PATTERN.match(stripped)
+        is_fence = stripped.startswith("```") and stripped.count("```") == 1
+        # 紧跟下一道题的分隔线、二级标题总是作为结构解析（容忍未闭合的代码块）
+        is_boundary = bool(match) or (
+            (stripped == _SEPARATOR or _SECTION_PATTERN.match(stripped)) and next_is_question(index)
+        ) or (stripped == _SEPARATOR and ends_question(index))
+        if current is not None and not is_boundary and (in_fence or is_fence):
+            # 代码块内原样保留
+            if is_fence:
+                in_fence = not in_fence
+            (answer if answer is not None else content).append(line)
+            continue
+
+        if match:
+            finish()
+            number = match.group(1)
+            current = ParsedRow(row=line_no, data={
+                "question_number": int(number) if number and number != "None" else None
+            })
+            if section is not None:
+                current.data[SECTION_KEY] = section
+            content, answer, options, in_options, in_fence = [], None, None, False, False
+            continue
+
+        match = _SECTION_PATTERN.match(stripped)
+        if match and not stripped.startswith("###") and (current is None or next_is_question(index)):
+            finish()
+            section = match.group(1)
+            continue
+
+        if current is None:
+            continue
+
+        if stripped == _SEPARATOR and ends_question(index):
+            finish()
+            continue
+
+        if answer is not None:
+            answer.append(line)
+            continue
+
+        match = _ANSWER_PATTERN.match(line.lstrip())
+        if match:
+            answer = [match.group(1)]
+            in_options = False
+            continue
+
+        if _OPTIONS_HEADER.match(stripped):
+            options, in_options = {}, True
+            continue
+
+        if in_options:
+            match = _OPTION_PATTERN.match(stripped)
+            if match:
+                options[match.group(1)] = match.group(2)
+                continue
+            if not stripped:
+                continue
+            in_options = False
+
+        match = _CATEGORY_PATTERN.match(stripped)
+        if match:
+            current.data["category"] = [c.strip() for c in re.split(r"[,，、]", match.group(1)) if c.strip()]
+            continue
+
+        match = _DIFFICULTY_PATTERN.match(stripped)
+        if match:
+            current.data["difficulty"] = match.group(1).strip().upper() or None
+            continue
+
+        match = _TITLE_PATTERN.match(stripped)
+        if match and "title" not in current.data and not any(c.strip() for c in content):
+            current.data["title"] = match.group(1)
+            continue
+
+        content.append(line)
+
+    finish()
+    return rows
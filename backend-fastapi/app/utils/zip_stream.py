@@ -0,0 +1,122 @@
+"""
+流式 ZIP 打包模块
+在工作线程中写 ZIP（压缩在线程内完成，不阻塞事件循环），产生的字节按块交给异步迭代器输出
+
+ZipFile 写入不可 seek 的输出流时使用数据描述符记录大小与校验值，无需回写文件头，
+因此整个压缩包不会驻留内存：内存中最多只有 max_pending 个待发送的块。
+"""
+import asyncio
+import threading
+import zipfile
+from typing import AsyncIterator, Callable
+
+
+class _Cancelled(Exception):
+    """消费端已停止读取（客户端断开）"""
+
+
+class _ChunkSink:
+    """ZipFile 的输出流：累积到 chunk_size 后交给事件循环"""
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        queue: asyncio.Queue,
+        slots: threading.Semaphore,
+        cancelled: threading.Event,
+        chunk_size: int
+    ):
+        self._loop = loop
+        self._queue = queue
+        self._slots = slots
+        self._cancelled = cancelled
+        self._chunk_size = chunk_size
+        self._buffer = bytearray()
+
+    def write(self, data) -> int:
+        self._buffer += data
+        while len(self._buffer) >= self._chunk_size:
+            self.put(bytes(self._buffer[:self._chunk_size]))
+            del self._buffer[:self._chunk_size]
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> None:
+        """发送剩余字节"""
+        if self._buffer:
+            self.put(bytes(self._buffer))
+            self._buffer.clear()
+
+    def put(self, item) -> None:
+        """等待空位后投递（消费端停止后放弃）"""
+        while not self._slots.acquire(timeout=0.5):
+            if self._cancelled.is_set():
+                raise _Cancelled()
+        if self._cancelled.is_set():
+            raise _Cancelled()
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, item)
+
+
+_DONE = object()
+
+
+async def stream_zip(
+    write_entries: Callable[[zipfile.ZipFile], None],
+    chunk_size: int = 64 * 1024,
+    max_pending: int = 8
+) -> AsyncIterator[bytes]:
+    """
+    流式生成 ZIP
+
+    Args:
+        write_entries: 在工作线程中调用，向 ZipFile 写入全部条目（可使用 ZipFile.open(..., "w") 逐块写入）
+        chunk_size: 输出块大小
+        max_pending: 待发送块的上限（消费端较慢时写入线程阻塞等待）
+
+    Yields:
+        ZIP 字节块
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    slots = threading.Semaphore(max_pending)
+    cancelled = threading.Event()
+    sink = _ChunkSink(loop, queue, slots, cancelled, chunk_size)
+
+    def worker() -> None:
+        try:
+            with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+                write_entries(archive)
+            sink.drain()
+            sink.put(_DONE)
+        except _Cancelled:
+            pass
+        except BaseException as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+
+    worker_future = loop.run_in_executor(None, worker)
+    try:
+        while True:
+            item = await queue.get()
+            if isinstance(item, BaseException):
+                raise item
+            slots.release()
+            if item is _DONE:
+                break
+            yield item
+        await worker_future
+    finally:
+        cancelled.set()
+
+
+def write_zip_file(path, write_entries: Callable[[zipfile.ZipFile], None]) -> None:
+    """
+    将 ZIP 写入文件（同步执行，应在工作线程中调用）
+
+    Args:
+        path: 目标文件路径
+        write_entries: 向 ZipFile 写入全部条目的函数
+    """
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        write_entries(archive)
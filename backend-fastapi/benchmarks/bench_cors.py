@@ -0,0 +1,107 @@
+"""
+CORS 中间件单请求开销基准
+
+在一个只返回固定文本的最小应用上直接调用 ASGI 接口，对比：
+- none:   不加中间件
+- legacy: 基于 BaseHTTPMiddleware 的旧实现（每次请求重新拼装响应头）
+- asgi:   当前的纯 ASGI 实现（预生成响应头）
+
+用法（在 backend-fastapi 目录下）：
+    python -m benchmarks.bench_cors [--requests 20000]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.getcwd())
+
+from starlette.applications import Starlette  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+from starlette.requests import Request  # noqa: E402
+from starlette.responses import PlainTextResponse, Response  # noqa: E402
+from starlette.routing import Route  # noqa: E402
+from app.middleware.cors import GlobalCorsMiddleware  # noqa: E402
+
+ORIGINS = ["http://localhost:5173", "http://localhost:5174"]
+
+
+class LegacyCorsMiddleware(BaseHTTPMiddleware):
+    """旧实现（用于对比）"""
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        if request.method == "OPTIONS":
+            response = Response(status_code=204)
+            self._add_cors_headers(response, request)
+            return response
+        response = await call_next(request)
+        self._add_cors_headers(response, request)
+        return response
+
+    def _add_cors_headers(self, response: Response, request: Request) -> None:
+        origin = request.headers.get("Origin", "")
+        if origin in ORIGINS:
+            response.headers["Access-Control-Allow-Origin"] = origin
+        else:
+            response.headers["Access-Control-Allow-Origin"] = "*"
+        if response.headers.get("Access-Control-Allow-Origin") != "*":
+            response.headers["Access-Control-Allow-Credentials"] = "true"
+        response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS, PATCH"
+        response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization, Accept, X-Requested-With"
+        response.headers["Access-Control-Expose-Headers"] = "Authorization, Content-Disposition"
+        if request.method == "OPTIONS":
+            response.headers["Access-Control-Max-Age"] = "3600"
+
+
+async def _ping(request: Request) -> PlainTextResponse:
+    return PlainTextResponse("ok")
+
+
+def _build_app(mode: str):
+    app = Starlette(routes=[Route("/ping", _ping)])
+    if mode == "legacy":
+        app.add_middleware(LegacyCorsMiddleware)
+    elif mode == "asgi":
+        app.add_middleware(GlobalCorsMiddleware, origins=ORIGINS)
+    return app
+
+
+async def _measure(app, total: int) -> float:
+    """顺序发起 total 次请求，返回每次请求的平均耗时（微秒）"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/ping", "raw_path": b"/ping",
+        "root_path": "", "query_string": b"", "server": ("bench", 80), "client": ("127.0.0.1", 1),
+        "headers": [(b"host", b"bench"), (b"origin", ORIGINS[0].encode())],
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(200):  # 预热
+        await app(dict(scope), receive, send)
+
+    start = time.perf_counter()
+    for _ in range(total):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / total * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CORS 中间件开销基准")
+    parser.add_argument("--requests", type=int, default=20000, help="每种模式的请求数")
+    args = parser.parse_args()
+
+    results = {mode: asyncio.run(_measure(_build_app(mode), args.requests)) for mode in ("none", "legacy", "asgi")}
+    baseline = results["none"]
+    print(f"requests={args.requests}")
+    for mode, per_request in results.items():
+        print(f"  {mode:<7} {per_request:7.1f} us/request  (middleware overhead {per_request - baseline:6.1f} us)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+日志管道吞吐基准
+
+对比三种日志方式下列表接口的请求吞吐：
+- sync:    处理器直接挂在根日志器上，在事件循环线程内同步写文件（改造前的方式）
+- queue:   QueueHandler 入队，后台线程写文件
+- sampled: queue + 服务层 started/completed 日志按 0.1 采样
+
+基准使用数据库副本运行，不会修改 data/web408.db。
+
+用法（在 backend-fastapi 目录下）：
+    python -m benchmarks.bench_logging [--requests 500]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+SOURCE_DB = os.path.join("data", "web408.db")
+
+
+def _prepare_database() -> str:
+    """复制数据库到临时目录并让应用使用副本（须在导入 app 之前调用）"""
+    tmp_dir = tempfile.mkdtemp(prefix="bench408_")
+    db_path = os.path.join(tmp_dir, "web408.db")
+    shutil.copy(SOURCE_DB, db_path)
+    os.environ["DATABASE_DATABASE_URL"] = f"sqlite+aiosqlite:///{db_path}"
+    return tmp_dir
+
+
+def _use_sync_handlers(pipeline) -> None:
+    """把共享处理器直接挂到根日志器上，模拟同步写日志"""
+    root = logging.getLogger()
+    root.removeHandler(pipeline._queue_handler)
+    for handler in pipeline._listener.handlers:
+        root.addHandler(handler)
+
+
+def _use_queue_handler(pipeline) -> None:
+    """恢复队列日志"""
+    root = logging.getLogger()
+    for handler in pipeline._listener.handlers:
+        root.removeHandler(handler)
+    if pipeline._queue_handler not in root.handlers:
+        root.addHandler(pipeline._queue_handler)
+
+
+def _set_service_sampling(pipeline, rate: float) -> None:
+    """为所有服务层日志器设置采样比例"""
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("app.services."):
+            pipeline.setup_logger(name, sample_rate=rate)
+
+
+async def _run(app, total: int, concurrency: int) -> float:
+    """并发请求列表接口，返回每秒请求数"""
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        counter = iter(range(total))
+
+        async def worker():
+            for i in counter:
+                response = await client.get("/api/exam", params={"page": i % 20 + 1, "page_size": 20})
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="日志管道吞吐基准")
+    parser.add_argument("--requests", type=int, default=500, help="每种模式的请求数")
+    parser.add_argument("--concurrency", type=int, default=8, help="并发数")
+    args = parser.parse_args()
+
+    tmp_dir = _prepare_database()
+    sys.path.insert(0, os.getcwd())
+    try:
+        from app.main import app
+        from app.utils import logger as pipeline
+
+        # 控制台输出会淹没结果，基准期间只写文件
+        if pipeline._console_handler is not None:
+            pipeline._console_handler.setLevel(logging.CRITICAL)
+
+        # 预热（加载模块、建立连接）
+        asyncio.run(_run(app, 20, 1))
+
+        results = {}
+        _use_sync_handlers(pipeline)
+        results["sync"] = asyncio.run(_run(app, args.requests, args.concurrency))
+        _use_queue_handler(pipeline)
+        results["queue"] = asyncio.run(_run(app, args.requests, args.concurrency))
+        _set_service_sampling(pipeline, 0.1)
+        results["sampled"] = asyncio.run(_run(app, args.requests, args.concurrency))
+
+        print(f"requests={args.requests} concurrency={args.concurrency}")
+        for mode, rps in results.items():
+            print(f"  {mode:<8} {rps:8.1f} req/s")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+响应序列化基准
+
+对导航索引与分页列表两类响应，比较序列化路径的单次耗时：
+- fastapi:  FastAPI 对 response_model 的处理（TypeAdapter 校验 + Pydantic dump_json，分页列表的实际路径）
+- stdjson:  jsonable_encoder + 标准库 json（未声明 response_model 时的路径）
+- snapshot: 构建响应快照时的 orjson 序列化（导航索引的实际路径，见 app.core.snapshot，只适用于字典数据）
+
+基准使用数据库副本运行，不会修改 data/web408.db。
+
+用法（在 backend-fastapi 目录下）：
+    python -m benchmarks.bench_serialization [--rounds 50]
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Callable, List
+import orjson
+
+SOURCE_DB = os.path.join("data", "web408.db")
+
+
+def _timeit(func: Callable[[], object], rounds: int) -> float:
+    """返回单次调用的平均耗时（毫秒）"""
+    func()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="响应序列化基准")
+    parser.add_argument("--rounds", type=int, default=50, help="每种路径的重复次数")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench408_")
+    db_path = os.path.join(tmp_dir, "web408.db")
+    shutil.copy(SOURCE_DB, db_path)
+    os.environ["DATABASE_DATABASE_URL"] = f"sqlite+aiosqlite:///{db_path}"
+    sys.path.insert(0, os.getcwd())
+    try:
+        from fastapi.encoders import jsonable_encoder
+        from pydantic import TypeAdapter
+        from app.database.connection import get_session_context, engine
+        from app.schemas.common import Response
+        from app.schemas.exam import ExamNavItem, ExamQueryParams, PaginatedExamResponse
+        from app.services.exam_service import ExamService
+
+        async def load():
+            async with get_session_context() as session:
+                service = ExamService(session)
+                nav = await service.find_for_nav_index(None)
+                page = await service.get_paginated(ExamQueryParams(page=1, page_size=100))
+            await engine.dispose()
+            return nav, page
+
+        nav, page = asyncio.run(load())
+
+        cases = [
+            ("nav-index", nav, Response[List[ExamNavItem]], True),
+            ("list(100)", page, Response[PaginatedExamResponse], False),
+        ]
+        print(f"rounds={args.rounds}")
+        for name, data, response_model, snapshot in cases:
+            adapter = TypeAdapter(response_model)
+
+            def fastapi_path():
+                value = adapter.validate_python(Response(data=data))
+                return adapter.dump_json(value, by_alias=True)
+
+            def stdjson_path():
+                return json.dumps(jsonable_encoder(Response(data=data)), ensure_ascii=False).encode("utf-8")
+
+            def snapshot_path():
+                body = {"code": 200, "message": "成功", "data": data}
+                return orjson.dumps(body, option=orjson.OPT_NON_STR_KEYS)
+
+            results = {
+                "fastapi": _timeit(fastapi_path, args.rounds),
+                "stdjson": _timeit(stdjson_path, args.rounds),
+            }
+            if snapshot:
+                results["snapshot"] = _timeit(snapshot_path, args.rounds)
+            size = len(fastapi_path())
+            print(f"  {name} ({size} bytes)")
+            for path, ms in results.items():
+                print(f"    {path:<8} {ms:7.2f} ms")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
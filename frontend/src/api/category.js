@@ -101,6 +101,34 @@ export const checkCategoryUsage = (id) => {
   })
 }
 
+/**
+ * 查询分类的全部子孙分类（含层级 depth）
+ * @param {Number} id 分类ID
+ * @param {Boolean} includeSelf 是否包含分类自身
+ * @returns Promise
+ */
+export const getCategoryDescendants = (id, includeSelf = false) => {
+  return request({
+    url: `/api/exam-category/${id}/descendants`,
+    method: 'get',
+    params: { include_self: includeSelf }
+  })
+}
+
+/**
+ * 查询分类的祖先路径（从顶级分类开始）
+ * @param {Number} id 分类ID
+ * @param {Boolean} includeSelf 是否包含分类自身
+ * @returns Promise
+ */
+export const getCategoryAncestors = (id, includeSelf = false) => {
+  return request({
+    url: `/api/exam-category/${id}/ancestors`,
+    method: 'get',
+    params: { include_self: includeSelf }
+  })
+}
+
 /**
  * 创建分类（ADMIN专用）
  * @param {Object} data 分类数据
@@ -15,6 +15,9 @@ import request from './request'
  * @param {string} params.keyword 搜索关键词（可选，匹配title或content）
  * @param {string} params.sort_field 排序字段（可选）
  * @param {string} params.sort_order 排序方向（可选）
+ * @param {string} params.cursor 游标（可选，上一页返回的 next_cursor，传入后忽略 page）
+ * @param {boolean} params.with_total 是否统计总数（可选，默认 true）
+ * @param {string} params.total_mode 总数模式（可选）：exact / estimated（关键词搜索时返回封顶估计值）
  * @returns {Promise} API响应（分页数据）
  */
 export function getExamList(params) {
@@ -54,6 +57,38 @@ export function getExamNavIndex(params) {
   })
 }
 
+/**
+ * 获取上一题/下一题ID（顺序与导航索引一致）
+ * @param {number} id 真题ID
+ * @param {Object} params 查询参数
+ * @param {string} params.category 分类（可选，限定在该分类内翻页）
+ * @param {number} params.subject_id 科目ID（可选）
+ * @returns {Promise} API响应（id / prevId / nextId）
+ */
+export function getExamNeighbors(id, params) {
+  return request({
+    url: `/api/exam/${id}/neighbors`,
+    method: 'get',
+    params
+  })
+}
+
+/**
+ * 获取与真题相似的题目推荐
+ * @param {number} id 真题ID
+ * @param {Object} params 查询参数
+ * @param {string} params.bank 推荐范围：mock（默认）/ exam / all
+ * @param {number} params.limit 返回数量（默认 10）
+ * @returns {Promise} API响应（相似题目列表）
+ */
+export function getSimilarQuestions(id, params) {
+  return request({
+    url: `/api/exam/${id}/similar`,
+    method: 'get',
+    params
+  })
+}
+
 /**
  * 获取真题详情
  * @param {number} id 真题ID
@@ -152,3 +187,85 @@ export function getExamCategoryStats(subjectId) {
   })
 }
 
+
+/**
+ * 随机组卷
+ * @param {Object} params 组卷参数
+ * @param {number} params.count 抽题数量（默认10，最多100）
+ * @param {number} params.subject_id 科目ID（可选）
+ * @param {string[]} params.categories 分类列表（可选，命中任一即可）
+ * @param {string} params.question_type 题型（可选）：CHOICE / ESSAY
+ * @param {string} params.difficulty 难度（可选）：EASY / MEDIUM / HARD
+ * @param {number} params.year_from 起始年份（可选）
+ * @param {number} params.year_to 结束年份（可选）
+ * @returns {Promise} API响应（真题列表）
+ */
+export function getRandomPaper(params) {
+  return request({
+    url: '/api/exam/random',
+    method: 'get',
+    params,
+    // 数组参数按 categories=a&categories=b 传递
+    paramsSerializer: { indexes: null }
+  })
+}
+
+/**
+ * 记录一次随机组卷完成（需登录）
+ * @returns {Promise} API响应（随机出题统计）
+ */
+export function completeRandomPaper() {
+  return request({
+    url: '/api/exam/random/complete',
+    method: 'post'
+  })
+}
+
+/**
+ * 批量导入真题（管理员）
+ * @param {Object} data 导入参数
+ * @param {string} data.format 格式：jsonl / markdown
+ * @param {string} data.content 导入内容
+ * @param {boolean} data.dry_run 仅校验不写入
+ * @param {number} data.year 默认年份（可选）
+ * @param {number} data.subject_id 默认科目ID（可选）
+ * @returns {Promise} API响应（逐行导入报告）
+ */
+export function importExams(data) {
+  return request({
+    url: '/api/exam/import',
+    method: 'post',
+    data
+  })
+}
+
+/**
+ * 批量更新真题（管理员）
+ * @param {Object} data 批量更新参数
+ * @param {number[]} data.ids 真题ID列表（与 filter 二选一）
+ * @param {Object} data.filter 筛选条件（与 ids 二选一）
+ * @param {Object} data.patch 修改内容，如 { add_categories: ['栈'], difficulty: 'MEDIUM' }
+ * @returns {Promise} API响应（命中数与更新数）
+ */
+export function bulkUpdateExams(data) {
+  return request({
+    url: '/api/exam/bulk-update',
+    method: 'post',
+    data
+  })
+}
+
+/**
+ * 批量删除真题（管理员）
+ * @param {Object} data 批量删除参数
+ * @param {number[]} data.ids 真题ID列表（与 filter 二选一）
+ * @param {Object} data.filter 筛选条件（与 ids 二选一）
+ * @returns {Promise} API响应（删除数）
+ */
+export function bulkDeleteExams(data) {
+  return request({
+    url: '/api/exam/bulk-delete',
+    method: 'post',
+    data
+  })
+}
@@ -0,0 +1,68 @@
+/**
+ * 知识点API接口
+ * 用途：知识点数据的HTTP请求封装
+ */
+import request from './request'
+
+/**
+ * 查询章节下的知识点列表（不含正文）
+ * @param {Number} chapterId 章节ID
+ * @returns Promise
+ */
+export const getKnowledgePointsByChapter = (chapterId) => {
+  return request({
+    url: `/api/knowledge/chapter/${chapterId}`,
+    method: 'get'
+  })
+}
+
+/**
+ * 查询知识点详情（计入一次浏览）
+ * @param {Number} id 知识点ID
+ * @returns Promise
+ */
+export const getKnowledgePoint = (id) => {
+  return request({
+    url: `/api/knowledge/${id}`,
+    method: 'get'
+  })
+}
+
+/**
+ * 创建知识点（ADMIN专用）
+ * @param {Object} data 知识点数据
+ * @returns Promise
+ */
+export const createKnowledgePoint = (data) => {
+  return request({
+    url: '/api/knowledge',
+    method: 'post',
+    data
+  })
+}
+
+/**
+ * 更新知识点（ADMIN专用）
+ * @param {Number} id 知识点ID
+ * @param {Object} data 知识点数据
+ * @returns Promise
+ */
+export const updateKnowledgePoint = (id, data) => {
+  return request({
+    url: `/api/knowledge/${id}`,
+    method: 'post',
+    data
+  })
+}
+
+/**
+ * 删除知识点（ADMIN专用）
+ * @param {Number} id 知识点ID
+ * @returns Promise
+ */
+export const deleteKnowledgePoint = (id) => {
+  return request({
+    url: `/api/knowledge/${id}/delete`,
+    method: 'post'
+  })
+}
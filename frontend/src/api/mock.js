@@ -39,6 +39,22 @@ export function getMockQuestionById(id) {
   })
 }
 
+/**
+ * 获取与模拟题相似的题目推荐
+ * @param {number} id 模拟题ID
+ * @param {Object} params 查询参数
+ * @param {string} params.bank 推荐范围：mock（默认）/ exam / all
+ * @param {number} params.limit 返回数量（默认 10）
+ * @returns {Promise} API响应（相似题目列表）
+ */
+export function getSimilarMockQuestions(id, params) {
+  return request({
+    url: `/api/mock/${id}/similar`,
+    method: 'get',
+    params
+  })
+}
+
 /**
  * 创建模拟题
  * @param {Object} data 模拟题数据
@@ -151,3 +167,53 @@ export function getMockTitlesBySource(source) {
     method: 'get'
   })
 }
+
+/**
+ * 批量导入模拟题（管理员）
+ * @param {Object} data 导入参数
+ * @param {string} data.format 格式：jsonl / markdown
+ * @param {string} data.content 导入内容
+ * @param {boolean} data.dry_run 仅校验不写入
+ * @param {string} data.source 默认来源（可选）
+ * @param {string} data.title 默认试卷标题（可选）
+ * @param {number} data.subject_id 默认科目ID（可选）
+ * @returns {Promise} API响应（逐行导入报告）
+ */
+export function importMockQuestions(data) {
+  return request({
+    url: '/api/mock/import',
+    method: 'post',
+    data
+  })
+}
+
+/**
+ * 批量更新模拟题（管理员）
+ * @param {Object} data 批量更新参数
+ * @param {number[]} data.ids 模拟题ID列表（与 filter 二选一）
+ * @param {Object} data.filter 筛选条件（与 ids 二选一）
+ * @param {Object} data.patch 修改内容，如 { add_categories: ['栈'], difficulty: 'MEDIUM' }
+ * @returns {Promise} API响应（命中数与更新数）
+ */
+export function bulkUpdateMockQuestions(data) {
+  return request({
+    url: '/api/mock/bulk-update',
+    method: 'post',
+    data
+  })
+}
+
+/**
+ * 批量删除模拟题（管理员）
+ * @param {Object} data 批量删除参数
+ * @param {number[]} data.ids 模拟题ID列表（与 filter 二选一）
+ * @param {Object} data.filter 筛选条件（与 ids 二选一）
+ * @returns {Promise} API响应（删除数）
+ */
+export function bulkDeleteMockQuestions(data) {
+  return request({
+    url: '/api/mock/bulk-delete',
+    method: 'post',
+    data
+  })
+}
@@ -90,6 +90,7 @@ import {
   faSlidersH,
   faInbox,
   faFileWord,
+  faFileZipper,
   faPencilAlt,
   faSort,
   faSortUp,
@@ -188,6 +189,7 @@ library.add(
   faSlidersH,
   faInbox,
   faFileWord,
+  faFileZipper,
   faPencilAlt,
   faSort,
   faSortUp,